@@ -2,7 +2,6 @@
 from flask import Flask #web framework unun ana sınıfı
 from flask_login import LoginManager # kullanıcı oturum yönetimi için
 from flask_sqlalchemy import SQLAlchemy #veritabanı orm
-import markdown #markdown formatını html e çevirmek için
 import os #dosya işlemleri için 
 
 # Extensions nesneleri global olarak oluşturuluyor ama henüz uygulamaya bağlanmıyor.
@@ -22,17 +21,47 @@ def create_app(config_class='config.Config'): #application factory fonksiyonu. f
     login_manager.login_message = 'Bu sayfaya erişmek için giriş yapmalısınız.' #yönlendirme sırasında gösterilecek mesaj
     login_manager.login_message_category = 'info' #flask mesaj kategorisi (success, info, danger gibi)
     
-    # User loader
-    from app.models import User
+    # Sayaç kolonlarını (likes_count, followers_count ...) satır ekleme/silme olaylarına bağla
+    from app.utils.counters import register_counter_listeners
+    register_counter_listeners()
+    
+    # İçerik adresli yüklemeler: Post.image / User.avatar değişince refcount güncellenir
+    from app.utils.uploads import init_uploads
+    init_uploads(app)
+    
+    # Yorum ağacı: cevap eklenirken kök yorum (thread_id) ve derinlik ebeveynden hesaplanır
+    from app.utils.comments import register_comment_listeners
+    register_comment_listeners()
+    
+    # Takip feed i: yazı yayınlanınca / takip edilince timeline_entries güncellenir
+    from app.utils.timeline import register_timeline_listeners
+    register_timeline_listeners()
+    
+    # Şifre hashleme -- giriş/kayıt hash leri sınırlı thread havuzunda, kuyruk doluysa 503
+    from app.utils.passwords import init_passwords
+    init_passwords(app)
+    
+    # Kullanıcı önbelleği -- user_loader her istekte users tablosuna gitmesin (sürüm oturumda tutulur)
+    from app.utils.user_cache import init_user_cache, load_user as load_cached_user
+    init_user_cache(app)
     
     @login_manager.user_loader #flask login in kullanıcıyı session dan yüklemesi için gerekli callback
-    def load_user(user_id): # fonksiyon, session daki user_id yi alır ve vt den o kullanıcıyı döndürür. her http request inde otomatik çağrılır böylece current_user her zaman güncel olur
-        return User.query.get(int(user_id))
+    def load_user(user_id): # fonksiyon, session daki user_id yi alır ve o kullanıcıyı döndürür. her http request inde otomatik çağrılır
+        return load_cached_user(user_id) #USER_CACHE_TTL saniye süreç içi önbellekten, satır değişince yenilenir
     
     # Template filter
     @app.template_filter('markdown') #Template'lerde kullanılmak üzere özel bir Jinja2 filtresi tanımlanıyor
     def markdown_filter(text): #markdown formatındaki metni html e çevirir 
-        return markdown.markdown(text, extensions=['fenced_code', 'codehilite', 'tables']) #extensions kod blokları, syntax highlighting ve tablo desteği ekler
+        from app.utils.markdown_render import render_cached
+        return render_cached(text) #eklentiler config.MARKDOWN_EXTENSIONS dan, sonuç LRU önbellekte tutulur
+    
+    # İzleyici durumu: şablonlarda viewer.liked(post), viewer.following(user) (istek başına önbellekli)
+    from app.utils.viewer_state import viewer_state
+    app.context_processor(lambda: {'viewer': viewer_state()})
+    
+    # Resim varyantları için srcset bilgisi (templates/_images.html deki picture makrosu kullanır)
+    from app.utils.images import image_sources
+    app.jinja_env.globals['image_sources'] = image_sources
     
     # Create upload folder --- resim yükleme için gerekli klasörü oluşturur.
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True) # exist ok true klasör zaten varsa hata vermez
@@ -47,8 +76,53 @@ def create_app(config_class='config.Config'): #application factory fonksiyonu. f
     app.register_blueprint(user.bp) # kullanıcı profili,bildirimler
     # register_blueprint blueprintleri uygulamaya kaydeder
     
+    # Bildirim aracısı -- yeni bildirimler commit sonrası açık sekmelere (SSE) iletilir
+    from app.utils.notify_broker import init_broker
+    init_broker(app)
+    
+    # Bildirim kuyruğu -- bildirimler istek içinde değil arka planda toplu INSERT ile yazılır
+    from app.utils.notifications import init_notifications
+    init_notifications(app)
+    
+    # Parça önbelleği -- şablonlarda {% cache %} etiketi, yazı/kullanıcı/yorum değişince commit sonrası düşer
+    from app.utils.fragment_cache import init_fragment_cache
+    init_fragment_cache(app)
+    
+    # Admin paneli sayıları -- tek sorguda hesaplanır, önbelleklenir, veri değişince düşürülür
+    from app.utils.stats import init_stats
+    init_stats(app)
+    
+    # İlgili yazılar -- yazı değişince commit sonrası arka planda TF-IDF vektörü ve komşu listeleri güncellenir
+    from app.utils.related import init_related
+    init_related(app)
+    
+    # Trend yazılar -- zamanla sönen puan arka planda periyodik hesaplanır, popüler yazılar buradan okunur
+    from app.utils.trending import init_trending
+    init_trending(app)
+    
+    # Kullanıcı/yazı silme -- ilişkili satırları vt siler (ON DELETE CASCADE), sayaçlar toplu yeniden sayılır; kullanıcılar
+    # işaretlenip parça parça (USER_DELETE_MODE = 'background' ise arka planda) temizlenir
+    from app.utils.purge import init_purge
+    init_purge(app)
+    
+    # SQL profili -- istek başına ifade sayısı/süresi, N+1 uyarısı, debug modunda X-SQL-* başlıkları, /admin/sql
+    from app.utils.sql_profiler import init_sql_profiler
+    init_sql_profiler(app)
+    
+    # Görüntülenme sayacı -- detay sayfası her görüntülemede commit yapmasın diye tampon
+    from app.utils.view_counter import init_view_counter
+    init_view_counter(app)
+    
+    # CLI komutları (flask --app run recount-counters gibi)
+    from app.commands import register_commands
+    register_commands(app)
+    
     # Create database tables
     with app.app_context(): #Flask'ın application context'ini aktif eder
         db.create_all() # tüm model sınıflarına göre vt tablolarını oluşturur(yoksa)
+        
+        # Tam metin arama (postgres tsvector + GIN index / sqlite FTS5) kurulumu
+        from app.utils.search import init_search
+        init_search(app)
     
     return app #yapılandırılmış flask uygulamasını döndürür
\ No newline at end of file
@@ -0,0 +1,105 @@
+#commands.py bakım için flask cli komutları (flask --app run <komut>)
+import click
+
+
+def register_commands(app):
+    """CLI komutlarını uygulamaya kaydet"""
+
+    @app.cli.command('recount-counters')
+    def recount_counters_command():
+        """Beğeni/yorum/kayıt/takip sayaçlarını yeniden hesapla"""
+        from app.utils.counters import recount_counters
+        recount_counters()
+        click.echo('Sayaçlar yeniden hesaplandı.')
+
+    @app.cli.command('rerender-markdown')
+    @click.option('--workers', type=int, default=None, help='Process sayısı (varsayılan: CPU sayısı)')
+    @click.option('--batch-size', type=int, default=200, help='Tek seferde işlenecek yazı sayısı')
+    @click.option('--force', is_flag=True, help='Güncel olanlar dahil tüm yazıları yeniden render et')
+    def rerender_markdown_command(workers, batch_size, force):
+        """Saklanan markdown html ini process pool ile yeniden üret (eklenti seti değişince)"""
+        from app.utils.markdown_render import rerender_all
+        total = rerender_all(workers=workers, batch_size=batch_size, force=force)
+        click.echo(f'{total} yazı yeniden render edildi.')
+
+    @app.cli.command('backfill-reading-stats')
+    @click.option('--batch-size', type=int, default=500, help='Tek seferde işlenecek yazı sayısı')
+    @click.option('--force', is_flag=True, help='Dolu olanlar dahil tüm yazıları yeniden hesapla')
+    def backfill_reading_stats_command(batch_size, force):
+        """Eski yazıların kelime sayısı ve okuma süresini doldur"""
+        from app.utils.reading import backfill_reading_stats
+        total = backfill_reading_stats(batch_size=batch_size, force=force)
+        click.echo(f'{total} yazının okuma süresi hesaplandı.')
+
+    @app.cli.command('backfill-comment-threads')
+    def backfill_comment_threads_command():
+        """Eski yorumların kök yorum (thread_id) ve derinlik bilgisini doldur"""
+        from app.utils.comments import backfill_comment_threads
+        total = backfill_comment_threads()
+        click.echo(f'{total} cevabın konu bilgisi güncellendi.')
+
+    @app.cli.command('snapshot-stats')
+    def snapshot_stats_command():
+        """Günün admin paneli sayılarını stats_snapshots tablosuna yaz (günlük cron için)"""
+        from app.utils.stats import compute_stats, record_snapshot
+        counts = compute_stats()
+        record_snapshot(counts)
+        click.echo(', '.join(f'{name}={value}' for name, value in counts.items()))
+
+    @app.cli.command('reindex-search')
+    def reindex_search_command():
+        """Arama indeksini tüm yazılardan yeniden oluştur (sqlite FTS5; postgres kolonu kendisi günceller)"""
+        from app.utils.search import rebuild_index
+        rebuild_index()
+        click.echo('Arama indeksi yeniden oluşturuldu.')
+
+    @app.cli.command('process-images')
+    @click.option('--workers', type=int, default=None, help='Process sayısı (varsayılan: CPU sayısı)')
+    @click.option('--force', is_flag=True, help='Varyantı olanlar dahil tüm resimleri yeniden işle')
+    def process_images_command(workers, force):
+        """Yüklenmiş resimlerin boyut/webp varyantlarını üret (eski yüklemeler veya IMAGE_VARIANTS değişince)"""
+        from app.utils.images import process_existing
+        total = process_existing(force=force, workers=workers)
+        click.echo(f'{total} resim işlendi.')
+
+    @app.cli.command('gc-uploads')
+    @click.option('--recount', is_flag=True, help='Önce refcount ları yazı/kullanıcı tablolarından yeniden hesapla')
+    @click.option('--dry-run', is_flag=True, help='Silmeden sadece kaç dosyanın silineceğini göster')
+    def gc_uploads_command(recount, dry_run):
+        """Hiçbir yazı/kullanıcının kullanmadığı yüklemeleri ve varyantlarını sil"""
+        from app.utils.uploads import collect_garbage, recount_references
+        if recount:
+            recount_references()
+        total = collect_garbage(dry_run=dry_run)
+        click.echo(f'{total} kullanılmayan dosya {"silinecek" if dry_run else "silindi"}.')
+
+    @app.cli.command('rebuild-timelines')
+    @click.option('--batch-size', type=int, default=500, help='Tek seferde işlenecek takipçi sayısı')
+    def rebuild_timelines_command(batch_size):
+        """Takip feed lerini (timeline_entries) follows ve posts tablolarından yeniden üret"""
+        from app.utils.timeline import rebuild_timelines
+        total = rebuild_timelines(batch_size=batch_size)
+        click.echo(f'{total} feed satırı oluşturuldu.')
+
+    @app.cli.command('rebuild-related')
+    @click.option('--batch-size', type=int, default=500, help='Tek seferde okunan/yazılan yazı sayısı')
+    def rebuild_related_command(batch_size):
+        """İlgili yazı listelerini (post_terms, related_posts) tüm yayınlanmış yazılardan yeniden hesapla"""
+        from app.utils.related import np, rebuild_related
+        posts, rows = rebuild_related(batch_size=batch_size)
+        click.echo(f'{posts} yazı için {rows} ilgili yazı satırı oluşturuldu ({"numpy" if np is not None else "saf python"}).')
+
+    @app.cli.command('update-trending')
+    def update_trending_command():
+        """Trend puanlarını sayaçlardaki son değişikliklere göre güncelle (TRENDING_INTERVAL=0 ise cron ile)"""
+        from app.utils.trending import update_trending
+        total = update_trending()
+        click.echo(f'{total} yazının trend puanı güncellendi.')
+
+    @app.cli.command('purge-deleted')
+    @click.option('--batch-size', type=int, default=None, help='Tek commit te silinen satır sayısı (varsayılan: PURGE_BATCH_SIZE)')
+    def purge_deleted_command(batch_size):
+        """Silinecek olarak işaretlenmiş kullanıcıları ve tüm satırlarını parça parça sil"""
+        from app.utils.purge import purge_deleted
+        total = purge_deleted(batch_size=batch_size)
+        click.echo(f'{total} kullanıcı silindi.')
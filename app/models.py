@@ -2,6 +2,8 @@ from app import db
 from flask_login import UserMixin
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy.orm import validates
+from app.utils.reading import count_words, reading_minutes
 
 class User(UserMixin, db.Model):
     __tablename__ = 'users' #postgresql de tablo adı
@@ -15,18 +17,28 @@ class User(UserMixin, db.Model):
     avatar = db.Column(db.String(255), default='default-avatar.jpg')
     is_admin = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    version = db.Column(db.Integer, default=1, server_default='1', nullable=False) #satır her güncellendiğinde artar (app/utils/user_cache.py)
+    deleted_at = db.Column(db.DateTime) #silinmek üzere işaretlendi: giriş yapamaz, profili görünmez; arka planda temizlenir (app/utils/purge.py)
+    
+    # Sayaçlar -- her sayfada ilişkileri yükleyip saymamak için tutulur (app/utils/counters.py günceller)
+    posts_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    followers_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    following_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    comments_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
     
     # Relationships
-    posts = db.relationship('Post', backref='author', lazy=True, cascade='all, delete-orphan')
-    comments = db.relationship('Comment', backref='author', lazy=True, cascade='all, delete-orphan')
+    # passive_deletes: kullanıcı silinirken satırlar yüklenip tek tek silinmez, vt ON DELETE CASCADE ile siler
+    # (sayaçlar ve diğer yan etkiler app/utils/purge.py de toplu güncellenir)
+    posts = db.relationship('Post', backref='author', lazy=True, cascade='all, delete-orphan', passive_deletes=True)
+    comments = db.relationship('Comment', backref='author', lazy=True, cascade='all, delete-orphan', passive_deletes=True)
     notifications = db.relationship('Notification', foreign_keys='Notification.user_id', 
-                                   backref='recipient', lazy='dynamic', cascade='all, delete-orphan')
-    contact_messages = db.relationship('ContactMessage', backref='user', lazy=True)
+                                   backref='recipient', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
+    contact_messages = db.relationship('ContactMessage', backref='user', lazy=True, passive_deletes=True) #user_id vt de NULL olur
     
     following = db.relationship('Follow', foreign_keys='Follow.follower_id',
-                               backref='follower', lazy='dynamic', cascade='all, delete-orphan')
+                               backref='follower', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
     followers = db.relationship('Follow', foreign_keys='Follow.followed_id',
-                               backref='followed', lazy='dynamic', cascade='all, delete-orphan')
+                               backref='followed', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
     
     def set_password(self, password): 
         self.password_hash = generate_password_hash(password) #şifreyi hashle
@@ -53,10 +65,10 @@ class User(UserMixin, db.Model):
         return Follow.query.filter_by(follower_id=self.id, followed_id=user.id).first() is not None #first kayıt varsa döner yoksa none is not none boolean a çevir
     
     def get_followers_count(self):
-        return self.followers.count()
+        return self.followers_count
     
     def get_following_count(self):
-        return self.following.count()
+        return self.following_count
     
     def __repr__(self):
         return f'<User {self.username}>'
@@ -68,6 +80,11 @@ class Post(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False, index=True)
     content = db.Column(db.Text, nullable=False) #içerik sınırsız
+    content_html = db.Column(db.Text) #kaydedilirken render edilmiş markdown html i
+    content_hash = db.Column(db.String(64)) #html in hangi içerikten üretildiği (sha256)
+    content_html_version = db.Column(db.String(32), index=True) #hangi markdown eklenti ayarıyla üretildiği
+    word_count = db.Column(db.Integer) #içerik kaydedilirken hesaplanır
+    reading_minutes = db.Column(db.Integer) #okuma süresi (dk), liste sayfaları content e dokunmadan okur
     summary = db.Column(db.String(300)) #özet
     image = db.Column(db.String(255))
     category = db.Column(db.String(50), index=True)
@@ -76,15 +93,20 @@ class Post(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True) #foreign key users tablosunun id kolonuna referans
+    # Sayaçlar -- kartlarda len(self.likes) / comments|length yerine okunur
+    likes_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    comments_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    bookmarks_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
     
-    # Relationships
-    comments = db.relationship('Comment', backref='post', lazy=True, cascade='all, delete-orphan')
-    likes = db.relationship('Like', backref='post', lazy=True, cascade='all, delete-orphan')
-    bookmarks = db.relationship('Bookmark', backref='post', lazy=True, cascade='all, delete-orphan')
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True) #foreign key users tablosunun id kolonuna referans
+    
+    # Relationships -- yazı silinince yorum/beğeni/kaydetme satırlarını vt siler (ON DELETE CASCADE), ORM yüklemez
+    comments = db.relationship('Comment', backref='post', lazy=True, cascade='all, delete-orphan', passive_deletes=True)
+    likes = db.relationship('Like', backref='post', lazy=True, cascade='all, delete-orphan', passive_deletes=True)
+    bookmarks = db.relationship('Bookmark', backref='post', lazy=True, cascade='all, delete-orphan', passive_deletes=True)
     
     def get_likes_count(self): #beğeni sayısı
-        return len(self.likes) #like listesinin uzunluğu
+        return self.likes_count #like satırlarını yüklemeden sayaç kolonundan oku
     
     def is_liked_by(self, user):
         if not user or not user.is_authenticated:
@@ -96,33 +118,22 @@ class Post(db.Model):
             return False
         return Bookmark.query.filter_by(user_id=user.id, post_id=self.id).first() is not None
     
-    def reading_time(self):
-        """Yazının okunma süresini hesapla (dakika)"""
-        import re
-    
-        # Markdown/HTML etiketlerini temizle
-        text = re.sub(r'<[^>]+>', '', self.content)  # HTML etiketleri [^>]: > hariç her karakter +: Bir veya daha fazla
-        text = re.sub(r'```[\s\S]*?```', '', text)   # Kod blokları [\s\S]: Her karakter (whitespace dahil) *?: Non-greedy (açgözlü olmayan)
-        text = re.sub(r'`[^`]+`', '', text)          # Inline kod
-        text = re.sub(r'!\[.*?\]\(.*?\)', '', text)  # Resimler ![alt](url)
-        text = re.sub(r'\[.*?\]\(.*?\)', '', text)   # Linkler [text](url)
-        text = re.sub(r'[#*_~`]', '', text)          # Markdown karakterleri
-    
-        # Kelimeleri say (boş kelimeleri filtrele)
-        words = len([word for word in text.split() if word.strip()])
+    def rendered_content(self):
+        """Yazının html hali -- saklanan html geçerliyse tekrar render edilmez"""
+        from app.utils.markdown_render import rendered_html
+        return rendered_html(self)
     
-        # Ortalama okuma hızı: dakikada 150 kelime
-        minutes = max(1, round(words / 100))
+    @validates('content')
+    def _update_reading_stats(self, key, content): #content her atandığında kelime sayısı ve okuma süresi güncellenir
+        self.word_count = count_words(content)
+        self.reading_minutes = reading_minutes(self.word_count)
+        return content
     
-        return minutes
-    
-        #text.split boşlukları ayır, kelime listesi oluştur
-        #word.strip kelimenin başındaki ve sonundaki boşlukları sil
-        #if word.strip boş stringleri filtrele
-        #len liste uzunluğu=kelime sayısı
-        #words/100 100 kelime/dk hızı
-        #round yuvarlama
-        #max(1 ...) en az 1 dk
+    def reading_time(self):
+        """Yazının okunma süresi (dakika)"""
+        if self.reading_minutes is None: #henüz backfill edilmemiş eski yazılar
+            return reading_minutes(count_words(self.content))
+        return self.reading_minutes
 
 
 class Comment(db.Model):
@@ -132,15 +143,28 @@ class Comment(db.Model):
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    post_id = db.Column(db.Integer, db.ForeignKey('posts.id'), nullable=False, index=True)
-    parent_id = db.Column(db.Integer, db.ForeignKey('comments.id'), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True) #kullanıcı silinirken yorumları bulmak için
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.id', ondelete='CASCADE'), nullable=False, index=True)
+    parent_id = db.Column(db.Integer, db.ForeignKey('comments.id', ondelete='CASCADE'), nullable=True, index=True)
     #parent id comment id ye referans (kendi tablosuna) yorumlara cevap için nullable=true ana yorumlar için null
     
-    replies = db.relationship('Comment', backref=db.backref('parent', remote_side=[id]), lazy='dynamic')
+    # Yorum ağacı -- bir konunun tüm cevaplarını tek sorguda almak için (app/utils/comments.py doldurur)
+    thread_id = db.Column(db.Integer, db.ForeignKey('comments.id', ondelete='CASCADE')) #kök yorumun id si, kökler için null
+    depth = db.Column(db.Integer, default=0, server_default='0', nullable=False) #kök 0, cevap 1, cevabın cevabı 2 ...
+    replies_count = db.Column(db.Integer, default=0, server_default='0', nullable=False) #doğrudan cevap sayısı
+    
+    replies = db.relationship('Comment', backref=db.backref('parent', remote_side=[id]), lazy='dynamic',
+                              foreign_keys=[parent_id], cascade='all, delete-orphan', passive_deletes=True)
     #comment kendi modeline referans
     #backref parent alt yorumdan ana yoruma erişim
     #remote side id hangi taraf parent sqlalchemy ye söylemek için
+    #yorum silinince cevapları da silinir (ağaçta sahipsiz cevap kalmaz) -- yüklenmeden, vt ON DELETE CASCADE ile
+    #(cevap yazarlarının ve yazının sayaçları app/utils/comments.py de yeniden sayılır)
+    
+    __table_args__ = (
+        db.Index('ix_comments_post_root', 'post_id', 'parent_id', 'created_at'), #sayfadaki kök yorumlar
+        db.Index('ix_comments_thread', 'thread_id', 'depth'), #konunun cevapları
+    )
 
 
     def __repr__(self):
@@ -153,8 +177,8 @@ class Like(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
-    post_id = db.Column(db.Integer, db.ForeignKey('posts.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.id', ondelete='CASCADE'), nullable=False, index=True)
     
     __table_args__ = (db.UniqueConstraint('user_id', 'post_id', name='unique_user_post_like'),)
     #tablo seviyesi kısıtlamalar
@@ -167,10 +191,14 @@ class Follow(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    follower_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
-    followed_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    follower_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    followed_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
     
-    __table_args__ = (db.UniqueConstraint('follower_id', 'followed_id', name='unique_follower_followed'),)
+    __table_args__ = (
+        db.UniqueConstraint('follower_id', 'followed_id', name='unique_follower_followed'),
+        db.Index('ix_follows_followed_created', 'followed_id', 'created_at', 'id'), #takipçiler sayfası (cursor)
+        db.Index('ix_follows_follower_created', 'follower_id', 'created_at', 'id'), #takip edilenler sayfası
+    )
 
 
 class Notification(db.Model):
@@ -183,8 +211,8 @@ class Notification(db.Model):
     is_read = db.Column(db.Boolean, default=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True) #bildirim alan
-    sender_id = db.Column(db.Integer, db.ForeignKey('users.id')) #bildirim gönderen
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True) #bildirim alan
+    sender_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL')) #bildirim gönderen (silinirse NULL)
 
 
 class Bookmark(db.Model):
@@ -193,12 +221,88 @@ class Bookmark(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
-    post_id = db.Column(db.Integer, db.ForeignKey('posts.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.id', ondelete='CASCADE'), nullable=False, index=True)
     
     __table_args__ = (db.UniqueConstraint('user_id', 'post_id', name='unique_user_post_bookmark'),)
 
 
+class TimelineEntry(db.Model):
+    __tablename__ = 'timeline_entries' #takip edilen yazarların yazılarının okuyucu başına hazır listesi (home feed)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False) #feed in sahibi (okuyucu)
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.id', ondelete='CASCADE'), nullable=False, index=True)
+    author_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False) #takipten çıkınca silmek için
+    created_at = db.Column(db.DateTime, nullable=False) #yazının created_at i -- sıralama anahtarı
+    
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'post_id', name='unique_timeline_user_post'),
+        db.Index('ix_timeline_user_created', 'user_id', 'created_at', 'post_id'), #cursor sayfalama için
+        db.Index('ix_timeline_user_author', 'user_id', 'author_id'),
+    )
+
+
+class PostTerm(db.Model):
+    __tablename__ = 'post_terms' #yayınlanmış yazıların TF-IDF vektörleri (en ağır kelimeler) -- ilgili yazılar için ters indeks
+
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.id', ondelete='CASCADE'), primary_key=True)
+    term = db.Column(db.String(64), primary_key=True)
+    weight = db.Column(db.Float, nullable=False) #normalize edilmiş ağırlık; iki yazının benzerliği ortak kelimelerin çarpım toplamı
+
+    __table_args__ = (
+        db.Index('ix_post_terms_term', 'term', 'post_id'), #bu kelime hangi yazılarda geçiyor
+    )
+
+
+class RelatedPost(db.Model):
+    __tablename__ = 'related_posts' #yazı başına önceden hesaplanmış en benzer yazılar (app/utils/related.py)
+
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.id', ondelete='CASCADE'), primary_key=True)
+    rank = db.Column(db.Integer, primary_key=True) #0 en benzer
+    related_id = db.Column(db.Integer, db.ForeignKey('posts.id', ondelete='CASCADE'), nullable=False, index=True) #silinen/yayından kalkan yazıyı listeleyenleri bulmak için
+    score = db.Column(db.Float, nullable=False) #kosinüs benzerliği
+
+
+class TrendingScore(db.Model):
+    __tablename__ = 'trending_scores' #zamanla sönen trend puanı (app/utils/trending.py arka planda günceller)
+
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.id', ondelete='CASCADE'), primary_key=True)
+    score = db.Column(db.Float, index=True) #log2 ölçeğinde, sönme zamana göre gömülü: sıralama için güncellenmesi gerekmez
+    views_seen = db.Column(db.Integer, default=0, nullable=False) #son hesaplamadaki sayaçlar -- aradaki fark yeni etkileşim
+    likes_seen = db.Column(db.Integer, default=0, nullable=False)
+    comments_seen = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+class StoredFile(db.Model):
+    __tablename__ = 'stored_files' #içerik adresli yüklemeler: aynı dosya bir kez saklanır (app/utils/uploads.py)
+    
+    name = db.Column(db.String(80), primary_key=True) #<sha256>.<uzantı> -- Post.image / User.avatar bu değeri tutar
+    size = db.Column(db.Integer, nullable=False)
+    refcount = db.Column(db.Integer, default=0, server_default='0', nullable=False) #kaç yazı/kullanıcı kullanıyor
+    last_seen_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False) #son yüklenme; GC bekleme süresi için
+    
+    __table_args__ = (
+        db.Index('ix_stored_files_orphans', 'refcount', 'last_seen_at'), #GC: refcount = 0 ve eski olanlar
+    )
+
+
+class StatsSnapshot(db.Model):
+    __tablename__ = 'stats_snapshots' #admin paneli sayılarının günlük kopyası -- trendler ana tabloları taramadan çizilir
+    
+    day = db.Column(db.Date, primary_key=True)
+    users = db.Column(db.Integer, nullable=False)
+    posts = db.Column(db.Integer, nullable=False) #yayınlanmış
+    drafts = db.Column(db.Integer, nullable=False)
+    comments = db.Column(db.Integer, nullable=False)
+    likes = db.Column(db.Integer, nullable=False)
+    follows = db.Column(db.Integer, nullable=False)
+    messages = db.Column(db.Integer, nullable=False)
+    pending_messages = db.Column(db.Integer, nullable=False)
+    recorded_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False) #gün içinde son güncelleme
+
+
 class ContactMessage(db.Model):
     __tablename__ = 'contact_messages'
     
@@ -212,7 +316,7 @@ class ContactMessage(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     replied_at = db.Column(db.DateTime)
     
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True) # Kayıtlı kullanıcıysa (misafirler için NULL)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=True) # Kayıtlı kullanıcıysa (misafirler için NULL)
 
 
 
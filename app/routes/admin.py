@@ -1,87 +1,139 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import (Blueprint, render_template, request, redirect, url_for, flash, current_app, abort, Response,
+                   stream_with_context, jsonify)
 from flask_login import login_required, current_user
-from datetime import datetime
+import os
+from datetime import date, datetime
+from sqlalchemy.orm import joinedload
 from app import db
-from app.models import User, Post, Comment, Like, Follow, ContactMessage, Notification
+from app.models import User, Post, Comment, ContactMessage
 from app.utils.decorators import admin_required
+from app.utils.helpers import create_notification
+from app.utils.admin_tables import ADMIN_TABLES, EXPORT_FORMATS, export_lines
+from app.utils.stats import get_stats
+from app.utils.passwords import password_metrics
+from app.utils.trending import trending_posts
+from app.utils.sql_profiler import reset_sql_profile, sql_profile_summary
+from app.utils.purge import delete_posts, delete_user
 
 bp = Blueprint('admin', __name__, url_prefix='/admin') #admin blueprint i -- tüm route lar /admin ile başlayacak(/admin/posts)
 
+def _recent_users():
+    return User.query.filter(User.deleted_at.is_(None)).order_by(User.created_at.desc()).limit(5).all() #en son 5 kullanıcı
+
+def _recent_posts():
+    return Post.query.options(joinedload(Post.author)).filter_by(is_published=True).order_by(
+        Post.created_at.desc()
+    ).limit(5).all() #en son 5 yazı
+
+def _popular_posts():
+    return trending_posts(options=[joinedload(Post.author)]) #trend puanına göre ilk yazılar (önceden hesaplanmış)
+
+def _recent_comments():
+    return Comment.query.options(
+        joinedload(Comment.author), joinedload(Comment.post)
+    ).order_by(Comment.created_at.desc()).limit(5).all() #yazar ve yazı her yorum için ayrı sorguyla yüklenmesin
+
+def _recent_messages():
+    return ContactMessage.query.order_by(
+        ContactMessage.created_at.desc()
+    ).limit(5).all()
+
 @bp.route('/')
 @login_required
 @admin_required
 def admin_dashboard():
-    """Admin ana panel""" #her tablodan sayıları çek count ile
-    total_users = User.query.count() 
-    total_posts = Post.query.filter_by(is_published=True).count()
-    total_comments = Comment.query.count()
-    total_drafts = Post.query.filter_by(is_published=False).count()
-    total_likes = Like.query.count()
-    total_follows = Follow.query.count()
-    total_messages = ContactMessage.query.count()
-    unread_messages = ContactMessage.query.filter_by(status='pending').count()
-    
-    recent_users = User.query.order_by(User.created_at.desc()).limit(5).all() #en son 5 kullanıcı
-    recent_posts = Post.query.filter_by(is_published=True).order_by(
-        Post.created_at.desc()
-    ).limit(5).all() #en son 5 yazı
-    popular_posts = Post.query.filter_by(is_published=True).order_by(
-        Post.views.desc()
-    ).limit(5).all() # en popüler 5 yazı
-    recent_comments = Comment.query.order_by(Comment.created_at.desc()).limit(5).all() 
-    recent_messages = ContactMessage.query.order_by(
-        ContactMessage.created_at.desc()
-    ).limit(5).all()  
+    """Admin ana panel"""
+    stats = get_stats() #sayılar tek sorguda hesaplanıp önbellekten gelir (app/utils/stats.py)
     
+    #listeler fonksiyon olarak verilir: şablondaki {% cache %} bloğu önbellekte yoksa çalıştırılır
     return render_template('admin/dashboard.html', #admine bu bilgilerin hazır olduğu sayfa gösterilir
-                         total_users=total_users,
-                         total_posts=total_posts,
-                         total_comments=total_comments,
-                         total_drafts=total_drafts,
-                         total_likes=total_likes,
-                         total_follows=total_follows,
-                         total_messages=total_messages,
-                         unread_messages=unread_messages,
-                         recent_users=recent_users,
-                         recent_posts=recent_posts,
-                         popular_posts=popular_posts,
-                         recent_comments=recent_comments,
-                         recent_messages=recent_messages)
+                         stats=stats['counts'],
+                         trends=stats['trends'],
+                         trend_days=current_app.config['STATS_TREND_DAYS'],
+                         recent_users=_recent_users,
+                         recent_posts=_recent_posts,
+                         popular_posts=_popular_posts,
+                         recent_comments=_recent_comments,
+                         recent_messages=_recent_messages)
+
+@bp.route('/metrics')
+@login_required
+@admin_required
+def admin_metrics():
+    """Bu worker ın çalışma ölçümleri (JSON)"""
+    return jsonify({'pid': os.getpid(), 'password_hashing': password_metrics(), 'sql': sql_profile_summary()})
+
+@bp.route('/sql')
+@login_required
+@admin_required
+def admin_sql():
+    """Endpoint lerin SQL profili: en yavaş endpoint ler, sorgu sayıları ve N+1 uyarıları (bu worker)"""
+    return render_template('admin/sql.html',
+                         endpoints=sql_profile_summary(),
+                         threshold=current_app.config['SQL_N_PLUS_ONE_THRESHOLD'],
+                         pid=os.getpid())
+
+@bp.route('/sql/reset', methods=['POST'])
+@login_required
+@admin_required
+def admin_sql_reset():
+    """SQL profili ölçümlerini sıfırla"""
+    reset_sql_profile()
+    flash('SQL profili sıfırlandı.', 'success')
+    return redirect(url_for('admin.admin_sql'))
+
+def _admin_list(kind, template, **context):
+    """Süzülmüş ve cursor ile sayfalanmış admin listesi (app/utils/admin_tables.py)"""
+    table = ADMIN_TABLES[kind]
+    return render_template(template,
+                         page=table.page(request.args),
+                         filters=table.active_filters(request.args),
+                         kind=kind,
+                         **context)
 
 @bp.route('/users')
 @login_required
 @admin_required
 def admin_users():
     """Kullanıcı yönetimi"""
-    users = User.query.order_by(User.created_at.desc()).all()
-    return render_template('admin/users.html', users=users)
+    return _admin_list('users', 'admin/users.html')
 
 @bp.route('/posts')
 @login_required
 @admin_required
 def admin_posts():
     """Yazı yönetimi"""
-    posts = Post.query.order_by(Post.created_at.desc()).all()
-    return render_template('admin/posts.html', posts=posts)
+    return _admin_list('posts', 'admin/posts.html')
 
 @bp.route('/comments')
 @login_required
 @admin_required
 def admin_comments():
     """Yorum yönetimi"""
-    comments = Comment.query.order_by(Comment.created_at.desc()).all()
-    return render_template('admin/comments.html', comments=comments)
+    return _admin_list('comments', 'admin/comments.html')
 
 @bp.route('/messages')
 @login_required
 @admin_required
 def admin_messages():
     """Mesaj yönetimi"""
-    messages = ContactMessage.query.order_by(ContactMessage.created_at.desc()).all()
-    unread_count = ContactMessage.query.filter_by(status='pending').count()
-    return render_template('admin/messages.html', 
-                         messages=messages, 
-                         unread_count=unread_count)
+    unread_count = get_stats()['counts']['pending_messages']
+    return _admin_list('messages', 'admin/messages.html', unread_count=unread_count)
+
+@bp.route('/export/<kind>.<fmt>')
+@login_required
+@admin_required
+def admin_export(kind, fmt):
+    """Listeyi (aynı süzgeçlerle) CSV/JSONL olarak indir -- satırlar parti parti gönderilir, bellekte tutulmaz"""
+    table = ADMIN_TABLES.get(kind)
+    if table is None or fmt not in EXPORT_FORMATS:
+        abort(404)
+    filename = f'{kind}-{date.today().isoformat()}.{fmt}'
+    return Response(
+        stream_with_context(export_lines(table, request.args, fmt)),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
 
 @bp.route('/message/<int:id>', methods=['GET', 'POST'])
 @login_required
@@ -104,15 +156,13 @@ def admin_message_detail(id):
             db.session.commit()
             
             if message.user_id: #eğer mesajı gönderen kayıtlı kullanıcıysa ona bildirim gönder
-                notification = Notification(
+                create_notification(
                     user_id=message.user_id,
                     sender_id=current_user.id,
-                    type='reply',
+                    notif_type='reply',
                     message=f'Mesajınıza cevap verildi: {message.subject}',
                     link=url_for('user.my_messages') #mesajlarım sayfasına link
                 )
-                db.session.add(notification)
-                db.session.commit()
             
             flash('Cevabınız gönderildi!', 'success')
             return redirect(url_for('admin.admin_messages'))
@@ -170,9 +220,8 @@ def admin_delete_user(id):
         flash('Kendi hesabınızı silemezsiniz!', 'danger')
         return redirect(url_for('admin.admin_users'))
     
-    username = user.username #username değişkeninde tut çünkü delete() sonrası user nesnesi yok olur
-    db.session.delete(user)
-    db.session.commit()
+    username = user.username #username değişkeninde tut çünkü silme sonrası user nesnesi yok olur
+    delete_user(user) #işaretlenir; satırları USER_DELETE_MODE a göre hemen ya da arka planda parça parça silinir
     flash(f'{username} kullanıcısı silindi!', 'success')
     return redirect(url_for('admin.admin_users'))
 
@@ -183,7 +232,7 @@ def admin_delete_post(id):
     """Yazı sil (admin)"""
     post = Post.query.get_or_404(id)
     title = post.title
-    db.session.delete(post)
+    delete_posts([post.id])
     db.session.commit()
     flash(f'"{title}" yazısı silindi!', 'success')
     return redirect(url_for('admin.admin_posts'))
\ No newline at end of file
@@ -2,6 +2,9 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_user, logout_user, login_required, current_user
 from app import db
 from app.models import User
+from app.utils.passwords import HashingBusy, hash_password, verify_password
+
+RETRY_AFTER = {'Retry-After': '5'} #hash kuyruğu doluyken istemci bu kadar saniye sonra tekrar denesin
 
 bp = Blueprint('auth', __name__) #auth için blueprint
 
@@ -25,8 +28,13 @@ def register():
             flash('Bu e-posta zaten kullanılıyor!', 'danger') # varsa hata mesajı göster ve kayıt sayfasına geri dön
             return redirect(url_for('auth.register'))
         
-        user = User(username=username, email=email) #yeni kullanıcı oluştur
-        user.set_password(password) #set_password şifreyi hashleyerek kaydet güvenlik için
+        try:
+            password_hash = hash_password(password) #şifre sınırlı hash havuzunda hashlenir (app/utils/passwords.py)
+        except HashingBusy: #sunucu yoğun: beklemek yerine hemen reddet
+            flash('Sistem şu anda çok yoğun, lütfen birkaç saniye sonra tekrar deneyin.', 'warning')
+            return render_template('register.html'), 503, RETRY_AFTER
+        
+        user = User(username=username, email=email, password_hash=password_hash) #yeni kullanıcı oluştur
         db.session.add(user) #vt ekle
         db.session.commit() #vt kaydet
         
@@ -45,9 +53,15 @@ def login():
         username = request.form.get('username')
         password = request.form.get('password')
         
-        user = User.query.filter_by(username=username).first() #kullanıcı adına göre kullanıcıyı bul
+        user = User.query.filter_by(username=username, deleted_at=None).first() #kullanıcı adına göre kullanıcıyı bul (silinmek üzere olanlar hariç)
+        
+        try:
+            valid = user is not None and verify_password(user, password) #hash kontrolü sınırlı havuzda; eski parametreliyse yeniden hashlenir
+        except HashingBusy: #sunucu yoğun: beklemek yerine hemen reddet
+            flash('Sistem şu anda çok yoğun, lütfen birkaç saniye sonra tekrar deneyin.', 'warning')
+            return render_template('login.html'), 503, RETRY_AFTER
         
-        if user and user.check_password(password): #hashlenmiş şifreyi kontrol et
+        if valid: #şifre doğru
             login_user(user) #flask login ile oturumu başlat session a kullanıcı id si kaydedilir
             next_page = request.args.get('next') #korumalı sayfaya giriş yapılmadan girilmeye çalışıldıysa giriş sonrası oraya yönlendir
             flash('Başarıyla giriş yaptınız!', 'success')
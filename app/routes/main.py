@@ -1,8 +1,15 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
 from flask_login import login_required, current_user
+from sqlalchemy.orm import joinedload
 from app import db
-from app.models import Post, ContactMessage, Notification, User
-from app.utils.helpers import create_notification
+from app.models import Post, ContactMessage, User
+from app.utils.helpers import create_notification, create_notifications
+from app.utils.viewer_state import viewer_state
+from app.utils.search import search_posts, search_snippets
+from app.utils.pagination import decode_cursor, keyset_paginate
+from app.utils.fragment_cache import cached
+from app.utils.conditional import conditional_page
+from app.utils.trending import trending_posts
 #blueprint modüler route yapısı için
 #render_template html template leri render etmek için
 #request http request verilerine erişim
@@ -13,6 +20,17 @@ from app.utils.helpers import create_notification
 
 bp = Blueprint('main', __name__) #blueprint nesnesi oluşturuluyor. isin main - url oluşturulurken kullanılır (url_for('main.index'))
 
+def published_categories():
+    """Yayınlanmış yazıların kategorileri (tekrarsız)"""
+    categories = db.session.query(Post.category).filter_by(
+        is_published=True
+    ).distinct().all() #tüm kategorileri çek tekrarsız -- distinct aynı kategoriyi bir kez getir
+    return [cat[0] for cat in categories if cat[0]] # [cat[0] for cat in categories if cat[0]] her turple ın ilk elemanını al none olanları filtrele
+
+def popular_posts():
+    """Trend yazılar -- son görüntülenme/beğeni/yorumlara göre, zamanla sönen puan (arka planda hesaplanır)"""
+    return trending_posts()
+
 @bp.route('/') #bu fonksiyon ana sayfa (/) için çalışır
 def index():
     """Ana sayfa"""
@@ -20,40 +38,63 @@ def index():
     category = request.args.get('category', None) #kategori filtresi
     search = request.args.get('search', None) #arama sorgusu
     
-    query = Post.query.filter_by(is_published=True)
+    query = Post.query.options(joinedload(Post.author)).filter_by(is_published=True) #kartlardaki yazar adı için yazı başına sorgu olmasın
     #Post.query sqlalchemy sorgusu başlatılıyor
     #filter_by(is_published=True) sadece yayınlanmış yazıları getir
     
     if category: #kategori varsa ona göre filtrele
         query = query.filter_by(category=category)
     
-    if search: #arama varsa --ilike büyük küçük harf duyarsızlığı --%{search}% başında sonunda veya ortasında search kelimesi geçenler
-        query = query.filter(
-            (Post.title.ilike(f'%{search}%')) | # başlıkta veya içerikte ara
-            (Post.content.ilike(f'%{search}%'))
+    config = current_app.config
+    pagination = config['SEARCH_PAGINATION'] if search else config['INDEX_PAGINATION']
+    after = decode_cursor(request.args.get('cursor')) #sonraki sayfa: bu yazıdan eskiler
+    before = decode_cursor(request.args.get('before')) #önceki sayfa: bu yazıdan yeniler
+    if after or before: #cursor linkinden gelindiyse ayar ne olursa olsun cursor modu
+        pagination = 'cursor'
+    
+    if pagination == 'cursor': #keyset sayfalama: OFFSET taraması ve (istenmedikçe) COUNT(*) yok
+        if search:
+            query = search_posts(query, search, ranked=False) #cursor (created_at, id) sırasını kullanır
+        posts = keyset_paginate(
+            query, Post.created_at, Post.id,
+            per_page=config['POSTS_PER_PAGE'],
+            after=after,
+            before=before,
+            with_total=config['INDEX_SHOW_TOTAL']
+        )
+    else:
+        if search: #arama varsa tam metin indeksinde ara, sonuçlar alaka sırasına göre gelir (app/utils/search.py)
+            query = search_posts(query, search)
+        else:
+            query = query.order_by(Post.created_at.desc()) #En yeni yazılar önce gelsin
+        
+        posts = query.paginate( #paginate() sayfalama ekler
+            page=page, #hangi sayfa
+            per_page=config['POSTS_PER_PAGE'], #sayfada 6 yazı göster
+            error_out=False #geçersiz sayfa numarasında hata verme, boş sayfa döndür
         )
+    categories = cached('post-categories', published_categories, tags=('posts',)) #yazı eklenip/düzenlenip/silinince yenilenir
     
-    posts = query.order_by(Post.created_at.desc()).paginate( #order_by(Post.created_at.desc()): En yeni yazılar önce gelsin paginate() sayfalama ekler
-        page=page, #hangi sayfa
-        per_page=6, #sayfada 6 yazı göster
-        error_out=False #geçersiz sayfa numarasında hata verme, boş sayfa döndür
+    #listedeki yazılar ve sayaçları değişmediyse 304 (alıntılar, izleyici durumu ve şablon atlanır)
+    page = conditional_page(
+        [(post.id, post.updated_at, post.likes_count, post.comments_count) for post in posts.items],
+        posts.has_next, posts.has_prev, getattr(posts, 'total', None), categories,
+        last_modified=max((post.updated_at for post in posts.items if post.updated_at), default=None),
     )
+    if page.not_modified:
+        return page.response()
     
-    categories = db.session.query(Post.category).filter_by(
-        is_published=True
-    ).distinct().all() #tüm kategorileri çek tekrarsız -- distinct aynı kategoriyi bir kez getir
-    categories = [cat[0] for cat in categories if cat[0]] # [cat[0] for cat in categories if cat[0]] her turple ın ilk elemanını al none olanları filtrele
+    snippets = search_snippets(posts.items, search) if search else {} #sadece bu sayfadaki yazılar için vurgulu alıntı
+    viewer_state().load_posts(posts.items) #sayfadaki yazıların beğeni/kayıt durumu ilişki başına tek sorguda
     
-    popular_posts = Post.query.filter_by(
-        is_published=True
-    ).order_by(Post.views.desc()).limit(5).all() 
-    #Post.views.desc() görüntüleme sayısına göre azalan sırada sadece 5 yani en çok görüntülenen 5 yazıyı getir
-    
-    return render_template('index.html', #html template ini render et ve döndür
+    return page.response(render_template('index.html', #html template ini render et ve döndür
                          posts=posts, #parametreler template de kullanılabilir
                          categories=categories, 
-                         popular_posts=popular_posts, 
-                         current_category=category)
+                         popular_posts=popular_posts, #fonksiyon: sadece sidebar önbellekte yoksa çalışır
+                         current_category=category,
+                         search=search,
+                         pagination=pagination,
+                         snippets=snippets))
 
 @bp.route('/about') #/about url i için basit bir sayfa
 def about(): # sadece template render edip döndürüyor
@@ -80,18 +121,14 @@ def contact():
         db.session.commit() #değişiklikleri kaydet(insert sql çalışır)
         
         # Admin'lere bildirim
-        admins = User.query.filter_by(is_admin=True).all()
-        for admin in admins: #tüm admin kullanıcıları bul her admin için bildirim oluştur
-            notification = Notification(
-                user_id=admin.id,
-                sender_id=current_user.id if current_user.is_authenticated else None,
-                type='contact', #bildirim tipi (icon göstermek için)
-                message=f'Yeni iletişim mesajı: {subject}', #f string ile mesaj oluştur
-                link=url_for('admin.admin_messages') #admin mesajlar sayfasının url i
-            )
-            db.session.add(notification)
-        
-        db.session.commit() #bildirimleri kaydet
+        admin_ids = db.session.scalars(db.select(User.id).filter_by(is_admin=True)).all() #sadece id ler
+        create_notifications( #her admin için bildirim, arka planda tek toplu INSERT ile yazılır
+            admin_ids,
+            sender_id=current_user.id if current_user.is_authenticated else None,
+            notif_type='contact', #bildirim tipi (icon göstermek için)
+            message=f'Yeni iletişim mesajı: {subject}', #f string ile mesaj oluştur
+            link=url_for('admin.admin_messages') #admin mesajlar sayfasının url i
+        )
         flash('Mesajınız gönderildi! En kısa sürede dönüş yapılacaktır.', 'success') #kullanıcıya başarı mesajı göster (bir sonraki sayfada görünür)
         
         if current_user.is_authenticated:
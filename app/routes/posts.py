@@ -1,38 +1,63 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
 from app import db
-from app.models import Post, Comment, Like, Bookmark
+from sqlalchemy.orm import contains_eager
+from app.models import Post, Comment, Like, Bookmark, User
 from app.utils.helpers import save_image, create_notification
+from app.utils.markdown_render import store_rendered
+from app.utils.view_counter import record_view
+from app.utils.comments import comment_page, reply_subtree
+from app.utils.viewer_state import viewer_state
+from app.utils.conditional import conditional_page
+from app.utils.related import related_posts as find_related_posts
+from app.utils.purge import delete_posts
 
 bp = Blueprint('posts', __name__) #yazılar için blueprint oluşturuluyor
 
+def _post_or_404(id):
+    """Yazıyı yazarıyla tek sorguda bul; yazar silinmek üzere işaretlendiyse (profil sayfası gibi) 404"""
+    return (
+        Post.query.join(Post.author).options(contains_eager(Post.author))
+        .filter(Post.id == id, User.deleted_at.is_(None))
+        .first_or_404()
+    )
+
 @bp.route('/post/<int:id>') #/post/5 gibi url ler için route (5=yazı ıd si) -- int:id url den int parametresi al
 def detail(id):
     """Yazı detay sayfası"""
-    post = Post.query.get_or_404(id) #id ye göre yazı bul bulamazsa 404 hatası
-    post.views += 1 #görüntüleme sayısını artır
-    db.session.commit() #değişiklikleri kaydet
+    post = _post_or_404(id) #id ye göre yazı bul bulamazsa 404 hatası (silinen kullanıcının yazısı da)
+    record_view(post.id) #görüntülenme bellekte toplanır, arka planda toplu UPDATE ile yazılır (commit yok) -- 304 te de sayılır
+    
+    related_posts = find_related_posts(post) #içerik benzerliğine göre önceden hesaplanmış liste (related_posts tablosu), burada hesap yok
     
-    comments = Comment.query.filter_by(post_id=id).order_by( #bu yazıya ait tüm yorumları getir
-        Comment.created_at.desc() #desc azalan yani yeni olan başa
-    ).all() #tüm sonuçları liste olarak getir
+    #tarayıcıdaki sayfa hala güncelse yorumlar yüklenmeden ve şablon render edilmeden 304 dön
+    page = conditional_page(post.id, post.updated_at, post.likes_count, post.comments_count,
+                            [(related.id, related.updated_at) for related in related_posts],
+                            last_modified=post.updated_at)
+    if page.not_modified:
+        return page.response()
     
-    related_posts = Post.query.filter( #ilgili yazıları bul
-        Post.category == post.category, #aynı kategoride olan
-        Post.id != post.id, #bu yazı değil
-        Post.is_published == True #yayınlanmış olan
-    ).limit(3).all() # en fazla 3 tane getir
+    comments_page = request.args.get('comments_page', 1, type=int)
+    comments = comment_page(post.id, comments_page) #kök yorumların bir sayfası + cevapları tek sorguda (ağaç halinde)
+    viewer_state().load_posts([post]) #beğendi mi / kaydetti mi -- şablonda tekrar sorgu yok
     
-    return render_template('post.html', #template e 3 veri gönder
+    return page.response(render_template('post.html', #template e 3 veri gönder
                          post=post,  #yazı
                          comments=comments, #yorumlar
-                         related_posts=related_posts) #ilgili yazılar
+                         related_posts=related_posts)) #ilgili yazılar
+
+@bp.route('/comment/<int:id>/replies')
+def comment_replies(id):
+    """Derin cevapları yükle (sayfada gösterilmeyen alt dallar)"""
+    comment = Comment.query.get_or_404(id)
+    node = reply_subtree(comment)
+    return render_template('comment_replies.html', post=comment.post, nodes=node.children)
 
 @bp.route('/post/<int:id>/comment', methods=['POST']) #yazıya yorum ekleme route u
 @login_required #sadece giriş yapmış kullanıcılar yorum yapabilir
 def add_comment(id):
     """Yorum ekle"""
-    post = Post.query.get_or_404(id)
+    post = _post_or_404(id)
     content = request.form.get('content') # content:yorum metni
     parent_id = request.form.get('parent_id', type=int) #parent_id: eğer bir yoruma cevap veriliyorsa, o yorumun id si(yoksa none)
     
@@ -75,7 +100,7 @@ def add_comment(id):
 @login_required #yazıyı beğenip beğenmeme route u
 def like(id):
     """Yazıyı beğen/beğenme"""
-    post = Post.query.get_or_404(id) #id ye göre yazıyı bul
+    post = _post_or_404(id) #id ye göre yazıyı bul
     
     existing_like = Like.query.filter_by( #yazı beğenilmiş mi
         user_id=current_user.id, 
@@ -112,7 +137,7 @@ def like(id):
 @login_required # yer imi (bookmark) toogle
 def bookmark(id):#kaydetme
     """Yazıyı yer imlerine ekle/çıkar"""
-    post = Post.query.get_or_404(id)
+    post = _post_or_404(id)
     
     existing_bookmark = Bookmark.query.filter_by(
         user_id=current_user.id, 
@@ -153,6 +178,7 @@ def create():
             user_id=current_user.id, #yazarı kaydet
             is_published=is_published
         )
+        store_rendered(post) #markdown u bir kez burada render et, detay sayfası saklanan html i okur
         
         db.session.add(post) #vt ye ekle
         db.session.commit() # kaydet
@@ -181,6 +207,7 @@ def edit(id):
         post.content = request.form.get('content')
         post.summary = request.form.get('summary')
         post.category = request.form.get('category')
+        store_rendered(post) #içerik değiştiyse html i yeniden üret
         
         image = request.files.get('image')
         if image: #yeni resim yüklendiyse eskiyi değiştir
@@ -204,7 +231,7 @@ def delete(id):
         flash('Bu yazıyı silme yetkiniz yok!', 'danger')
         return redirect(url_for('main.index'))
     
-    db.session.delete(post) #vt den sil (delete sql) -- cascade delete yani ilişkili yorum ve beğeniler de otomatik silinir (models.py deki tanımdan)
+    delete_posts([post.id]) #tek DELETE -- ilişkili yorum, beğeni ve kayıtları vt siler (ON DELETE CASCADE), sayaçlar toplu güncellenir
     db.session.commit()
     flash('Yazı silindi!', 'success')
     return redirect(url_for('main.index'))
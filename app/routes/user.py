@@ -1,15 +1,23 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+import json
+import queue
+import time
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app, Response
 from flask_login import login_required, current_user
 from app import db
 from app.models import User, Post, Follow, Bookmark, ContactMessage, Notification
 from app.utils.helpers import save_image, create_notification
+from app.utils.pagination import decode_cursor, keyset_paginate
+from app.utils.timeline import timeline_page
+from app.utils.notify_broker import get_broker, publish_unread
+from app.utils.viewer_state import viewer_state
+from app.utils.conditional import conditional_page
 
 bp = Blueprint('user', __name__)
 
 @bp.route('/profile/<username>') #/profile/fatmanur gibi url ler
 def profile(username):
     """Kullanıcı profili"""
-    user = User.query.filter_by(username=username).first_or_404() #kullanıcı adına göre kullanıcıyı bul bulamazsa 404
+    user = User.query.filter_by(username=username, deleted_at=None).first_or_404() #kullanıcı adına göre kullanıcıyı bul bulamazsa 404
     
     if current_user.is_authenticated and current_user.id == user.id: #eğer kendi profiline bakıyorsa tüm yazıları göster (taslaklar dahil)
         posts = Post.query.filter_by(user_id=user.id).order_by(
@@ -21,13 +29,22 @@ def profile(username):
             is_published=True
         ).order_by(Post.created_at.desc()).all()
     
-    return render_template('profile.html', user=user, posts=posts)
+    page = conditional_page( #profil (version: düzenlenince artar), sayaçlar ve yazılar değişmediyse 304
+        user.id, user.version, user.posts_count, user.followers_count, user.following_count,
+        [(post.id, post.updated_at, post.likes_count, post.comments_count) for post in posts],
+        last_modified=max((post.updated_at for post in posts if post.updated_at), default=None),
+    )
+    if page.not_modified:
+        return page.response()
+    
+    viewer_state().load_users([user]) #takip ediyor mu (şablonda iki kez soruluyor, tek sorgu)
+    return page.response(render_template('profile.html', user=user, posts=posts))
 
 @bp.route('/profile/<username>/edit', methods=['GET', 'POST'])
 @login_required
 def edit_profile(username):
     """Profil düzenle"""
-    user = User.query.filter_by(username=username).first_or_404()
+    user = User.query.filter_by(username=username, deleted_at=None).first_or_404()
     
     if user.id != current_user.id: #sadece kendi profilini düzenleyebilir
         flash('Bu profili düzenleme yetkiniz yok!', 'danger')
@@ -52,7 +69,7 @@ def edit_profile(username):
 @login_required
 def follow(username):
     """Kullanıcıyı takip et/takipten çık"""
-    user = User.query.filter_by(username=username).first_or_404()
+    user = User.query.filter_by(username=username, deleted_at=None).first_or_404()
     
     if user.id == current_user.id: #validasyon kendini takip edemezsin
         return jsonify({'error': 'Kendinizi takip edemezsiniz!'}), 400 #400 bad request http status kodu
@@ -81,37 +98,48 @@ def follow(username):
             'followers_count': user.get_followers_count()
         })
 
+def _follow_page(user_column, other_column, user_id):
+    """Takip listesinden bir sayfa kullanıcı: follows + users join, takip tarihine göre yeniden eskiye cursor ile"""
+    #yazı/takipçi sayıları users tablosundaki sayaç kolonlarından gelir -- satır başına sorgu yok
+    query = db.session.query(User, Follow.created_at.label('created_at'), Follow.id.label('id')).join(
+        Follow, other_column == User.id
+    ).filter(user_column == user_id, User.deleted_at.is_(None)) #silinmek üzere işaretlenenler temizlenene kadar gizli
+    page = keyset_paginate(
+        query, Follow.created_at, Follow.id,
+        per_page=current_app.config['FOLLOWS_PER_PAGE'],
+        after=decode_cursor(request.args.get('cursor')),
+        before=decode_cursor(request.args.get('before')),
+    )
+    page.items = [row.User for row in page.items] #cursor lar follow satırından üretildi, şablona kullanıcılar gider
+    viewer_state().load_users(page.items) #listedeki herkes için takip durumu tek sorguda
+    return page
+
 @bp.route('/profile/<username>/followers')
 def followers(username):
     """Kullanıcının takipçileri""" #kullanıcıların takipçilerini listele
-    user = User.query.filter_by(username=username).first_or_404()
-    followers_list = [Follow.query.get(f.id).follower for f in user.followers.all()] #user.followers.all() bu kullanıcıyı takip eden follow kayıtları
-    return render_template('followers.html', user=user, followers=followers_list) #List comprehension ile Follow nesnelerinden User nesnelerine çevir
+    user = User.query.filter_by(username=username, deleted_at=None).first_or_404()
+    followers_page = _follow_page(Follow.followed_id, Follow.follower_id, user.id) #bu kullanıcıyı takip edenler
+    return render_template('followers.html', user=user, followers=followers_page)
 
 @bp.route('/profile/<username>/following')
 def following_list(username):
     """Kullanıcının takip ettikleri"""
-    user = User.query.filter_by(username=username).first_or_404()
-    following = [Follow.query.get(f.id).followed for f in user.following.all()]
-    return render_template('user_following.html', user=user, following=following)
+    user = User.query.filter_by(username=username, deleted_at=None).first_or_404()
+    following_page = _follow_page(Follow.follower_id, Follow.followed_id, user.id) #bu kullanıcının takip ettikleri
+    return render_template('user_following.html', user=user, following=following_page)
 
 @bp.route('/following')
 @login_required
 def following_posts():
     """Takip edilen yazarların yazıları"""
-    following_ids = [f.followed_id for f in current_user.following.all()] #takip edilen kullanıcı id lerini al
-    
-    if not following_ids: #takip edilen kimse yoksa
-        posts = []
-    else:
-        page = request.args.get('page', 1, type=int) #takip edilen varsa sayfa varsayılanı 1
-        posts_query = Post.query.filter(
-            Post.user_id.in_(following_ids), #sql in operatörü takip edilen kullanıcıların id lerini al
-            Post.is_published == True #yayınlanmış
-        ).order_by(Post.created_at.desc()) #en yeniler en üstte
-        posts = posts_query.paginate(page=page, per_page=6, error_out=False) #yazıları sayfalandır ve göster
-    
-    return render_template('following.html', posts=posts)
+    cursor = decode_cursor(request.args.get('cursor')) #son görülen yazının (created_at, id) si -- yoksa ilk sayfa
+    posts = timeline_page( #hazır feed + çok takipçili yazarların yazıları, offset/count yok
+        current_user,
+        cursor=cursor,
+        per_page=current_app.config['POSTS_PER_PAGE']
+    )
+    viewer_state().load_posts(posts.items)
+    return render_template('following.html', posts=posts, is_first_page=cursor is None)
 
 @bp.route('/drafts')
 @login_required
@@ -133,20 +161,24 @@ def bookmarks():
         user_id=current_user.id
     ).order_by(Bookmark.created_at.desc()).all()
     posts = [b.post for b in bookmarks if b.post.is_published]
+    viewer_state().load_posts(posts)
     return render_template('bookmarks.html', posts=posts)
 
 @bp.route('/notifications')
 @login_required
 def notifications():
     """Bildirimler"""
+    #tüm bildirimleri tek UPDATE ile okundu işaretle; liste commit ten sonra okunur (commit sonrası her nesne ayrı sorguyla yenilenmesin)
+    db.session.execute(
+        Notification.__table__.update()
+        .where(Notification.user_id == current_user.id, Notification.is_read == False)
+        .values(is_read=True)
+    )
+    db.session.commit()
     notifications = current_user.notifications.order_by(
         Notification.created_at.desc()
     ).limit(50).all() #kullanıcının bildirimleri son 50 tane
-    
-    for notif in notifications: #tüm bildirimleri okundu işaretle. for döngüsü ile her bildirimin is_read flag ini true yap
-        if not notif.is_read:
-            notif.is_read = True
-    db.session.commit()
+    publish_unread(current_user.id, 0) #diğer açık sekmelerdeki rozeti sıfırla (hepsi az önce okundu, tekrar saymaya gerek yok)
     
     return render_template('notifications.html', notifications=notifications)
 
@@ -157,6 +189,42 @@ def unread_notifications_count():
     count = current_user.get_unread_notifications_count()
     return jsonify({'count': count}) #sadece sayıyı döndür(json)
 
+def _sse(event, data):
+    """Server-Sent Events mesaj formatı"""
+    return f'event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n'
+
+@bp.route('/notifications/stream')
+@login_required
+def notifications_stream():
+    """Bildirim akışı (Server-Sent Events)""" #yeni bildirimler ve okunmamış sayısı push edilir, istemci artık 30 sn de bir sormaz
+    user_id = current_user.id #generator istek bittikten sonra çalışır, current_user a orada güvenilmez
+    initial_count = current_user.get_unread_notifications_count()
+    config = current_app.config
+    timeout = config['NOTIFICATION_STREAM_TIMEOUT']
+    heartbeat = config['NOTIFICATION_STREAM_HEARTBEAT']
+    broker = get_broker()
+    subscription = broker.subscribe(user_id)
+    
+    def generate():
+        try:
+            yield 'retry: 5000\n\n' #bağlantı koparsa tarayıcı 5 sn sonra yeniden bağlanır
+            yield _sse('unread', {'count': initial_count})
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                try:
+                    message = subscription.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ': ping\n\n' #yorum satırı, istemci yok sayar
+                    continue
+                yield _sse(message['event'], message['data'])
+        finally:
+            broker.unsubscribe(user_id, subscription) #sekme kapandığında/bağlantı bittiğinde aboneliği bırak
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no', #nginx in yanıtı tamponlamaması için
+    })
+
 @bp.route('/my-messages')
 @login_required
 def my_messages():
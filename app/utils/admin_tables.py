@@ -0,0 +1,204 @@
+#admin_tables.py admin listeleri: url süzgeçleri, cursor sayfalama ve sabit bellekle akışlı CSV/JSONL dışa aktarma
+#Her liste (users, posts, comments, messages) süzgeçlerini request.args tan okur; aynı süzgeçler hem sayfalı tabloda
+#hem dışa aktarmada kullanılır. Sayılar sayaç kolonlarından gelir, ilişkiler joinedload ile yüklenir.
+#Dışa aktarma ORM nesnesi oluşturmadan sadece kolonları seçer ve yield_per ile (postgres te sunucu taraflı cursor)
+#ADMIN_EXPORT_BATCH satırlık partiler halinde okur; her parti yazılıp tarayıcıya gönderilir.
+import csv
+import io
+import json
+from datetime import date, datetime
+from flask import current_app
+from sqlalchemy import or_, select
+from sqlalchemy.orm import joinedload
+from app import db
+from app.models import User, Post, Comment, ContactMessage
+from app.utils.pagination import decode_cursor, keyset_paginate
+
+EXPORT_FORMATS = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
+
+
+def _contains(column, text):
+    #kullanıcının yazdığı % ve _ joker karakter sayılmasın
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return column.ilike(f'%{escaped}%', escape='\\')
+
+
+def _user_id(username):
+    #dış sorgu users tablosunu join etse bile ilişkilendirilmesin (correlate(None))
+    return select(User.id).where(User.username == username).correlate(None).scalar_subquery()
+
+
+def _arg(args, name):
+    return (args.get(name) or '').strip()
+
+
+# --- Süzgeçler: request.args -> koşul listesi ---
+
+def _user_filters(args):
+    conditions = [User.deleted_at.is_(None)] #silinmek üzere işaretlenenler arka planda temizleniyor
+    if q := _arg(args, 'q'):
+        conditions.append(or_(_contains(User.username, q), _contains(User.email, q)))
+    role = _arg(args, 'role')
+    if role == 'admin':
+        conditions.append(User.is_admin.is_(True))
+    elif role == 'user':
+        conditions.append(or_(User.is_admin.is_(False), User.is_admin.is_(None)))
+    return conditions
+
+
+def _post_filters(args):
+    conditions = []
+    if q := _arg(args, 'q'):
+        conditions.append(_contains(Post.title, q))
+    status = _arg(args, 'status')
+    if status == 'published':
+        conditions.append(Post.is_published.is_(True))
+    elif status == 'draft':
+        conditions.append(Post.is_published.is_(False))
+    if category := _arg(args, 'category'):
+        conditions.append(Post.category == category)
+    if author := _arg(args, 'author'):
+        conditions.append(Post.user_id == _user_id(author))
+    return conditions
+
+
+def _comment_filters(args):
+    conditions = []
+    if q := _arg(args, 'q'):
+        conditions.append(_contains(Comment.content, q))
+    kind = _arg(args, 'type')
+    if kind == 'root':
+        conditions.append(Comment.parent_id.is_(None))
+    elif kind == 'reply':
+        conditions.append(Comment.parent_id.isnot(None))
+    if author := _arg(args, 'author'):
+        conditions.append(Comment.user_id == _user_id(author))
+    if _arg(args, 'post').isdigit():
+        conditions.append(Comment.post_id == int(_arg(args, 'post')))
+    return conditions
+
+
+def _message_filters(args):
+    conditions = []
+    if q := _arg(args, 'q'):
+        conditions.append(or_(
+            _contains(ContactMessage.subject, q),
+            _contains(ContactMessage.name, q),
+            _contains(ContactMessage.email, q),
+        ))
+    if status := _arg(args, 'status'):
+        conditions.append(ContactMessage.status == status)
+    return conditions
+
+
+class AdminTable:
+    """Bir admin listesinin modeli, süzgeçleri, tabloda yüklenecek ilişkileri ve dışa aktarılan kolonları"""
+
+    def __init__(self, model, filters, params, eager=(), export=(), joins=()):
+        self.model = model
+        self.filters = filters
+        self.params = params #süzgeç parametre adları (sayfa linklerinde ve dışa aktarmada korunur)
+        self.eager = eager #joinedload edilecek ilişki adları (backref ler mapper kurulunca oluşur, ad ile tutulur)
+        self.export = export #(başlık, kolon) -- ilişkili tabloların kolonları joins ile eklenir
+        self.joins = joins #(model, on koşulu)
+
+    def active_filters(self, args):
+        """Dolu süzgeç parametreleri (url_for a verilir)"""
+        return {name: args[name] for name in self.params if _arg(args, name)}
+
+    def page(self, args):
+        """Süzülmüş listenin bir sayfası (yeniden eskiye, cursor/before parametreleriyle)"""
+        options = [joinedload(getattr(self.model, name)) for name in self.eager]
+        query = self.model.query.options(*options).filter(*self.filters(args))
+        return keyset_paginate(
+            query, self.model.created_at, self.model.id,
+            per_page=current_app.config['ADMIN_PER_PAGE'],
+            after=decode_cursor(args.get('cursor')),
+            before=decode_cursor(args.get('before')),
+        )
+
+    def export_statement(self, args):
+        statement = select(*[column.label(name) for name, column in self.export]).select_from(self.model)
+        for model, onclause in self.joins:
+            statement = statement.outerjoin(model, onclause)
+        return (
+            statement.where(*self.filters(args))
+            .order_by(self.model.created_at.desc(), self.model.id.desc())
+            .execution_options(yield_per=current_app.config['ADMIN_EXPORT_BATCH'])
+        )
+
+
+ADMIN_TABLES = {
+    'users': AdminTable(
+        User, _user_filters, ('q', 'role'),
+        export=[
+            ('id', User.id), ('username', User.username), ('email', User.email), ('is_admin', User.is_admin),
+            ('created_at', User.created_at), ('posts', User.posts_count), ('comments', User.comments_count),
+            ('followers', User.followers_count), ('following', User.following_count),
+        ],
+    ),
+    'posts': AdminTable(
+        Post, _post_filters, ('q', 'status', 'category', 'author'),
+        eager=('author',),
+        export=[
+            ('id', Post.id), ('title', Post.title), ('author', User.username), ('category', Post.category),
+            ('is_published', Post.is_published), ('views', Post.views), ('likes', Post.likes_count),
+            ('comments', Post.comments_count), ('bookmarks', Post.bookmarks_count), ('created_at', Post.created_at),
+        ],
+        joins=[(User, Post.user_id == User.id)],
+    ),
+    'comments': AdminTable(
+        Comment, _comment_filters, ('q', 'type', 'author', 'post'),
+        eager=('author', 'post'),
+        export=[
+            ('id', Comment.id), ('author', User.username), ('post_id', Comment.post_id), ('post_title', Post.title),
+            ('parent_id', Comment.parent_id), ('content', Comment.content), ('created_at', Comment.created_at),
+        ],
+        joins=[(User, Comment.user_id == User.id), (Post, Comment.post_id == Post.id)],
+    ),
+    'messages': AdminTable(
+        ContactMessage, _message_filters, ('q', 'status'),
+        export=[
+            ('id', ContactMessage.id), ('name', ContactMessage.name), ('email', ContactMessage.email),
+            ('user_id', ContactMessage.user_id), ('subject', ContactMessage.subject),
+            ('message', ContactMessage.message), ('status', ContactMessage.status),
+            ('created_at', ContactMessage.created_at), ('replied_at', ContactMessage.replied_at),
+        ],
+    ),
+}
+
+
+# --- Dışa aktarma ---
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _csv_value(value):
+    value = _json_value(value)
+    if isinstance(value, str) and value[:1] in ('=', '+', '-', '@'):
+        return "'" + value #tablolama programında formül olarak çalıştırılmasın
+    return value
+
+
+def export_lines(table, args, fmt):
+    """Süzülmüş listeyi parti parti CSV/JSONL metni olarak üret (stream_with_context ile döndürülür)"""
+    headers = [name for name, _ in table.export]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == 'csv':
+        writer.writerow(headers)
+    result = db.session.execute(table.export_statement(args))
+    for rows in result.partitions(): #yield_per kadar satır; bellekte bir parti tutulur
+        for row in rows:
+            if fmt == 'csv':
+                writer.writerow([_csv_value(value) for value in row])
+            else:
+                buffer.write(json.dumps(dict(zip(headers, map(_json_value, row))), ensure_ascii=False) + '\n')
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell(): #hiç satır yoksa sadece başlık
+        yield buffer.getvalue()
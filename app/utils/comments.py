@@ -0,0 +1,171 @@
+#comments.py yazı detayındaki yorum ağacı
+#Her yorum kök yorumunun id sini (thread_id, kökler için NULL) ve derinliğini (depth) tutar. Böylece bir sayfadaki
+#kök yorumlar ve COMMENT_INLINE_DEPTH derinliğe kadar tüm cevapları tek sorguda gelir, ağaç Python da kurulur.
+#Daha derin cevaplar (replies_count > 0 olan en alt düğümler) istenince ayrı bir istekle yüklenir.
+from flask import current_app
+from sqlalchemy import event, or_, select
+from sqlalchemy.orm import joinedload
+from app import db
+from app.models import Comment
+
+
+class CommentNode:
+    """Şablonda gösterilen yorum + yüklenmiş cevapları"""
+
+    def __init__(self, comment):
+        self.comment = comment
+        self.children = []
+
+    @property
+    def has_more(self):
+        #cevapları var ama bu sayfada yüklenmedi (derinlik sınırı)
+        return self.comment.replies_count > len(self.children)
+
+
+class CommentPage:
+    """Yazının bir sayfalık yorum ağacı: roots, has_next/has_prev, next_page/prev_page"""
+
+    def __init__(self, roots, page, has_next):
+        self.roots = roots
+        self.page = page
+        self.has_next = has_next
+        self.has_prev = page > 1
+        self.next_page = page + 1
+        self.prev_page = page - 1
+
+
+def _build(comments):
+    """Düz yorum listesinden ağaç kur. Kökleri (ebeveyni listede olmayanlar) döndürür"""
+    nodes = {comment.id: CommentNode(comment) for comment in comments}
+    roots = []
+    for comment in comments:
+        parent = nodes.get(comment.parent_id)
+        if parent is not None:
+            parent.children.append(nodes[comment.id])
+        else:
+            roots.append(nodes[comment.id])
+    return nodes, roots
+
+
+def comment_page(post_id, page=1):
+    """Kök yorumların bir sayfası ve cevapları -- tek sorgu, yazarlar joinedload ile"""
+    per_page = current_app.config['COMMENTS_PER_PAGE']
+    max_depth = current_app.config['COMMENT_INLINE_DEPTH']
+    page = max(page, 1)
+    root_ids = (
+        select(Comment.id)
+        .where(Comment.post_id == post_id, Comment.parent_id.is_(None))
+        .order_by(Comment.created_at.desc(), Comment.id.desc())
+        .limit(per_page + 1) #bir fazlası: sonraki sayfa var mı
+        .offset((page - 1) * per_page)
+        .scalar_subquery()
+    )
+    comments = (
+        Comment.query.options(joinedload(Comment.author))
+        .filter(
+            Comment.post_id == post_id,
+            Comment.depth <= max_depth,
+            or_(Comment.id.in_(root_ids), Comment.thread_id.in_(root_ids)),
+        )
+        .order_by(Comment.created_at.asc(), Comment.id.asc()) #cevaplar konuşma sırasıyla
+        .all()
+    )
+    _, roots = _build(comments)
+    roots.sort(key=lambda node: (node.comment.created_at, node.comment.id), reverse=True) #kökler yeniden eskiye
+    return CommentPage(roots[:per_page], page, has_next=len(roots) > per_page)
+
+
+def reply_subtree(comment):
+    """Bir yorumun daha derin cevapları (tek sorgu). Yorumun kendi düğümünü döndürür"""
+    max_depth = current_app.config['COMMENT_INLINE_DEPTH']
+    thread_id = comment.thread_id or comment.id
+    descendants = (
+        Comment.query.options(joinedload(Comment.author))
+        .filter(
+            Comment.thread_id == thread_id,
+            Comment.depth > comment.depth,
+            Comment.depth <= comment.depth + max_depth,
+        )
+        .order_by(Comment.created_at.asc(), Comment.id.asc())
+        .all()
+    )
+    nodes, _ = _build([comment] + descendants) #aynı konudaki diğer dallar köke bağlanmaz, yok sayılır
+    return nodes[comment.id]
+
+
+# --- thread_id / depth yorum eklenirken ebeveynden hesaplanır ---
+
+def _set_thread(mapper, connection, comment):
+    if comment.parent_id is None:
+        comment.thread_id, comment.depth = None, 0
+        return
+    table = Comment.__table__
+    parent = connection.execute(
+        select(table.c.id, table.c.thread_id, table.c.depth).where(table.c.id == comment.parent_id)
+    ).first()
+    if parent is not None:
+        comment.thread_id = parent.thread_id or parent.id
+        comment.depth = parent.depth + 1
+
+
+# --- Silme: cevaplar ORM ile yüklenmez, vt siler (parent_id ON DELETE CASCADE); sayaçlar tek seferde yeniden sayılır ---
+
+def _comment_deleting(mapper, connection, comment):
+    if not comment.replies_count:
+        return
+    table = Comment.__table__
+    #konunun bu derinlikten sonraki yorumlarının yazarları (diğer dallar da dahil -- yeniden saymak zararsız)
+    authors = set(connection.execute(
+        select(table.c.user_id).where(table.c.thread_id == (comment.thread_id or comment.id),
+                                      table.c.depth > comment.depth).distinct()
+    ).scalars())
+    connection.info.setdefault('deleted_comment_authors', {})[comment.id] = authors
+
+
+def _comment_deleted(mapper, connection, comment):
+    from app.models import Post, User
+    from app.utils.counters import recount
+    authors = connection.info.get('deleted_comment_authors', {}).pop(comment.id, None)
+    if authors is None:
+        return
+    recount(connection, User, authors)
+    recount(connection, Post, [comment.post_id])
+
+
+def register_comment_listeners():
+    if event.contains(Comment, 'before_insert', _set_thread):
+        return
+    event.listen(Comment, 'before_insert', _set_thread)
+    #sayaç olaylarından (counters.py) sonra bağlanır: yeniden sayım tek tek azaltmaların üzerine yazar
+    event.listen(Comment, 'before_delete', _comment_deleting)
+    event.listen(Comment, 'after_delete', _comment_deleted)
+
+
+def backfill_comment_threads():
+    """Eski yorumların thread_id/depth değerlerini derinlik derinlik toplu UPDATE ile doldur"""
+    table = Comment.__table__
+    parent = table.alias('parent')
+    db.session.execute(table.update().where(table.c.parent_id.is_(None)).values(thread_id=None, depth=0))
+    #1. seviye: kökün cevapları, konu kökün kendisi
+    updated = db.session.execute(
+        table.update()
+        .where(table.c.parent_id.in_(select(parent.c.id).where(parent.c.parent_id.is_(None))))
+        .values(thread_id=table.c.parent_id, depth=1)
+    ).rowcount
+    total = updated
+    depth = 1
+    while updated: #her turda bir alt seviye: ebeveyni bir önceki turda güncellenenler
+        depth += 1
+        updated = db.session.execute(
+            table.update()
+            .where(table.c.parent_id.in_(
+                select(parent.c.id).where(parent.c.depth == depth - 1, parent.c.parent_id.isnot(None))
+            ))
+            .values(
+                thread_id=select(parent.c.thread_id).where(parent.c.id == table.c.parent_id).scalar_subquery(),
+                depth=depth,
+            )
+        ).rowcount
+        total += updated
+    db.session.commit()
+    return total
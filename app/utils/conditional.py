@@ -0,0 +1,57 @@
+#conditional.py sayfalar için koşullu GET: zayıf ETag + Last-Modified, eşleşirse şablon render edilmeden 304
+#View sayfanın içeriğini belirleyen küçük değerleri (updated_at, sayaçlar, listedeki id ler) verir; bunların özeti ETag olur.
+#Görüntülenme sayısı ve popüler yazılar gibi olay tetiklemeyen değerler ETag e girmez: bunun yerine ETag her
+#CONDITIONAL_GET_WINDOW saniyede bir değişir, yani bu değerler en fazla o kadar eski gösterilir.
+#Sadece giriş yapmamış ziyaretçiler için uygulanır: giriş yapmış kullanıcının sayfası (bildirim rozeti, beğeni durumu,
+#flash mesajları) kişiye özeldir ve her zaman render edilir.
+import hashlib
+import time
+from datetime import datetime
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+from werkzeug.http import is_resource_modified
+
+
+def _window():
+    #(pencere numarası, pencerenin başlangıç zamanı)
+    size = current_app.config['CONDITIONAL_GET_WINDOW']
+    number = int(time.time() // size)
+    return number, datetime.utcfromtimestamp(number * size)
+
+
+class ConditionalPage:
+    """Bir sayfanın doğrulayıcıları. not_modified ise response() 304 döner, değilse verilen gövdeye başlık ekler"""
+
+    def __init__(self, parts, last_modified=None):
+        self.enabled = (
+            current_app.config['CONDITIONAL_GET']
+            and request.method in ('GET', 'HEAD')
+            and not current_user.is_authenticated
+            and '_flashes' not in session #yönlendirmeden sonra gösterilecek mesaj varsa sayfa farklıdır
+        )
+        self.etag = self.last_modified = None
+        self.not_modified = False
+        if not self.enabled:
+            return
+        window, window_start = _window()
+        raw = repr((current_app.config['PAGE_ETAG_VERSION'], window, request.full_path) + tuple(parts))
+        self.etag = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+        self.last_modified = max(last_modified, window_start) if last_modified else window_start
+        self.not_modified = not is_resource_modified(
+            request.environ, etag=self.etag, last_modified=self.last_modified
+        )
+
+    def response(self, body=None):
+        """body None ise 304, değilse body (render edilmiş sayfa) doğrulayıcılarla"""
+        response = make_response(body if body is not None else ('', 304))
+        if self.enabled:
+            response.set_etag(self.etag, weak=True)
+            response.last_modified = self.last_modified
+            response.cache_control.no_cache = True #tarayıcı saklayabilir ama her seferinde doğrulatır
+            response.vary.add('Cookie') #giriş yapınca aynı url farklı sayfa
+        return response
+
+
+def conditional_page(*parts, last_modified=None):
+    """Sayfa içeriğini belirleyen değerlerden doğrulayıcı üret (şablon render edilmeden önce çağrılır)"""
+    return ConditionalPage(parts, last_modified)
@@ -0,0 +1,88 @@
+from sqlalchemy import event, func, select
+from app import db
+from app.models import User, Post, Comment, Like, Follow, Bookmark
+
+
+def _keep_updated_at(table, values):
+    #posts.updated_at onupdate ile değişir; sayaç değişimi yazının düzenlenmesi sayılmaz
+    if 'updated_at' in table.c:
+        values['updated_at'] = table.c.updated_at
+    return values
+
+
+# Hangi satır hangi sayacı etkiler: model -> [(sayaç tablosunun modeli, foreign key kolonu, sayaç kolonu)]
+COUNTER_RULES = {
+    Like: [(Post, 'post_id', 'likes_count')],
+    Bookmark: [(Post, 'post_id', 'bookmarks_count')],
+    Comment: [(Post, 'post_id', 'comments_count'), (User, 'user_id', 'comments_count'),
+              (Comment, 'parent_id', 'replies_count')],
+    Post: [(User, 'user_id', 'posts_count')],
+    Follow: [(User, 'followed_id', 'followers_count'), (User, 'follower_id', 'following_count')],
+}
+
+
+def _bump(connection, target, fk_value, column, delta):
+    """Sayacı tek bir UPDATE ile artır/azalt (col = col + delta) -- satırları yüklemeden"""
+    if fk_value is None:
+        return
+    table = target.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.id == fk_value)
+        .values(_keep_updated_at(table, {column: table.c[column] + delta}))
+    )
+
+
+def _make_listener(rules, delta):
+    def listener(mapper, connection, instance):
+        for target, fk, column in rules:
+            _bump(connection, target, getattr(instance, fk), column, delta)
+    return listener
+
+
+def register_counter_listeners():
+    """Ekleme/silme olaylarına sayaç güncellemelerini bağla (cascade silmeler dahil)"""
+    for model, rules in COUNTER_RULES.items():
+        if getattr(model, '_counter_listeners', False): #create_app birden fazla çağrılırsa tekrar bağlama
+            continue
+        event.listen(model, 'after_insert', _make_listener(rules, 1))
+        event.listen(model, 'after_delete', _make_listener(rules, -1))
+        model._counter_listeners = True
+
+
+def _count_subqueries():
+    #sayaç tablosunun modeli -> {sayaç kolonu: ilişkili satırları sayan alt sorgu}
+    columns_by_target = {}
+    for model, rules in COUNTER_RULES.items():
+        child = model.__table__.alias('child') #yorum -> yorum gibi aynı tablo sayaçları için alias
+        for target, fk, column in rules:
+            parent = target.__table__
+            subquery = (
+                select(func.count())
+                .select_from(child)
+                .where(child.c[fk] == parent.c.id)
+                .scalar_subquery()
+            )
+            columns_by_target.setdefault(target, {})[column] = subquery
+    return columns_by_target
+
+
+def recount_counters():
+    """Tüm sayaçları tablolardan toplu olarak yeniden hesapla (tablo başına tek UPDATE)"""
+    for target, values in _count_subqueries().items():
+        table = target.__table__
+        db.session.execute(table.update().values(_keep_updated_at(table, values)))
+    db.session.commit()
+
+
+def recount(connection, target, ids):
+    """Verilen satırların sayaçlarını yeniden hesapla -- olay tetiklemeyen toplu silmelerden sonra (app/utils/purge.py)"""
+    ids = [value for value in set(ids) if value is not None]
+    if not ids:
+        return
+    table = target.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.id.in_(ids))
+        .values(_keep_updated_at(table, dict(_count_subqueries()[target])))
+    )
@@ -0,0 +1,138 @@
+#fragment_cache.py şablon parçaları ve küçük sorgu sonuçları için adlandırılmış, süreli ve etiketli önbellek
+#Şablonda:  {% cache 'index:popular', 300, 'posts' %} ... {% endcache %}  (anahtar, saniye, etiketler...)
+#View de:    cached('post-categories', lambda: ..., tags=('posts',))
+#Her kayıt oluşturulurken etiketlerinin sürümünü (generation) saklar. Bir etiketin modeli eklenip/güncellenip/silinince
+#commit sonrası etiketin sürümü artar ve o etiketli tüm kayıtlar taranmadan geçersiz olur.
+#Önbellek worker (process) başınadır; diğer worker lar en geç kaydın süresi dolunca yeniler.
+#Kullanıcıya göre değişen içerik (current_user, viewer) cache bloklarına konmamalıdır.
+import threading
+import time
+from flask import current_app, has_app_context
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app.utils.markdown_render import LRUCache
+
+
+class FragmentCache:
+    """Anahtar -> (değer, bitiş zamanı, etiket sürümleri). Boyut sınırı LRU ile"""
+
+    def __init__(self, maxsize, default_ttl):
+        self.default_ttl = default_ttl #saniye; 0: hiç saklama (her seferinde üret)
+        self._entries = LRUCache(maxsize)
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def _snapshot(self, tags):
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires, entry_tags, generations = entry
+        if time.monotonic() >= expires or self._snapshot(entry_tags) != generations:
+            return None
+        return value
+
+    def get_or_set(self, key, compute, ttl=None, tags=()):
+        tags = tuple(tags)
+        value = self.get(key)
+        if value is not None:
+            return value
+        ttl = self.default_ttl if ttl is None else ttl
+        generations = self._snapshot(tags) #üretim sırasında etiket düşerse kayıt zaten eski sayılır
+        value = compute()
+        if ttl > 0:
+            self._entries.set(key, (value, time.monotonic() + ttl, tags, generations))
+        return value
+
+    def invalidate(self, *tags):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def clear(self):
+        self._entries.clear()
+
+
+def cache_key(key):
+    """'ad' ya da ['ad', parça, ...] -> 'ad:parça:...'"""
+    if isinstance(key, (list, tuple)):
+        return ':'.join('' if part is None else str(part) for part in key)
+    return str(key)
+
+
+def fragment_cache():
+    return current_app.extensions['fragment_cache']
+
+
+def cached(key, compute, ttl=None, tags=()):
+    """View lerden: compute() sonucunu anahtar ve etiketlerle sakla (ORM nesnesi değil, düz veri saklayın)"""
+    return fragment_cache().get_or_set(cache_key(key), compute, ttl, tags)
+
+
+def invalidate(*tags):
+    fragment_cache().invalidate(*tags)
+
+
+class FragmentCacheExtension(Extension):
+    """{% cache anahtar[, saniye[, etiket, ...]] %} ... {% endcache %}"""
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render', [nodes.List(args)]), [], [], body).set_lineno(lineno)
+
+    def _render(self, args, caller):
+        key, ttl, *tags = list(args) + [None] * (2 - len(args))
+        #blok içeriği sadece önbellekte yoksa çalıştırılır (içindeki sorgular da)
+        return Markup(cached(key, lambda: str(caller()), ttl=ttl, tags=tags))
+
+
+# --- Geçersiz kılma: model değişikliği commit edilince etiketi düşür ---
+
+# model adı -> etiket (modelin satırı eklenince/güncellenince/silinince düşer)
+MODEL_TAGS = {'User': 'users', 'Post': 'posts', 'Comment': 'comments', 'ContactMessage': 'messages'}
+
+
+def _mark(mapper, connection, instance):
+    session = object_session(instance)
+    if session is not None:
+        session.info.setdefault('fragment_tags', set()).add(MODEL_TAGS[mapper.class_.__name__])
+
+
+def _after_commit(session):
+    tags = session.info.pop('fragment_tags', None)
+    if tags and has_app_context() and 'fragment_cache' in current_app.extensions:
+        invalidate(*tags)
+
+
+def _after_rollback(session):
+    session.info.pop('fragment_tags', None)
+
+
+def _register_listeners():
+    from app import models
+    if event.contains(Session, 'after_commit', _after_commit): #create_app birden fazla çağrılırsa tekrar bağlama
+        return
+    for name in MODEL_TAGS:
+        model = getattr(models, name)
+        for identifier in ('after_insert', 'after_update', 'after_delete'):
+            event.listen(model, identifier, _mark)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
+
+
+def init_fragment_cache(app):
+    app.extensions['fragment_cache'] = FragmentCache(app.config['FRAGMENT_CACHE_SIZE'], app.config['FRAGMENT_CACHE_TTL'])
+    app.jinja_env.add_extension(FragmentCacheExtension)
+    _register_listeners()
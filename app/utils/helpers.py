@@ -1,10 +1,7 @@
-import os
-from datetime import datetime
-from werkzeug.utils import secure_filename #dosya adını güvenli hale getirir türkçe karakterleri temizler
-from PIL import Image #resim işleme(pillow)
 from flask import current_app 
-from app import db
-from app.models import Notification
+from app.utils.images import sanitize_upload, schedule_processing, variants_ready
+from app.utils.uploads import store_upload
+from app.utils.notifications import dispatch_notifications, notification_row
 
 def allowed_file(filename):
     """Dosya uzantısının izin verilen türde olup olmadığını kontrol et"""
@@ -20,32 +17,30 @@ def allowed_file(filename):
 
 
 def save_image(file, folder='uploads'):
-    """Resmi kaydet ve optimize et"""
+    """Resmi temizleyip kaydet, boyut varyantlarını arka planda üret"""
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename) #secure_filename(): Güvenli dosya adı
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_') #timestamp benzersiz dosya adı için
-        filename = timestamp + filename
-        filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename) #path birleştirme app/static/upload , photo.png -- app/ststic/uploads/photo.png
+        config = current_app.config
+        #format içerikten okunur ve whitelist e bakılır; EXIF/GPS atılarak yeniden kodlanır (images.py)
+        sanitized = sanitize_upload(file.stream, config['ALLOWED_EXTENSIONS'], config['UPLOAD_QUALITY'])
+        if sanitized is None:
+            return None
+        content, extension = sanitized
         
-        os.makedirs(current_app.config['UPLOAD_FOLDER'], exist_ok=True) #os.makedirs klasör oluştur exist_ok true varsa hata  verme
-        
-        #PIL ile resim işleme
-        img = Image.open(file) #dosyayı aç
-        img.thumbnail((1200, 1200)) #küçült
-        img.save(filepath, quality=85, optimize=True) #kalite 85 dosya boyutunu optimize et
+        #dosya adı temizlenmiş içeriğin sha256 özeti: aynı resim ikinci kez yazılmaz/işlenmez (uploads.py)
+        filename, created = store_upload(content, extension)
+        if created or not variants_ready(filename):
+            schedule_processing(filename) #küçültme + webp varyantları process pool da (images.py)
         
         return filename #başarılıysa filename döndür
     return None #başarısız none döndür
 
 def create_notification(user_id, sender_id, notif_type, message, link=None):
     """Bildirim oluştur""" #--tek yerde oluşturduk buradan çağırabiliriz
-    notification = Notification(
-        user_id=user_id,
-        sender_id=sender_id,
-        type=notif_type,
-        message=message,
-        link=link
-    )
-    db.session.add(notification)
-    db.session.commit()
-    return notification
\ No newline at end of file
+    #istek içinde commit yapılmaz; satır kuyruğa eklenir ve arka planda toplu yazılır
+    dispatch_notifications([notification_row(user_id, sender_id, notif_type, message, link)])
+
+def create_notifications(user_ids, sender_id, notif_type, message, link=None):
+    """Aynı bildirimi birden fazla kullanıcıya oluştur (tek toplu INSERT)"""
+    dispatch_notifications([
+        notification_row(user_id, sender_id, notif_type, message, link) for user_id in user_ids
+    ])
\ No newline at end of file
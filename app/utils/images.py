@@ -0,0 +1,219 @@
+#images.py yüklenen resimlerin boyut varyantları (process pool da) ve şablonlar için srcset bilgisi
+#İstek içinde orijinal sadece metadata sı atılarak yeniden kodlanıp kaydedilir (sanitize_upload); küçültme ve
+#varyantların kodlanması arka plandaki process pool da yapılır.
+#Her resim için uploads/variants/<dosya yolu>/ altında IMAGE_VARIANTS daki her boyutun orijinal formatta ve WebP
+#halleri üretilir, en son manifest.json yazılır. Manifest yoksa (işlem sürüyor) şablonlar yer tutucu gösterir.
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app, url_for
+from PIL import Image, ImageOps
+from app.utils.markdown_render import LRUCache
+from app.utils.uploads import is_hashed, storage_path
+
+MANIFEST = 'manifest.json'
+
+
+def _variant_stem(name):
+    #içerik adresli ad: ab/cd/<özet>, eski ad: uzantısız dosya adı
+    return os.path.splitext(storage_path(name))[0]
+
+
+def _variant_dir(upload_folder, name):
+    return os.path.join(upload_folder, 'variants', _variant_stem(name))
+
+
+def variants_ready(name):
+    """Varyantlar üretilmiş mi (aynı dosya daha önce yüklendiyse tekrar işlenmez)"""
+    upload_folder = os.path.abspath(current_app.config['UPLOAD_FOLDER'])
+    return os.path.exists(os.path.join(_variant_dir(upload_folder, name), MANIFEST))
+
+
+def _save_atomic(image, path, **options):
+    #yarım yazılmış dosya servis edilmesin: geçici dosyaya yaz, sonra yerine taşı
+    tmp_path = path + '.tmp'
+    image.save(tmp_path, **options)
+    os.replace(tmp_path, path)
+
+
+_FORMAT_EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'GIF': 'gif', 'WEBP': 'webp'}
+
+
+def sanitize_upload(stream, allowed_extensions, quality):
+    """Yüklenen resmi yeniden kodla: EXIF/GPS ve diğer metadata atılır. (içerik, uzantı) ya da None"""
+    try:
+        with Image.open(stream) as original:
+            extension = _FORMAT_EXTENSIONS.get(original.format) #uzantı dosya adından değil içerikten
+            if extension not in allowed_extensions:
+                return None #bmp, tiff, psd, ico ... kabul edilmez
+            fmt = original.format
+            animated = getattr(original, 'n_frames', 1) > 1
+            #döndürme bilgisi pikseller uygulanır (exif atılınca kaybolmasın); animasyonlu resimlerde kareler korunur
+            image = original if animated else ImageOps.exif_transpose(original)
+            options = {'format': fmt, 'icc_profile': original.info.get('icc_profile')}
+            if fmt == 'JPEG':
+                options.update(quality=quality, optimize=True)
+            elif fmt == 'WEBP':
+                options.update(quality=quality)
+            if animated:
+                options['save_all'] = True
+            output = io.BytesIO()
+            image.save(output, **options)
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError): #resim değil ya da bozuk
+        return None
+    output.seek(0)
+    return output, extension
+
+
+def process_image(source_path, target_dir, variants, quality):
+    """Orijinal resimden boyut varyantlarını üret (saf fonksiyon, process pool da çalışır)"""
+    os.makedirs(target_dir, exist_ok=True)
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original) #telefon fotoğraflarındaki döndürme bilgisini uygula
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        fmt = 'png' if has_alpha else 'jpg'
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        manifest = {'format': fmt, 'variants': {}}
+        for variant, max_size in sorted(variants.items(), key=lambda item: item[1]):
+            resized = image.copy()
+            resized.thumbnail((max_size, max_size)) #en-boy oranı korunur, küçük resim büyütülmez
+            if fmt == 'png':
+                _save_atomic(resized, os.path.join(target_dir, f'{variant}.png'), format='PNG', optimize=True)
+            else:
+                _save_atomic(resized, os.path.join(target_dir, f'{variant}.jpg'),
+                             format='JPEG', quality=quality, optimize=True, progressive=True)
+            _save_atomic(resized, os.path.join(target_dir, f'{variant}.webp'), format='WEBP', quality=quality)
+            manifest['variants'][variant] = list(resized.size)
+
+    #manifest en son yazılır: varlığı tüm varyantların hazır olduğunu gösterir
+    manifest_path = os.path.join(target_dir, MANIFEST)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return manifest
+
+
+# --- Process pool ---
+
+_pool = None
+_pool_pid = None
+
+
+def _get_pool():
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid(): #fork sonrası (gunicorn worker) ebeveynin pool u kullanılamaz
+        _pool = ProcessPoolExecutor(max_workers=current_app.config['IMAGE_WORKERS'])
+        _pool_pid = os.getpid()
+    return _pool
+
+
+def _job_args(name):
+    config = current_app.config
+    upload_folder = os.path.abspath(config['UPLOAD_FOLDER'])
+    return (os.path.join(upload_folder, storage_path(name)), _variant_dir(upload_folder, name),
+            dict(config['IMAGE_VARIANTS']), config['IMAGE_QUALITY'])
+
+
+def schedule_processing(name):
+    """Varyant üretimini process pool a gönder (IMAGE_WORKERS = 0 ise hemen, istek içinde üretir)"""
+    args = _job_args(name)
+    if current_app.config['IMAGE_WORKERS'] <= 0:
+        process_image(*args)
+        return None
+    logger = current_app.logger
+    future = _get_pool().submit(process_image, *args)
+
+    def _done(future):
+        if future.exception() is not None:
+            logger.error('Resim işlenemedi: %s (%s)', name, future.exception())
+
+    future.add_done_callback(_done)
+    return future
+
+
+def process_existing(force=False, workers=None):
+    """Varyantı olmayan (veya force ile tüm) yüklenmiş resimleri işle; işlenen resim sayısını döndürür"""
+    from app import db
+    from app.models import Post, User
+    names = {name for (name,) in db.session.query(Post.image).filter(Post.image.isnot(None))}
+    names |= {name for (name,) in db.session.query(User.avatar).filter(
+        User.avatar.isnot(None), User.avatar != 'default-avatar.jpg'
+    )}
+    upload_folder = os.path.abspath(current_app.config['UPLOAD_FOLDER'])
+    jobs = []
+    for name in sorted(names):
+        if not os.path.exists(os.path.join(upload_folder, storage_path(name))):
+            continue
+        if not force and variants_ready(name):
+            continue
+        jobs.append(_job_args(name))
+
+    processed = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(args[0], pool.submit(process_image, *args)) for args in jobs]
+        for path, future in futures:
+            try:
+                future.result()
+                processed += 1
+            except Exception as exc:
+                current_app.logger.error('Resim işlenemedi: %s (%s)', path, exc)
+    _manifests.clear()
+    return processed
+
+
+# --- Şablonlar için ---
+
+_manifests = LRUCache(4096) #hazır manifest ler; hazır olmayanlar önbelleğe alınmaz (her istekte tekrar bakılır)
+
+
+def load_manifest(name):
+    manifest = _manifests.get(name)
+    if manifest is not None:
+        return manifest
+    path = os.path.join(_variant_dir(os.path.abspath(current_app.config['UPLOAD_FOLDER']), name), MANIFEST)
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    _manifests.set(name, manifest)
+    return manifest
+
+
+def image_sources(name, slot):
+    """<picture> için src/srcset/sizes. Varyantlar yoksa ready=False: yer tutucu (eski yüklemelerde orijinal)"""
+    sizes = current_app.config['IMAGE_SIZES'][slot]
+    manifest = load_manifest(name) if name else None
+    if manifest is None:
+        #içerik adresli orijinal 16MB a kadar olabilir: kartlara gönderilmez, varyantlar hazır olana kadar yer tutucu.
+        #eski (zaman damgalı) yüklemeler kayıtta zaten 1200px e küçültülüp yeniden kodlanmıştı: srcset siz orijinal
+        path = storage_path(name) if name and not is_hashed(name) else None
+        if path and os.path.exists(os.path.join(current_app.config['UPLOAD_FOLDER'], path)):
+            return {'ready': False, 'original': True, 'sizes': sizes,
+                    'src': url_for('static', filename='uploads/' + path.replace(os.sep, '/'))}
+        return {'ready': False, 'original': False, 'src': url_for('static', filename='img/placeholder.svg'),
+                'sizes': sizes}
+
+    stem = _variant_stem(name)
+    fmt = manifest['format']
+    by_width = {}
+    for variant, (width, _) in sorted(manifest['variants'].items(), key=lambda item: item[1][0]):
+        by_width.setdefault(width, variant) #küçük resimde birden fazla varyant aynı genişlikte olabilir
+
+    def srcset(ext):
+        return ', '.join(
+            url_for('static', filename=f'uploads/variants/{stem}/{variant}.{ext}') + f' {width}w'
+            for width, variant in sorted(by_width.items())
+        )
+
+    #srcset i desteklemeyen tarayıcılar için: slot adında varyant yoksa (ör. thumb) en küçüğü
+    fallback = slot if slot in manifest['variants'] else by_width[min(by_width)]
+    return {
+        'ready': True,
+        'src': url_for('static', filename=f'uploads/variants/{stem}/{fallback}.{fmt}'),
+        'srcset': srcset(fmt),
+        'webp_srcset': srcset('webp'),
+        'sizes': sizes,
+    }
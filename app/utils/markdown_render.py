@@ -0,0 +1,140 @@
+#markdown_render.py markdown -> html dönüşümü, saklanan html ve süreç içi LRU önbellek
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import markdown
+from flask import current_app
+
+
+def render_markdown(text, extensions):
+    """Markdown metnini html e çevir (saf fonksiyon, process pool da da çalışır)"""
+    return markdown.markdown(text or '', extensions=list(extensions))
+
+
+def _render_job(job):
+    #process pool a gönderilen iş: (post_id, content, extensions)
+    post_id, text, extensions = job
+    return post_id, render_markdown(text, extensions)
+
+
+def content_hash(text):
+    """İçeriğin sha256 özeti -- saklanan html in hala geçerli olup olmadığını anlamak için"""
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+
+def current_extensions():
+    return tuple(current_app.config['MARKDOWN_EXTENSIONS'])
+
+
+def current_render_version():
+    """Eklenti listesi + MARKDOWN_RENDER_VERSION dan türetilen sürüm. Eklentiler değişince eski html geçersiz olur"""
+    config = current_app.config
+    digest = hashlib.sha1(repr(tuple(config['MARKDOWN_EXTENSIONS'])).encode('utf-8')).hexdigest()[:8]
+    return f"{config['MARKDOWN_RENDER_VERSION']}-{digest}"
+
+
+class LRUCache:
+    """Boyutu sınırlı, thread-safe LRU önbellek"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key) #en son kullanılan sona
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize: #sınır aşıldıysa en eski kaydı at
+                self._data.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_cache = None
+
+
+def _get_cache():
+    global _cache
+    if _cache is None:
+        _cache = LRUCache(current_app.config['MARKDOWN_CACHE_SIZE'])
+    return _cache
+
+
+def render_cached(text):
+    """Markdown u LRU önbellek üzerinden render et (anahtar: içerik özeti + sürüm)"""
+    key = (content_hash(text), current_render_version())
+    cache = _get_cache()
+    html = cache.get(key)
+    if html is None:
+        html = render_markdown(text, current_extensions())
+        cache.set(key, html)
+    return html
+
+
+def store_rendered(post):
+    """Yazının html ini hesaplayıp post üzerinde sakla (create/edit sırasında çağrılır)"""
+    post.content_html = render_markdown(post.content, current_extensions())
+    post.content_hash = content_hash(post.content)
+    post.content_html_version = current_render_version()
+
+
+def rendered_html(post):
+    """Saklanan html geçerliyse onu, değilse LRU önbellekten render edilmiş html i döndür"""
+    if (post.content_html is not None
+            and post.content_html_version == current_render_version()
+            and post.content_hash == content_hash(post.content)):
+        return post.content_html
+    return render_cached(post.content)
+
+
+def rerender_all(workers=None, batch_size=200, force=False):
+    """Sürümü eski (veya force ile tüm) yazıların html ini process pool ile toplu olarak yeniden üret"""
+    from app import db
+    from app.models import Post
+
+    version = current_render_version()
+    extensions = current_extensions()
+    total = 0
+    last_id = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            query = db.session.query(Post.id, Post.content, Post.updated_at).filter(Post.id > last_id)
+            if not force:
+                query = query.filter(
+                    (Post.content_html_version != version) | (Post.content_html_version.is_(None))
+                )
+            rows = query.order_by(Post.id).limit(batch_size).all() #id üzerinden keyset -- offset taraması yok
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            jobs = [(row.id, row.content, extensions) for row in rows]
+            by_id = {row.id: row for row in rows}
+            updates = [
+                {'id': post_id, 'content_html': html,
+                 'content_hash': content_hash(by_id[post_id].content), 'content_html_version': version,
+                 'updated_at': by_id[post_id].updated_at} #yeniden render yazının düzenlenmesi sayılmaz
+                for post_id, html in pool.map(_render_job, jobs, chunksize=8)
+            ]
+            db.session.execute(db.update(Post), updates) #primary key e göre toplu update
+            db.session.commit()
+            total += len(updates)
+    return total
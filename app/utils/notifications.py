@@ -0,0 +1,158 @@
+#notifications.py bildirimleri istek içinde değil arka plan thread inde toplu INSERT ile yazar
+#Beğeni/yorum/takip isteği kendi tek commit i ile döner; bildirim satırları kuyruğa eklenir ve
+#NOTIFICATION_FLUSH_INTERVAL saniyede bir (ya da NOTIFICATION_BATCH_SIZE adet birikince) tek executemany ile yazılır.
+#Geçersiz satır içeren batch satır satır tekrar denenir, yazılamayan satır loglanıp atılır.
+#Yazılan bildirimler açık bildirim akışlarına (notify_broker) iletilir. Aralık 0 ise hemen yazılır (testler için).
+import atexit
+import os
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+from flask import current_app
+from sqlalchemy.exc import DataError, IntegrityError
+
+
+class NotificationDispatcher:
+    """Worker (process) başına bildirim kuyruğu ve arka plan yazıcı thread i"""
+
+    def __init__(self, app, interval, batch_size):
+        self.app = app
+        self.interval = interval #saniye; 0 veya altı: kuyruğa almadan hemen yaz
+        self.batch_size = batch_size #tek INSERT te yazılacak en fazla satır; bu kadar birikirse beklemeden yaz
+        self._rows = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pid = None #fork sonrası (gunicorn worker) thread i yeniden başlatmak için
+
+    def dispatch(self, rows):
+        if not rows:
+            return
+        if self.interval <= 0:
+            self._add(rows)
+            self.flush()
+            return
+        self._ensure_worker()
+        self._add(rows)
+        if len(self._rows) >= self.batch_size:
+            self._wakeup.set()
+
+    def _add(self, rows):
+        with self._lock:
+            self._rows.extend(rows)
+
+    def _take(self):
+        with self._lock:
+            rows, self._rows = self._rows, []
+        return rows
+
+    def flush(self):
+        """Bekleyen bildirimleri batch_size lık executemany INSERT lerle yaz ve akışlara yayınla"""
+        rows = self._take()
+        written = 0
+        while rows:
+            batch, rows = rows[:self.batch_size], rows[self.batch_size:]
+            try:
+                self._write(batch)
+                written += len(batch)
+            except (IntegrityError, DataError): #satırlardan biri geçersiz (ör. alıcı bu arada silindi)
+                written += self._write_each(batch, rows)
+            except Exception:
+                self._add(batch + rows) #vt ye ulaşılamadı: kuyruğa geri koy, bir sonraki turda tekrar denenir
+                raise
+        return written
+
+    def _write_each(self, batch, rest):
+        """Hatalı batch i satır satır yaz; yine yazılamayan satırı logla ve at (kuyruğu sonsuza kadar tıkamasın)"""
+        written = 0
+        for i, row in enumerate(batch):
+            try:
+                self._write([row])
+                written += 1
+            except (IntegrityError, DataError):
+                self.app.logger.warning('Bildirim yazılamadı, atlandı: %r', row, exc_info=True)
+            except Exception:
+                self._add(batch[i:] + rest)
+                raise
+        return written
+
+    def _write(self, batch):
+        from app import db
+        from app.models import Notification
+        from app.utils.notify_broker import publish_notifications, serialize_notification
+        table = Notification.__table__
+        with self.app.app_context():
+            with db.engine.begin() as connection:
+                if connection.dialect.insert_executemany_returning_sort_by_parameter_order:
+                    #id ler akışa gönderilen veride kullanılır; sıra parametre sırasıyla aynı
+                    inserted = connection.execute(
+                        table.insert().returning(table.c.id, sort_by_parameter_order=True), batch
+                    ).scalars().all()
+                else:
+                    connection.execute(table.insert(), batch)
+                    inserted = [None] * len(batch)
+            published = []
+            for row, notification_id in zip(batch, inserted):
+                payload = serialize_notification(SimpleNamespace(id=notification_id, **row))
+                published.append((row['user_id'], payload))
+            try:
+                publish_notifications(published)
+            except Exception: #satırlar yazıldı; yayın hatası tekrar yazmaya sebep olmasın
+                self.app.logger.exception('Bildirimler akışa gönderilemedi')
+
+    def _ensure_worker(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None: #fork edilmiş process: ebeveynin kuyruğu burada yazılmamalı
+                self._rows = []
+            self._pid = os.getpid()
+            thread = threading.Thread(target=self._run, name='notification-dispatch', daemon=True)
+            thread.start()
+            atexit.register(self._flush_on_exit)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                self.app.logger.exception('Bildirimler yazılamadı')
+
+    def _flush_on_exit(self):
+        try:
+            self.flush()
+        except Exception:
+            self.app.logger.exception('Kapanışta bildirimler yazılamadı')
+
+
+def init_notifications(app):
+    app.extensions['notifications'] = NotificationDispatcher(
+        app,
+        interval=app.config['NOTIFICATION_FLUSH_INTERVAL'],
+        batch_size=app.config['NOTIFICATION_BATCH_SIZE'],
+    )
+
+
+def notification_row(user_id, sender_id, notif_type, message, link=None):
+    """notifications tablosuna yazılacak satır"""
+    return {
+        'user_id': user_id,
+        'sender_id': sender_id,
+        'type': notif_type,
+        'message': message,
+        'link': link,
+        'is_read': False,
+        'created_at': datetime.utcnow(), #yazılma değil oluşma zamanı
+    }
+
+
+def dispatch_notifications(rows):
+    """Bildirim satırlarını kuyruğa ekle (vt ye istek içinde yazmaz)"""
+    current_app.extensions['notifications'].dispatch(rows)
+
+
+def flush_notifications():
+    return current_app.extensions['notifications'].flush()
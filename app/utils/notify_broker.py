@@ -0,0 +1,119 @@
+#notify_broker.py bildirimleri açık sekmelere (Server-Sent Events) iletmek için süreç içi yayın/abone aracısı
+#Notification satırı commit edildiğinde ilgili kullanıcının tüm açık akışlarına yeni bildirim ve okunmamış sayısı gönderilir.
+#Backend config.NOTIFICATION_BROKER ile seçilir: 'memory' veya 'paket.modul:Sinif' (ör. redis pub/sub tabanlı bir sınıf).
+#Bir backend subscribe/unsubscribe/publish sağlamalı; subscribe ın döndürdüğü nesne queue.Queue gibi
+#get(timeout=...) ile mesaj vermeli ve mesaj yoksa queue.Empty fırlatmalıdır.
+import queue
+import threading
+from flask import current_app
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session, object_session
+from werkzeug.utils import import_string
+
+
+class MemoryBroker:
+    """Tek process içinde çalışan aracı: kullanıcı id -> abone kuyrukları"""
+
+    def __init__(self, app):
+        self.max_queue = app.config['NOTIFICATION_STREAM_QUEUE']
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        subscription = queue.Queue(maxsize=self.max_queue)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, user_id, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(user_id)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[user_id]
+
+    def publish(self, user_id, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.put_nowait(message)
+            except queue.Full: #okumayan (takılmış) bağlantı yüzünden yayın bloklanmasın
+                pass
+
+
+BROKER_BACKENDS = {'memory': MemoryBroker}
+
+
+def init_broker(app):
+    backend = app.config['NOTIFICATION_BROKER']
+    broker_class = BROKER_BACKENDS.get(backend) or import_string(backend)
+    app.extensions['notify_broker'] = broker_class(app)
+    _register_listeners()
+
+
+def get_broker():
+    return current_app.extensions['notify_broker']
+
+
+def publish_unread(user_id, count):
+    """Kullanıcının açık sekmelerine sadece okunmamış sayısını gönder (ör. bildirimler okununca)"""
+    get_broker().publish(user_id, {'event': 'unread', 'data': {'count': count}})
+
+
+def serialize_notification(row):
+    """Akışa gönderilen bildirim verisi (Notification nesnesi veya Core satırı)"""
+    return {
+        'id': row.id,
+        'type': row.type,
+        'message': row.message,
+        'link': row.link,
+    }
+
+
+def publish_notifications(pending):
+    """Vt ye yazılmış bildirimleri okunmamış sayılarıyla birlikte yayınla. pending: [(user_id, veri), ...]"""
+    from app import db
+    from app.models import Notification
+    user_ids = {user_id for user_id, _ in pending}
+    #etkilenen kullanıcıların okunmamış sayıları tek sorguda (commit sonrası oturum değil ayrı bağlantı kullanılır)
+    with db.engine.connect() as connection:
+        counts = dict(connection.execute(
+            select(Notification.user_id, func.count())
+            .where(Notification.user_id.in_(user_ids), Notification.is_read == False)
+            .group_by(Notification.user_id)
+        ).all())
+    broker = get_broker()
+    for user_id, payload in pending:
+        broker.publish(user_id, {'event': 'notification',
+                                 'data': {'notification': payload, 'count': counts.get(user_id, 0)}})
+
+
+# --- Commit sonrası yayın: bildirim vt ye yazılmadan akışa gönderilmez ---
+
+def _notification_inserted(mapper, connection, notification):
+    session = object_session(notification)
+    if session is not None:
+        session.info.setdefault('published_notifications', []).append(
+            (notification.user_id, serialize_notification(notification))
+        )
+
+
+def _after_commit(session):
+    pending = session.info.pop('published_notifications', None)
+    if pending:
+        publish_notifications(pending)
+
+
+def _after_rollback(session):
+    session.info.pop('published_notifications', None)
+
+
+def _register_listeners():
+    from app.models import Notification
+    if event.contains(Notification, 'after_insert', _notification_inserted):
+        return
+    event.listen(Notification, 'after_insert', _notification_inserted)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
@@ -0,0 +1,89 @@
+#pagination.py (created_at, id) üzerinden keyset (cursor) sayfalama yardımcıları
+#OFFSET yerine "son görülen satırdan daha eski olanlar" koşulu kullanılır; 1. sayfa ile 500. sayfa aynı maliyettedir
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(created_at, row_id):
+    """(created_at, id) çiftini url de taşınabilecek opak bir metne çevir"""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """encode_cursor un tersi. Bozuk/elle değiştirilmiş cursor için None döner (ilk sayfa gösterilir)"""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        return None
+
+
+def older_than(created_col, id_col, cursor):
+    """(created_col, id_col) < cursor koşulu (yeniden eskiye sıralı listede sonraki sayfa)"""
+    created_at, row_id = cursor
+    return or_(created_col < created_at, and_(created_col == created_at, id_col < row_id))
+
+
+def newer_than(created_col, id_col, cursor):
+    """(created_col, id_col) > cursor koşulu (önceki sayfa)"""
+    created_at, row_id = cursor
+    return or_(created_col > created_at, and_(created_col == created_at, id_col > row_id))
+
+
+class CursorPage:
+    """Cursor ile sayfalanmış sonuç. Şablonlar items, has_next/next_cursor, has_prev/prev_cursor kullanır"""
+
+    def __init__(self, items, next_cursor=None, prev_cursor=None, total=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total #istenmediyse None -- COUNT(*) çalıştırılmaz
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def keyset_paginate(query, created_col, id_col, per_page, after=None, before=None, with_total=False):
+    """Sorguyu (created_col, id_col) üzerinden yeniden eskiye cursor ile sayfala"""
+    #after: bu cursor dan daha eski kayıtlar (sonraki sayfa), before: daha yeni kayıtlar (önceki sayfa)
+    #with_total=False iken COUNT(*) çalıştırılmaz
+    total = query.order_by(None).count() if with_total else None
+
+    if before is not None: #geriye gidiş: cursor dan yeni olanları eskiden yeniye al, sonra ters çevir
+        rows = query.filter(newer_than(created_col, id_col, before)).order_by(
+            created_col.asc(), id_col.asc()
+        ).limit(per_page + 1).all()
+        has_more = len(rows) > per_page
+        items = list(reversed(rows[:per_page]))
+        has_prev, has_next = has_more, True
+    else:
+        if after is not None:
+            query = query.filter(older_than(created_col, id_col, after))
+        rows = query.order_by(created_col.desc(), id_col.desc()).limit(per_page + 1).all()
+        items = rows[:per_page]
+        has_prev, has_next = after is not None, len(rows) > per_page
+
+    next_cursor = prev_cursor = None
+    if items:
+        if has_next:
+            next_cursor = encode_cursor(getattr(items[-1], created_col.key), getattr(items[-1], id_col.key))
+        if has_prev:
+            prev_cursor = encode_cursor(getattr(items[0], created_col.key), getattr(items[0], id_col.key))
+    return CursorPage(items, next_cursor=next_cursor, prev_cursor=prev_cursor, total=total)
@@ -0,0 +1,145 @@
+#passwords.py şifre hashleme/doğrulama için sınırlı thread havuzu
+#scrypt/pbkdf2 bilerek yavaştır. Giriş fırtınasında (ör. süresi dolan oturumlar) istek thread lerinde çalışırsa tüm CPU yu
+#doldurup normal sayfaları da durdurur. Burada worker başına en fazla PASSWORD_HASH_WORKERS hash aynı anda çalışır,
+#PASSWORD_HASH_QUEUE kadarı bekler; kuyruk doluysa istek hash e hiç başlamadan HashingBusy ile reddedilir (503).
+#(hashlib scrypt/pbkdf2 çalışırken GIL i bırakır, thread havuzu CPU kullanımını gerçekten sınırlar.)
+#Giriş başarılıysa ve saklanan hash PASSWORD_HASH_METHOD tan farklı parametrelerle üretildiyse şifre yeniden hashlenir.
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HashingBusy(Exception):
+    """Hash kuyruğu dolu ya da sonuç PASSWORD_HASH_TIMEOUT içinde gelmedi"""
+
+
+class PasswordHasher:
+    """Worker (process) başına hash havuzu, kuyruk sınırı ve süre ölçümleri"""
+
+    def __init__(self, method, workers, max_pending, timeout):
+        self.method = method
+        self.workers = workers #0: havuz yok, istek thread inde hashle (testler için)
+        self.timeout = timeout #saniye; bekleme + hash süresi
+        self._slots = threading.BoundedSemaphore(max(workers, 0) + max(max_pending, 0))
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None #fork sonrası (gunicorn worker) ebeveynin havuzu kullanılamaz
+        self._method_prefix = None
+        self._metrics = {
+            'hashed': 0, 'verified': 0, 'rehashed': 0, 'rejected': 0, 'timeouts': 0, 'in_flight': 0, 'completed': 0,
+            'hash_seconds_total': 0.0, 'hash_seconds_max': 0.0, 'wait_seconds_total': 0.0, 'wait_seconds_max': 0.0,
+        }
+
+    def _get_executor(self):
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+                    self._pid = os.getpid()
+        return self._executor
+
+    def _record(self, name, seconds):
+        with self._lock:
+            self._metrics[f'{name}_seconds_total'] += seconds
+            self._metrics[f'{name}_seconds_max'] = max(self._metrics[f'{name}_seconds_max'], seconds)
+
+    def _count(self, name, delta=1):
+        with self._lock:
+            self._metrics[name] += delta
+
+    def _timed(self, submitted, fn, *args):
+        started = time.perf_counter()
+        self._record('wait', started - submitted)
+        try:
+            return fn(*args)
+        finally:
+            self._record('hash', time.perf_counter() - started)
+            self._count('completed')
+
+    def _release(self, future):
+        self._count('in_flight', -1)
+        self._slots.release()
+
+    def run(self, fn, *args):
+        """fn(*args) i havuzda çalıştır ve sonucu bekle. Kuyruk doluysa hemen HashingBusy"""
+        if self.workers <= 0:
+            return self._timed(time.perf_counter(), fn, *args)
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            raise HashingBusy()
+        self._count('in_flight')
+        try:
+            future = self._get_executor().submit(self._timed, time.perf_counter(), fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release) #istek zaman aşımıyla dönse bile yer hash bitince boşalır
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            self._count('timeouts')
+            raise HashingBusy() from None
+
+    def hash(self, password):
+        self._count('hashed')
+        return self.run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        self._count('verified')
+        return self.run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Saklanan hash farklı yöntem/parametrelerle mi üretilmiş ("scrypt:32768:8:1$tuz$özet")"""
+        if self._method_prefix is None:
+            #'scrypt' gibi kısa adların varsayılan parametrelerini öğrenmek için bir kez hashle
+            self._method_prefix = self.hash('').split('$', 1)[0]
+        return password_hash.split('$', 1)[0] != self._method_prefix
+
+    def metrics(self):
+        with self._lock:
+            metrics = dict(self._metrics)
+        completed = metrics['completed']
+        metrics['hash_seconds_avg'] = metrics['hash_seconds_total'] / completed if completed else 0.0
+        metrics['wait_seconds_avg'] = metrics['wait_seconds_total'] / completed if completed else 0.0
+        return metrics
+
+
+def init_passwords(app):
+    app.extensions['password_hasher'] = PasswordHasher(
+        method=app.config['PASSWORD_HASH_METHOD'],
+        workers=app.config['PASSWORD_HASH_WORKERS'],
+        max_pending=app.config['PASSWORD_HASH_QUEUE'],
+        timeout=app.config['PASSWORD_HASH_TIMEOUT'],
+    )
+
+
+def _hasher():
+    return current_app.extensions['password_hasher']
+
+
+def hash_password(password):
+    """Yeni şifrenin hash i (havuzda). Kuyruk doluysa HashingBusy"""
+    return _hasher().hash(password)
+
+
+def verify_password(user, password):
+    """Şifre doğru mu (havuzda). Doğruysa ve hash eski parametrelerle üretildiyse yeniden hashleyip kaydeder"""
+    from app import db
+    hasher = _hasher()
+    if not hasher.verify(user.password_hash, password):
+        return False
+    try:
+        if hasher.needs_rehash(user.password_hash):
+            user.password_hash = hasher.hash(password)
+            db.session.commit()
+            hasher._count('rehashed')
+    except HashingBusy: #giriş engellenmez, bir sonraki girişte tekrar denenir
+        pass
+    return True
+
+
+def password_metrics():
+    return _hasher().metrics()
@@ -0,0 +1,281 @@
+#purge.py kullanıcı ve yazıların küme tabanlı (set-based) silinmesi
+#Yorum, beğeni, kaydetme, takip, bildirim, feed, ilgili yazı ve trend satırları foreign key lerle ON DELETE CASCADE
+#bağlıdır; ilişkiler passive_deletes olduğundan ORM bu satırları yükleyip tek tek silmez, tek DELETE ile vt siler.
+#Satır başına çalışan olaylar (sayaçlar, arama indeksi, dosya referansları, önbellekler) cascade ile silinen satırlar için
+#tetiklenmez: etkilenen yazı/kullanıcı/yorumlar silmeden önce bulunur, sayaçları silmeden sonra yeniden sayılır.
+#Kullanıcı silme önce işaretler (deleted_at): giriş yapamaz, profili görünmez, yazıları yayından kalkar. Satırları sonra
+#PURGE_BATCH_SIZE lik parçalar halinde silinir, her parça ayrı commit edilir (uzun kilit ve dev transaction yok).
+#USER_DELETE_MODE = 'immediate' iken parçalar istek içinde, 'background' iken arka plan thread inde silinir ve istek
+#hemen döner. Yarıda kalan silmeler thread in sonraki turunda ya da flask purge-deleted ile tamamlanır.
+#SQLite da foreign key ler varsayılan kapalıdır; bağlantı açılırken PRAGMA foreign_keys=ON ile açılır.
+import atexit
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from flask import current_app, has_app_context
+from sqlalchemy import event, or_, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app import db
+from app.models import User, Post, Comment, Like, Bookmark, Follow, Notification, TimelineEntry, RelatedPost
+from app.utils.counters import COUNTER_RULES, recount
+
+
+# --- Yazılar ---
+
+def _commenters(connection, post_ids):
+    comments = Comment.__table__
+    return set(connection.execute(
+        select(comments.c.user_id).where(comments.c.post_id.in_(post_ids)).distinct()
+    ).scalars())
+
+
+def delete_posts(post_ids):
+    """Yazıları tek DELETE ile sil (yorum, beğeni, kaydetme, feed ... satırlarını vt siler); silinen yazı sayısı"""
+    from app.utils.search import get_backend
+    from app.utils.uploads import release_references
+    posts, related = Post.__table__, RelatedPost.__table__
+    connection = db.session.connection()
+    rows = connection.execute(
+        select(posts.c.id, posts.c.user_id, posts.c.image).where(posts.c.id.in_(list(post_ids)))
+    ).all()
+    if not rows:
+        return 0
+    ids = [row.id for row in rows]
+    users = {row.user_id for row in rows} | _commenters(connection, ids) #yazı sayısı ve yorum sayısı değişenler
+    listed_by = set(connection.execute(
+        select(related.c.post_id).where(related.c.related_id.in_(ids)).distinct()
+    ).scalars()) - set(ids)
+    backend = get_backend()
+    for post_id in ids:
+        backend.remove_post(connection, post_id) #sqlite FTS tablosunda foreign key yok
+    release_references(connection, [row.image for row in rows])
+    connection.execute(posts.delete().where(posts.c.id.in_(ids)))
+    recount(connection, User, users)
+    _mark(tags=('posts', 'comments', 'users'), related=listed_by)
+    return len(ids)
+
+
+def _post_deleting(mapper, connection, post):
+    #ORM ile tek yazı silinirken de (db.session.delete) cascade ile silinen yorumların yazarları sayılsın
+    connection.info.setdefault('deleted_post_commenters', {})[post.id] = _commenters(connection, [post.id])
+
+
+def _post_deleted(mapper, connection, post):
+    recount(connection, User, connection.info.get('deleted_post_commenters', {}).pop(post.id, ()))
+
+
+# --- Kullanıcılar ---
+
+def mark_user_deleted(user):
+    """Kullanıcıyı silinecek olarak işaretle: girişi ve profili kapanır, yazıları yayından ve feed lerden kalkar"""
+    from app.utils.search import get_backend
+    posts, entries = Post.__table__, TimelineEntry.__table__
+    user.deleted_at = datetime.utcnow() #ORM ile: sürüm artar, diğer worker ların kullanıcı önbelleği de düşer
+    connection = db.session.connection()
+    published = connection.execute(
+        select(posts.c.id).where(posts.c.user_id == user.id, posts.c.is_published == True)
+    ).scalars().all()
+    if published:
+        #updated_at kendine atanır: onupdate çalışmasın (Last-Modified/ETag yazı değişmiş gibi yenilenmesin)
+        connection.execute(
+            posts.update().where(posts.c.id.in_(published)).values(is_published=False, updated_at=posts.c.updated_at)
+        )
+        #Core UPDATE yazı olaylarını tetiklemez: arama indeksi ve ilgili yazılar burada, istatistikler commit sonrası
+        backend = get_backend()
+        for post_id in published:
+            backend.remove_post(connection, post_id)
+    connection.execute(entries.delete().where(entries.c.author_id == user.id))
+    _mark(tags=('posts', 'users'), related=published)
+
+
+def _delete_rows(connection, model, condition, limit, extra=None):
+    """condition a uyan satırlardan en fazla limit tanesini sil ve etkilediği sayaçları yeniden say; silinen satır sayısı"""
+    table = model.__table__
+    rules = COUNTER_RULES.get(model, [])
+    statement = select(table.c.id, *[table.c[fk] for _, fk, _ in rules]).where(condition).order_by(table.c.id)
+    rows = connection.execute(statement.limit(limit) if limit else statement).all()
+    if not rows:
+        return 0
+    affected = {}
+    for target, fk, _ in rules:
+        affected.setdefault(target, set()).update(getattr(row, fk) for row in rows)
+    if extra is not None:
+        extra(connection, rows, affected)
+    connection.execute(table.delete().where(table.c.id.in_([row.id for row in rows])))
+    for target, ids in affected.items():
+        recount(connection, target, ids)
+    return len(rows)
+
+
+def _comment_descendant_authors(connection, rows, affected):
+    #cevaplar da (başka kullanıcılarınki dahil) cascade ile silinir: aynı yazılara yorum yapanlar yeniden sayılır
+    affected[User] |= _commenters(connection, affected[Post])
+
+
+def _purge_steps(user_id):
+    """Kullanıcının satırlarını silen adımlar (sırayla): fonksiyon(connection, limit) -> silinen satır sayısı"""
+    posts = Post.__table__
+
+    def user_posts(connection, limit):
+        statement = select(posts.c.id).where(posts.c.user_id == user_id).order_by(posts.c.id)
+        return delete_posts(connection.execute(statement.limit(limit) if limit else statement).scalars().all())
+
+    def rows_of(model, condition, extra=None):
+        return lambda connection, limit: _delete_rows(connection, model, condition, limit, extra)
+
+    return [
+        user_posts, #yorumları, beğenileri, feed satırları ile birlikte
+        rows_of(Comment, Comment.user_id == user_id, _comment_descendant_authors),
+        rows_of(Like, Like.user_id == user_id),
+        rows_of(Bookmark, Bookmark.user_id == user_id),
+        rows_of(Follow, or_(Follow.follower_id == user_id, Follow.followed_id == user_id)),
+        rows_of(Notification, Notification.user_id == user_id),
+        rows_of(TimelineEntry, TimelineEntry.user_id == user_id),
+    ]
+
+
+def purge_user(user_id, batch_size=None):
+    """Kullanıcının satırlarını parça parça (her parça ayrı commit) ve en son kullanıcıyı sil; silinen satır sayısı"""
+    from app.utils.uploads import release_references
+    batch_size = batch_size or current_app.config['PURGE_BATCH_SIZE']
+    users = User.__table__
+    marked = users.c.id == user_id, users.c.deleted_at.isnot(None)
+    avatar = db.session.execute(select(users.c.avatar).where(*marked)).first()
+    if avatar is None: #işaretlenmemiş (ya da zaten silinmiş) kullanıcı
+        db.session.rollback()
+        return 0
+    total = 0
+    for step in _purge_steps(user_id):
+        while True:
+            deleted = step(db.session.connection(), batch_size)
+            db.session.commit()
+            total += deleted
+            if deleted < batch_size:
+                break
+    #kalanları (bu arada eklenmiş satırlar) vt cascade ile siler; gönderen olduğu bildirimler ve mesajlar NULL olur
+    connection = db.session.connection()
+    if connection.execute(users.delete().where(*marked)).rowcount:
+        release_references(connection, [avatar[0]])
+    _mark(tags=('users',), users=(user_id,))
+    db.session.commit()
+    return total
+
+
+def purge_deleted(batch_size=None):
+    """Silinecek olarak işaretlenmiş tüm kullanıcıları temizle; temizlenen kullanıcı sayısı"""
+    user_ids = db.session.execute(
+        select(User.id).where(User.deleted_at.isnot(None)).order_by(User.deleted_at)
+    ).scalars().all()
+    db.session.rollback() #okuma transaction ı parçalar boyunca açık kalmasın
+    for user_id in user_ids:
+        purge_user(user_id, batch_size)
+    return len(user_ids)
+
+
+def delete_user(user):
+    """Kullanıcıyı işaretle ve USER_DELETE_MODE a göre hemen ya da arka planda temizle"""
+    user_id = user.id
+    mark_user_deleted(user)
+    db.session.commit()
+    if current_app.config['USER_DELETE_MODE'] == 'background':
+        current_app.extensions['purger'].enqueue()
+    else:
+        purge_user(user_id)
+
+
+class UserPurger:
+    """Silinecek olarak işaretlenen kullanıcıları arka planda parça parça temizler (worker başına bir thread)"""
+
+    def __init__(self, app, interval):
+        self.app = app
+        self.interval = interval #saniye; yarıda kalmış silmelerin kontrol aralığı
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pid = None #fork sonrası (gunicorn worker) thread i yeniden başlatmak için
+
+    def enqueue(self):
+        self._ensure_worker()
+        self._wakeup.set()
+
+    def run_once(self):
+        with self.app.app_context():
+            try:
+                return purge_deleted()
+            finally:
+                db.session.remove()
+
+    def _ensure_worker(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            thread = threading.Thread(target=self._run, name='user-purger', daemon=True)
+            thread.start()
+
+    def _run(self):
+        stopped = threading.Event()
+        atexit.register(stopped.set)
+        while not stopped.is_set():
+            self._wakeup.wait(self.interval or None)
+            self._wakeup.clear()
+            try:
+                self.run_once()
+            except Exception:
+                self.app.logger.exception('Silinen kullanıcılar temizlenemedi')
+
+
+def init_purge(app):
+    app.extensions['purger'] = UserPurger(app, interval=app.config['PURGE_INTERVAL'])
+    _register_listeners()
+
+
+# --- Commit sonrası: toplu silmelerin olay tetiklemediği önbellekler ---
+
+def _mark(tags=(), related=(), users=()):
+    changes = db.session.info.setdefault('purged', {'tags': set(), 'related': set(), 'users': set()})
+    changes['tags'].update(tags)
+    changes['related'].update(related)
+    changes['users'].update(users)
+
+
+def _after_commit(session):
+    changes = session.info.pop('purged', None)
+    if not changes or not has_app_context():
+        return
+    from app.utils.fragment_cache import invalidate
+    from app.utils.stats import invalidate_stats
+    extensions = current_app.extensions
+    if 'fragment_cache' in extensions:
+        invalidate(*changes['tags'])
+    if 'stats' in extensions:
+        invalidate_stats() #yazı/taslak/yorum ... sayıları değişti
+    if changes['related'] and 'related_indexer' in extensions:
+        extensions['related_indexer'].enqueue(changes['related']) #listelerinde boşluk kaldı
+    if 'user_cache' in extensions:
+        for user_id in changes['users']:
+            extensions['user_cache'].discard(user_id)
+
+
+def _after_rollback(session):
+    session.info.pop('purged', None)
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection): #ON DELETE CASCADE sqlite da bu ayarla çalışır
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
+
+def _register_listeners():
+    if event.contains(Session, 'after_commit', _after_commit): #create_app birden fazla çağrılırsa tekrar bağlama
+        return
+    event.listen(Engine, 'connect', _enable_sqlite_foreign_keys)
+    event.listen(Post, 'before_delete', _post_deleting)
+    event.listen(Post, 'after_delete', _post_deleted)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
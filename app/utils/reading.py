@@ -0,0 +1,54 @@
+#reading.py kelime sayısı ve okuma süresi hesaplama
+import re
+
+WORDS_PER_MINUTE = 100 #ortalama okuma hızı: dakikada 100 kelime
+
+# Markdown/HTML etiketlerini temizleyen desenler -- modül yüklenirken bir kez derlenir
+_STRIP_PATTERNS = [
+    re.compile(r'<[^>]+>'),          # HTML etiketleri [^>]: > hariç her karakter +: Bir veya daha fazla
+    re.compile(r'```[\s\S]*?```'),   # Kod blokları [\s\S]: Her karakter (whitespace dahil) *?: Non-greedy (açgözlü olmayan)
+    re.compile(r'`[^`]+`'),          # Inline kod
+    re.compile(r'!\[.*?\]\(.*?\)'),  # Resimler ![alt](url)
+    re.compile(r'\[.*?\]\(.*?\)'),   # Linkler [text](url)
+    re.compile(r'[#*_~`]'),          # Markdown karakterleri
+]
+
+
+def count_words(content):
+    """Markdown içeriğindeki okunabilir kelime sayısı"""
+    text = content or ''
+    for pattern in _STRIP_PATTERNS:
+        text = pattern.sub('', text)
+    return len(text.split()) #split boşluklara göre böler, boş kelime üretmez
+
+
+def reading_minutes(word_count):
+    """Kelime sayısından okuma süresi (en az 1 dk)"""
+    return max(1, round(word_count / WORDS_PER_MINUTE))
+
+
+def backfill_reading_stats(batch_size=500, force=False):
+    """Kelime sayısı/okuma süresi boş olan yazıları id sırasıyla parça parça doldur"""
+    from app import db
+    from app.models import Post
+
+    total = 0
+    last_id = 0
+    while True:
+        query = db.session.query(Post.id, Post.content, Post.updated_at).filter(Post.id > last_id)
+        if not force:
+            query = query.filter(Post.word_count.is_(None))
+        rows = query.order_by(Post.id).limit(batch_size).all() #sadece id ve content -- ORM nesnesi yüklenmez
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        updates = []
+        for row in rows:
+            words = count_words(row.content)
+            updates.append({'id': row.id, 'word_count': words, 'reading_minutes': reading_minutes(words),
+                            'updated_at': row.updated_at}) #backfill yazının düzenlenmesi sayılmaz
+        db.session.execute(db.update(Post), updates) #primary key e göre toplu update
+        db.session.commit()
+        total += len(updates)
+    return total
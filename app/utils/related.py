@@ -0,0 +1,404 @@
+#related.py ilgili yazılar: içerik benzerliğine göre önceden hesaplanmış komşu listeleri
+#Her yayınlanmış yazının TF-IDF vektörü (başlık, kategori ve içerikteki en ağır RELATED_TERMS_PER_POST kelime,
+#normalize) post_terms tablosunda tutulur. İki yazının kosinüs benzerliği ortak kelimelerin ağırlık çarpımlarının
+#toplamıdır; kelime -> yazılar indeksiyle sadece ortak kelimesi olan yazılar puanlanır. Yazı başına en benzer
+#RELATED_POSTS_STORED yazı related_posts tablosuna yazılır ve detay sayfası sadece bu tablodan okur.
+#Yazı eklenince/düzenlenince/yayından kalkınca/silinince commit sonrası arka planda (RELATED_UPDATE_INTERVAL) o yazının
+#vektörü ve listesi, ayrıca ona en benzer RELATED_FANOUT yazının ve onu listeleyen yazıların listeleri yeniden hesaplanır.
+#Artımlı güncellemede kelime sıklıkları (idf) post_terms tan yaklaşık alınır; flask rebuild-related hepsini tam hesaplar
+#(numpy kuruluysa puanlama vektörel yapılır, değilse saf python).
+import atexit
+import heapq
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, inspect, or_, select
+from sqlalchemy.orm import Session, object_session
+from app import db
+from app.models import Post, PostTerm, RelatedPost
+
+try:
+    import numpy as np
+except ImportError: #numpy opsiyonel, yoksa aynı hesap saf python ile yapılır
+    np = None
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# benzerliğe katkısı olmayan sık kelimeler (RELATED_MAX_DF geri kalanını eler)
+STOPWORDS = frozenset('''
+acaba ama ancak artık aslında bana bazı belki ben beni benim bile bir biraz birçok biri birkaç birşey biz bize bizi
+bizim böyle böylece bu buna bunda bundan bunlar bunları bunların bunu bunun burada çok çünkü da daha dahi de defa
+diye değil diğer en gibi göre hem hep hepsi her hiç için ile ise işte kadar kendi kez ki kim kimse mı mi mu mü nasıl
+ne neden nerede nereye niçin niye olan olarak oldu olduğu olduğunu olmak olur onlar onları onların onu onun orada
+öyle şey şeyler şu şuna şunu tüm üzere var veya ve ya yani yine yok zaten
+about after all also and are because been but can could did does for from had has have how into its just more
+most not now only other our out over some such than that the their them then there these they this those through
+too under very was were what when where which while who why will with would you your
+'''.split())
+
+# post_terms.term kolonunun uzunluğu
+MAX_TERM_LENGTH = 64
+
+# bu kadar yazıdan azsa RELATED_MAX_DF uygulanmaz (küçük blogda her kelime "sık" görünür)
+MIN_DOCS_FOR_MAX_DF = 20
+
+# güncellenince vektörü değiştiren kolonlar
+TRACKED_COLUMNS = ('title', 'content', 'category', 'is_published')
+
+
+def tokenize(text):
+    """Metni küçük harfli kelimelere böl (kısa kelimeler, sayılar ve sık kelimeler atılır)"""
+    if not text:
+        return []
+    text = text.replace('İ', 'i').lower() #'İ'.lower() birleşik nokta ekler, kelimeyi ikiye böler
+    return [
+        token[:MAX_TERM_LENGTH] for token in _TOKEN_RE.findall(text)
+        if len(token) > 2 and not token.isdigit() and token not in STOPWORDS
+    ]
+
+
+def term_counts(title, content, category, title_weight):
+    """Yazının kelime sayıları; başlık ve kategori kelimeleri title_weight kat sayılır"""
+    counts = Counter(tokenize(content))
+    for token in tokenize(title):
+        counts[token] += title_weight
+    if category:
+        counts['#' + category.lower()[:MAX_TERM_LENGTH - 1]] += title_weight #kategori ayrı bir kelime gibi
+    return counts
+
+
+def vectorize(counts, df, n_docs, max_terms, max_df):
+    """Kelime sayıları -> normalize TF-IDF vektörü {kelime: ağırlık} (en ağır max_terms kelime)"""
+    weights = {}
+    for term, count in counts.items():
+        freq = df.get(term, 0)
+        if n_docs >= MIN_DOCS_FOR_MAX_DF and freq > max_df * n_docs:
+            continue
+        weights[term] = (1 + math.log(count)) * (math.log((1 + n_docs) / (1 + freq)) + 1)
+    top = heapq.nlargest(max_terms, weights.items(), key=lambda item: item[1])
+    norm = math.sqrt(sum(weight * weight for _, weight in top))
+    return {term: weight / norm for term, weight in top} if norm else {}
+
+
+def _top_neighbours(scores, limit, min_score):
+    """{post_id: puan} -> en benzer [(post_id, puan)] (eşitlikte küçük id önce)"""
+    best = heapq.nsmallest(limit, ((-score, post_id) for post_id, score in scores.items() if score >= min_score))
+    return [(post_id, -score) for score, post_id in best]
+
+
+def _settings():
+    config = current_app.config
+    return {
+        'title_weight': config['RELATED_TITLE_WEIGHT'],
+        'max_terms': config['RELATED_TERMS_PER_POST'],
+        'max_df': config['RELATED_MAX_DF'],
+        'limit': config['RELATED_POSTS_STORED'],
+        'min_score': config['RELATED_MIN_SCORE'],
+    }
+
+
+# --- Detay sayfası ---
+
+def related_posts(post, limit=None):
+    """Önceden hesaplanmış ilgili yazılar (benzerlik sırasıyla, sadece yayınlanmış olanlar)"""
+    limit = limit or current_app.config['RELATED_POSTS_SHOWN']
+    return (
+        Post.query.join(RelatedPost, RelatedPost.related_id == Post.id)
+        .filter(RelatedPost.post_id == post.id, Post.is_published == True)
+        .order_by(RelatedPost.rank)
+        .limit(limit)
+        .all()
+    )
+
+
+# --- Tam hesaplama (flask rebuild-related) ---
+
+class _Scorer:
+    """Tüm vektörlerin kelime -> (yazı, ağırlık) indeksi; bir yazının diğerleriyle benzerliklerini hesaplar"""
+
+    def __init__(self, vectors):
+        postings = defaultdict(list)
+        for post_id, vector in vectors.items():
+            for term, weight in vector.items():
+                postings[term].append((post_id, weight))
+        if np is None:
+            self.postings = postings
+            return
+        self.ids = np.fromiter(vectors, dtype=np.int64, count=len(vectors))
+        self.index = {post_id: i for i, post_id in enumerate(vectors)}
+        self.postings = {
+            term: (np.array([self.index[post_id] for post_id, _ in pairs], dtype=np.int64),
+                   np.array([weight for _, weight in pairs], dtype=np.float64))
+            for term, pairs in postings.items()
+        }
+
+    def scores(self, post_id, vector):
+        """{diğer yazı id si: benzerlik} (ortak kelimesi olmayanlar yok)"""
+        if np is None:
+            scores = defaultdict(float)
+            for term, weight in vector.items():
+                for other_id, other_weight in self.postings.get(term, ()):
+                    scores[other_id] += weight * other_weight
+            scores.pop(post_id, None)
+            return scores
+        scores = np.zeros(len(self.ids))
+        for term, weight in vector.items():
+            positions, weights = self.postings[term]
+            scores[positions] += weight * weights #bir kelimede her yazı bir kez geçer, tekrar eden indeks yok
+        scores[self.index[post_id]] = 0
+        nonzero = np.flatnonzero(scores)
+        return dict(zip(self.ids[nonzero].tolist(), scores[nonzero].tolist()))
+
+
+def rebuild_related(batch_size=500):
+    """Tüm yayınlanmış yazıların vektörlerini ve ilgili yazı listelerini yeniden hesapla: (yazı sayısı, satır sayısı)"""
+    settings = _settings()
+    posts, terms, related = Post.__table__, PostTerm.__table__, RelatedPost.__table__
+    counts = {}
+    df = Counter()
+    result = db.session.execute(
+        select(posts.c.id, posts.c.title, posts.c.content, posts.c.category)
+        .where(posts.c.is_published == True).order_by(posts.c.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for rows in result.partitions():
+        for row in rows:
+            counts[row.id] = term_counts(row.title, row.content, row.category, settings['title_weight'])
+            df.update(counts[row.id].keys())
+    vectors = {
+        post_id: vectorize(post_counts, df, len(counts), settings['max_terms'], settings['max_df'])
+        for post_id, post_counts in counts.items()
+    }
+    del counts
+    scorer = _Scorer(vectors)
+
+    total = 0
+    #tek transaction: postgres te okuyucular yeni listeler commit edilene kadar eskileri görür
+    with db.engine.begin() as connection:
+        connection.execute(related.delete())
+        connection.execute(terms.delete())
+        post_ids = list(vectors)
+        for start in range(0, len(post_ids), batch_size):
+            batch = post_ids[start:start + batch_size]
+            term_rows = [
+                {'post_id': post_id, 'term': term, 'weight': weight}
+                for post_id in batch for term, weight in vectors[post_id].items()
+            ]
+            related_rows = [
+                {'post_id': post_id, 'rank': rank, 'related_id': other_id, 'score': score}
+                for post_id in batch
+                for rank, (other_id, score) in enumerate(_top_neighbours(
+                    scorer.scores(post_id, vectors[post_id]), settings['limit'], settings['min_score']))
+            ]
+            if term_rows:
+                connection.execute(terms.insert(), term_rows)
+            if related_rows:
+                connection.execute(related.insert(), related_rows)
+            total += len(related_rows)
+    return len(vectors), total
+
+
+# --- Artımlı güncelleme ---
+
+def _stored_vector(connection, post_id):
+    terms = PostTerm.__table__
+    return dict(connection.execute(select(terms.c.term, terms.c.weight).where(terms.c.post_id == post_id)).all())
+
+
+def _scores(connection, post_id, vector):
+    """Yazının post_terms taki diğer yazılarla benzerlikleri (sadece ortak kelimeli satırlar okunur)"""
+    terms = PostTerm.__table__
+    scores = defaultdict(float)
+    if not vector:
+        return scores
+    rows = connection.execute(
+        select(terms.c.post_id, terms.c.term, terms.c.weight)
+        .where(terms.c.term.in_(list(vector)), terms.c.post_id != post_id)
+    )
+    for other_id, term, weight in rows:
+        scores[other_id] += vector[term] * weight
+    return scores
+
+
+def _write_neighbours(connection, post_id, scores, settings):
+    related = RelatedPost.__table__
+    connection.execute(related.delete().where(related.c.post_id == post_id))
+    rows = [
+        {'post_id': post_id, 'rank': rank, 'related_id': other_id, 'score': score}
+        for rank, (other_id, score) in enumerate(_top_neighbours(scores, settings['limit'], settings['min_score']))
+    ]
+    if rows:
+        connection.execute(related.insert(), rows)
+
+
+def _listed_by(connection, post_id):
+    related = RelatedPost.__table__
+    return {row[0] for row in connection.execute(select(related.c.post_id).where(related.c.related_id == post_id))}
+
+
+def _reindex_post(connection, post_id, settings):
+    """Yazının vektörünü ve listesini yenile; listeleri yeniden hesaplanması gereken diğer yazıları döndür"""
+    posts, terms, related = Post.__table__, PostTerm.__table__, RelatedPost.__table__
+    affected = _listed_by(connection, post_id)
+    connection.execute(terms.delete().where(terms.c.post_id == post_id))
+    connection.execute(related.delete().where(or_(related.c.post_id == post_id, related.c.related_id == post_id)))
+    row = connection.execute(
+        select(posts.c.title, posts.c.content, posts.c.category, posts.c.is_published).where(posts.c.id == post_id)
+    ).first()
+    if row is None or not row.is_published:
+        return affected
+    counts = term_counts(row.title, row.content, row.category, settings['title_weight'])
+    n_docs = connection.execute(select(func.count()).select_from(posts).where(posts.c.is_published == True)).scalar()
+    df = dict(connection.execute(
+        select(terms.c.term, func.count()).where(terms.c.term.in_(list(counts))).group_by(terms.c.term)
+    ).all()) if counts else {}
+    vector = vectorize(counts, df, n_docs, settings['max_terms'], settings['max_df'])
+    if vector:
+        connection.execute(terms.insert(), [
+            {'post_id': post_id, 'term': term, 'weight': weight} for term, weight in vector.items()
+        ])
+    scores = _scores(connection, post_id, vector)
+    _write_neighbours(connection, post_id, scores, settings)
+    #yeni/değişen yazı en benzer yazıların listelerine de girebilir
+    affected.update(other_id for other_id, _ in _top_neighbours(scores, settings['fanout'], settings['min_score']))
+    return affected
+
+
+def update_related(post_ids):
+    """Değişen yazıları ve etkilenen komşularını yeniden hesapla (commit sonrası arka planda çağrılır)"""
+    settings = dict(_settings(), fanout=current_app.config['RELATED_FANOUT'])
+    post_ids = set(post_ids)
+    with db.engine.begin() as connection:
+        affected = set()
+        for post_id in sorted(post_ids):
+            affected |= _reindex_post(connection, post_id, settings)
+        for other_id in sorted(affected - post_ids):
+            _write_neighbours(
+                connection, other_id, _scores(connection, other_id, _stored_vector(connection, other_id)), settings
+            )
+    return len(post_ids) + len(affected - post_ids)
+
+
+class RelatedIndexer:
+    """Worker (process) başına değişen yazı kuyruğu ve arka plan güncelleyici thread i"""
+
+    def __init__(self, app, interval):
+        self.app = app
+        self.interval = interval #saniye; 0 veya altı: commit sonrası hemen güncelle (testler için)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pid = None #fork sonrası (gunicorn worker) thread i yeniden başlatmak için
+
+    def enqueue(self, post_ids):
+        if not post_ids:
+            return
+        self._add(post_ids)
+        if self.interval <= 0:
+            self.flush()
+            return
+        self._ensure_worker()
+
+    def _add(self, post_ids):
+        with self._lock:
+            self._pending.update(post_ids)
+
+    def _take(self):
+        with self._lock:
+            pending, self._pending = self._pending, set()
+        return pending
+
+    def flush(self):
+        """Bekleyen yazıları işle (aynı yazının aralıktaki birden fazla düzenlemesi tek güncelleme olur)"""
+        pending = self._take()
+        if not pending:
+            return 0
+        try:
+            with self.app.app_context():
+                return update_related(pending)
+        except Exception:
+            self._add(pending) #yazılamadıysa kuyruğa geri koy, bir sonraki turda tekrar denenir
+            raise
+
+    def _ensure_worker(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None: #fork edilmiş process: ebeveynin kuyruğu burada işlenmemeli
+                self._pending = set()
+            self._pid = os.getpid()
+            thread = threading.Thread(target=self._run, name='related-posts', daemon=True)
+            thread.start()
+            atexit.register(self._flush_on_exit)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                self.app.logger.exception('İlgili yazılar güncellenemedi')
+
+    def _flush_on_exit(self):
+        try:
+            self.flush()
+        except Exception:
+            self.app.logger.exception('Kapanışta ilgili yazılar güncellenemedi')
+
+
+def init_related(app):
+    app.extensions['related_indexer'] = RelatedIndexer(app, interval=app.config['RELATED_UPDATE_INTERVAL'])
+    _register_listeners()
+
+
+# --- Olaylar: yazı değişince commit sonrası kuyruğa alınır ---
+
+def _mark(session, post_id):
+    session.info.setdefault('related_posts', set()).add(post_id)
+
+
+def _post_inserted(mapper, connection, post):
+    session = object_session(post)
+    if session is not None and post.is_published:
+        _mark(session, post.id)
+
+
+def _post_updated(mapper, connection, post):
+    session = object_session(post)
+    state = inspect(post)
+    if session is not None and any(state.attrs[name].history.has_changes() for name in TRACKED_COLUMNS):
+        _mark(session, post.id)
+
+
+def _post_deleting(mapper, connection, post):
+    #post_terms/related_posts satırlarını vt siler (ON DELETE CASCADE); silinmeden önce onu listeleyenler bulunur
+    session = object_session(post)
+    if session is not None:
+        for post_id in _listed_by(connection, post.id) - {post.id}:
+            _mark(session, post_id) #listelerinde boşluk kaldı, yeniden hesaplanır
+
+
+def _after_commit(session):
+    post_ids = session.info.pop('related_posts', None)
+    if post_ids and has_app_context() and 'related_indexer' in current_app.extensions:
+        current_app.extensions['related_indexer'].enqueue(post_ids)
+
+
+def _after_rollback(session):
+    session.info.pop('related_posts', None)
+
+
+def _register_listeners():
+    if event.contains(Session, 'after_commit', _after_commit): #create_app birden fazla çağrılırsa tekrar bağlama
+        return
+    event.listen(Post, 'after_insert', _post_inserted)
+    event.listen(Post, 'after_update', _post_updated)
+    event.listen(Post, 'before_delete', _post_deleting)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
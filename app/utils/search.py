@@ -0,0 +1,253 @@
+#search.py yazılar için tam metin arama
+#PostgreSQL: posts.search_vector (tsvector, generated column) + GIN index, dil ayarı config.SEARCH_LANGUAGE
+#SQLite: FTS5 sanal tablosu (posts_fts) -- testler ve yerel geliştirme için
+#İkisi de yoksa eski ILIKE aramasına düşer
+import re
+from flask import current_app
+from markupsafe import escape, Markup
+from sqlalchemy import event, func, inspect, literal_column, select, text, column, table
+
+# Vurgulanan kelimeleri işaretlemek için html de geçmeyecek karakterler; kaçışlamadan sonra <mark> e çevrilir
+_START, _STOP = '\x02', '\x03'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _highlight(raw):
+    """Ham snippet i html için kaçışla ve işaretli kelimeleri <mark> ile sar"""
+    if raw is None:
+        return None
+    html = str(escape(raw))
+    return Markup(html.replace(_START, '<mark>').replace(_STOP, '</mark>'))
+
+
+class LikeSearchBackend:
+    """Tam metin desteği olmayan veritabanları için ILIKE araması (alaka sıralaması yok, tarihe göre)"""
+    name = 'like'
+
+    def setup(self, connection):
+        pass
+
+    def match(self, query, term):
+        """Sadece eşleşme filtresi (sıralama yok) -- cursor sayfalama kendi sırasını kullanır"""
+        from app.models import Post
+        return query.filter(
+            (Post.title.ilike(f'%{term}%')) | (Post.content.ilike(f'%{term}%'))
+        )
+
+    def filter(self, query, term):
+        """Eşleşme filtresi, yeniden eskiye (ILIKE alaka puanı vermez)"""
+        from app.models import Post
+        return self.match(query, term).order_by(Post.created_at.desc())
+
+    def snippets(self, post_ids, term):
+        return {}
+
+    def index_post(self, connection, post):
+        pass
+
+    def remove_post(self, connection, post_id):
+        pass
+
+    def rebuild(self, connection):
+        pass
+
+
+class PostgresSearchBackend(LikeSearchBackend):
+    """tsvector generated column + GIN index. Kolon postgres tarafından güncel tutulur"""
+    name = 'postgresql'
+
+    vector = literal_column('posts.search_vector')
+
+    def __init__(self, language):
+        self.language = language
+
+    def setup(self, connection):
+        #generated column: title A, içerik B ağırlıklı. Yazı eklenince/düzenlenince postgres kendisi günceller
+        connection.execute(text(f"""
+            ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('{self.language}'::regconfig, coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('{self.language}'::regconfig, coalesce(content, '')), 'B')
+            ) STORED
+        """))
+        connection.execute(text(
+            'CREATE INDEX IF NOT EXISTS ix_posts_search_vector ON posts USING GIN (search_vector)'
+        ))
+
+    def _tsquery(self, term):
+        config = literal_column(f"'{self.language}'::regconfig")
+        return config, func.websearch_to_tsquery(config, term) #websearch: "tırnaklı ifade", -hariç, or destekli
+
+    def match(self, query, term):
+        _, tsquery = self._tsquery(term)
+        return query.filter(self.vector.op('@@')(tsquery))
+
+    def filter(self, query, term):
+        from app.models import Post
+        _, tsquery = self._tsquery(term)
+        return self.match(query, term).order_by(
+            func.ts_rank_cd(self.vector, tsquery).desc(),
+            Post.created_at.desc(),
+        )
+
+    def snippets(self, post_ids, term):
+        if not post_ids:
+            return {}
+        from app import db
+        from app.models import Post
+        config, tsquery = self._tsquery(term)
+        options = f'StartSel={_START}, StopSel={_STOP}, MaxWords=35, MinWords=15, MaxFragments=2'
+        rows = db.session.execute(
+            select(Post.id, func.ts_headline(config, Post.content, tsquery, options))
+            .where(Post.id.in_(post_ids))
+        )
+        return {row[0]: _highlight(row[1]) for row in rows}
+
+
+class SQLiteSearchBackend(LikeSearchBackend):
+    """FTS5 sanal tablosu. rowid = posts.id, satırlar Post olaylarında güncellenir"""
+    name = 'sqlite'
+
+    fts = table('posts_fts', column('rowid'))
+
+    def setup(self, connection):
+        exists = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts_fts'"
+        )).first()
+        if exists:
+            return
+        #remove_diacritics: ş/ğ/ü gibi harfler aramada s/g/u ile de eşleşir
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE posts_fts USING fts5(title, content, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+        self.rebuild(connection)
+
+    @staticmethod
+    def match_expression(term):
+        """Kullanıcı girdisini FTS5 sorgusuna çevir: her kelime tırnaklı, sonuncusu önek araması"""
+        tokens = _TOKEN_RE.findall(term)
+        if not tokens:
+            return None
+        quoted = ['"' + token.replace('"', '""') + '"' for token in tokens]
+        quoted[-1] += '*' #yazarken arama: son kelime tamamlanmamış olabilir
+        return ' '.join(quoted)
+
+    def match(self, query, term):
+        from app.models import Post
+        expression = self.match_expression(term)
+        if expression is None:
+            return query.filter(text('0 = 1'))
+        return query.join(self.fts, self.fts.c.rowid == Post.id).filter(
+            text('posts_fts MATCH :fts_match').bindparams(fts_match=expression)
+        )
+
+    def filter(self, query, term):
+        from app.models import Post
+        if self.match_expression(term) is None:
+            return query.filter(text('0 = 1'))
+        return self.match(query, term).order_by(
+            text('bm25(posts_fts, 10.0, 1.0)'), #küçük değer = daha alakalı, başlık 10 kat ağırlıklı
+            Post.created_at.desc(),
+        )
+
+    def snippets(self, post_ids, term):
+        expression = self.match_expression(term)
+        if not post_ids or expression is None:
+            return {}
+        from app import db
+        ids = ', '.join(str(int(post_id)) for post_id in post_ids)
+        rows = db.session.execute(text(f"""
+            SELECT rowid, snippet(posts_fts, 1, :start, :stop, '…', 24)
+            FROM posts_fts WHERE posts_fts MATCH :fts_match AND rowid IN ({ids})
+        """), {'fts_match': expression, 'start': _START, 'stop': _STOP})
+        return {row[0]: _highlight(row[1]) for row in rows}
+
+    def index_post(self, connection, post):
+        self.remove_post(connection, post.id)
+        connection.execute(
+            text('INSERT INTO posts_fts (rowid, title, content) VALUES (:id, :title, :content)'),
+            {'id': post.id, 'title': post.title or '', 'content': post.content or ''},
+        )
+
+    def remove_post(self, connection, post_id):
+        connection.execute(text('DELETE FROM posts_fts WHERE rowid = :id'), {'id': post_id})
+
+    def rebuild(self, connection):
+        connection.execute(text('DELETE FROM posts_fts'))
+        connection.execute(text(
+            "INSERT INTO posts_fts (rowid, title, content) "
+            "SELECT id, coalesce(title, ''), coalesce(content, '') FROM posts"
+        ))
+
+
+def _make_backend(connection, app):
+    dialect = connection.dialect.name
+    if dialect == 'postgresql':
+        return PostgresSearchBackend(app.config['SEARCH_LANGUAGE'])
+    if dialect == 'sqlite':
+        has_fts5 = connection.execute(text(
+            "SELECT sqlite_compileoption_used('ENABLE_FTS5')"
+        )).scalar()
+        if has_fts5:
+            return SQLiteSearchBackend()
+    return LikeSearchBackend()
+
+
+def init_search(app):
+    """Arama altyapısını kur (create_all sonrası, app context içinde çağrılır)"""
+    from app import db
+    with db.engine.begin() as connection:
+        backend = _make_backend(connection, app)
+        backend.setup(connection)
+    app.extensions['search'] = backend
+    _register_listeners()
+
+
+def get_backend():
+    #init_search çalışmamışsa (ör. sadece create_all yapan bir script) ILIKE aramasıyla devam et
+    return current_app.extensions.get('search') or LikeSearchBackend()
+
+
+def search_posts(query, term, ranked=True):
+    """Yayınlanmış yazı sorgusuna arama filtresi ve (ranked ise) alaka sıralaması ekle"""
+    backend = get_backend()
+    return backend.filter(query, term) if ranked else backend.match(query, term)
+
+
+def search_snippets(posts, term):
+    """Sayfadaki yazılar için vurgulanmış snippet ler: {post_id: Markup}"""
+    return get_backend().snippets([post.id for post in posts], term)
+
+
+def rebuild_index():
+    from app import db
+    with db.engine.begin() as connection:
+        get_backend().rebuild(connection)
+
+
+# --- Artımlı güncelleme: yazı eklenince/düzenlenince/silinince indeks güncellenir ---
+
+def _after_insert(mapper, connection, post):
+    get_backend().index_post(connection, post)
+
+
+def _after_update(mapper, connection, post):
+    state = inspect(post)
+    #views += 1 gibi güncellemelerde indeksi yeniden yazma
+    if state.attrs.title.history.has_changes() or state.attrs.content.history.has_changes():
+        get_backend().index_post(connection, post)
+
+
+def _after_delete(mapper, connection, post):
+    get_backend().remove_post(connection, post.id)
+
+
+def _register_listeners():
+    from app.models import Post
+    if event.contains(Post, 'after_insert', _after_insert):
+        return
+    event.listen(Post, 'after_insert', _after_insert)
+    event.listen(Post, 'after_update', _after_update)
+    event.listen(Post, 'after_delete', _after_delete)
@@ -0,0 +1,165 @@
+#sql_profiler.py istek başına SQL ölçümü ve N+1 dedektörü
+#before/after_cursor_execute olaylarıyla istek thread inin her ifadesi sayılır, süresi toplanır ve ifade şekli (boşluklar
+#ve IN (...) listeleri sadeleşmiş sql metni) gruplanır. Aynı SELECT şekli bir istekte SQL_N_PLUS_ONE_THRESHOLD kez
+#ya da daha fazla çalıştıysa istek N+1 olarak işaretlenir.
+#Sonuç üç yerde görülür: debug modunda X-SQL-* yanıt başlıkları, N+1 / yavaş isteklerde (SQL_PROFILE_LOG açıksa her
+#istekte) tek satır json log ve endpoint bazında toplanan /admin/sql sayfası (worker başına, süreç belleğinde).
+#Arka plan thread lerinin (görüntülenme sayacı, bildirim kuyruğu ...) sorguları istek sayılmaz.
+import json
+import re
+import threading
+import time
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_WHITESPACE_RE = re.compile(r'\s+')
+# IN (?, ?, ?) / IN (%(id_1_1)s, %(id_1_2)s) -> IN (?) : liste uzunluğu farklı sorgular aynı şekil sayılır
+_PARAM_LIST_RE = re.compile(r'\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))+\s*\)')
+
+# şekil metni log ve admin sayfasında bu uzunlukta kesilir
+MAX_SHAPE_LENGTH = 300
+
+
+def statement_shape(statement):
+    """Sql metnini gruplama için sadeleştir"""
+    shape = _WHITESPACE_RE.sub(' ', statement).strip()
+    return _PARAM_LIST_RE.sub('(?)', shape)
+
+
+class RequestProfile:
+    """Bir isteğin SQL ölçümleri"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.shapes = {} #şekil -> [adet, toplam süre]
+
+    def record(self, statement, seconds):
+        self.statements += 1
+        self.db_seconds += seconds
+        entry = self.shapes.setdefault(statement_shape(statement), [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    def n_plus_one(self, threshold):
+        """Tekrarlanan SELECT şekilleri [(şekil, adet)], en çok tekrarlanan önce"""
+        repeated = [
+            (shape, count) for shape, (count, _) in self.shapes.items()
+            if count >= threshold and shape[:6].upper() == 'SELECT'
+        ]
+        return sorted(repeated, key=lambda item: -item[1])
+
+
+class EndpointStats:
+    """Endpoint bazında toplam ölçümler (worker başına)"""
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def add(self, endpoint, total_ms, profile, repeated):
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, {
+                'requests': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'db_ms': 0.0, 'statements': 0,
+                'max_statements': 0, 'n_plus_one': 0, 'last_n_plus_one': None,
+            })
+            stats['requests'] += 1
+            stats['total_ms'] += total_ms
+            stats['max_ms'] = max(stats['max_ms'], total_ms)
+            stats['db_ms'] += profile.db_seconds * 1000
+            stats['statements'] += profile.statements
+            stats['max_statements'] = max(stats['max_statements'], profile.statements)
+            if repeated:
+                stats['n_plus_one'] += 1
+                shape, count = repeated[0]
+                stats['last_n_plus_one'] = {'shape': shape[:MAX_SHAPE_LENGTH], 'count': count}
+
+    def summary(self):
+        """Endpoint ler ortalama süreye göre (en yavaş önce)"""
+        with self._lock:
+            rows = [dict(stats, endpoint=endpoint) for endpoint, stats in self._endpoints.items()]
+        for row in rows:
+            requests = row['requests']
+            row['avg_ms'] = row['total_ms'] / requests
+            row['avg_db_ms'] = row['db_ms'] / requests
+            row['avg_statements'] = row['statements'] / requests
+        return sorted(rows, key=lambda row: -row['avg_ms'])
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+def _profile():
+    #sadece isteği işleyen thread (istek bağlamı olan) ve profil başlatılmışsa
+    return g.get('_sql_profile') if has_request_context() else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _profile() is not None:
+        context._sql_profile_started = time.perf_counter() #hata olursa after çağrılmaz, bağlam ifadeyle birlikte atılır
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _profile()
+    started = getattr(context, '_sql_profile_started', None)
+    if profile is not None and started is not None:
+        profile.record(statement, time.perf_counter() - started)
+
+
+def _start_profile():
+    g._sql_profile = RequestProfile()
+
+
+def _finish_profile(response):
+    profile = g.pop('_sql_profile', None)
+    if profile is None:
+        return response
+    config = current_app.config
+    total_ms = (time.perf_counter() - profile.started) * 1000
+    repeated = profile.n_plus_one(config['SQL_N_PLUS_ONE_THRESHOLD'])
+    endpoint = request.endpoint or '<404>'
+    if endpoint != 'static':
+        current_app.extensions['sql_profiler'].add(endpoint, total_ms, profile, repeated)
+
+    headers = config['SQL_PROFILE_HEADERS']
+    if headers or (headers is None and current_app.debug):
+        response.headers['X-SQL-Count'] = str(profile.statements)
+        response.headers['X-SQL-Time-ms'] = f'{profile.db_seconds * 1000:.1f}'
+        response.headers['X-SQL-N-Plus-One'] = str(len(repeated))
+
+    slow = total_ms >= config['SQL_SLOW_REQUEST_MS']
+    if repeated or slow or config['SQL_PROFILE_LOG']:
+        record = {
+            'event': 'sql_profile', 'endpoint': endpoint, 'method': request.method, 'path': request.path,
+            'status': response.status_code, 'total_ms': round(total_ms, 1), 'statements': profile.statements,
+            'db_ms': round(profile.db_seconds * 1000, 1),
+            'n_plus_one': [{'shape': shape[:MAX_SHAPE_LENGTH], 'count': count} for shape, count in repeated],
+        }
+        line = json.dumps(record, ensure_ascii=False)
+        if repeated or slow:
+            current_app.logger.warning(line)
+        else:
+            current_app.logger.info(line)
+    return response
+
+
+def sql_profile_summary():
+    return current_app.extensions['sql_profiler'].summary()
+
+
+def reset_sql_profile():
+    current_app.extensions['sql_profiler'].reset()
+
+
+def init_sql_profiler(app):
+    app.extensions['sql_profiler'] = EndpointStats()
+    if not app.config['SQL_PROFILE']:
+        return
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute): #create_app birden fazla çağrılırsa
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
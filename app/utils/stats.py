@@ -0,0 +1,185 @@
+#stats.py admin paneli sayıları: tek sorguda hesaplanır, süreç içinde TTL ile saklanır, veri değişince düşürülür
+#Kullanıcı/yazı/taslak/yorum/beğeni/takip/mesaj sayıları tek SELECT içindeki alt sorgularla gelir ve STATS_CACHE_TTL
+#saniye saklanır. Bu tablolara satır eklenip silinince (ya da yazının yayın / mesajın okunma durumu değişince) commit
+#sonrası önbellek düşürülür; diğer worker lar en geç TTL sonunda yeniler.
+#STATS_HISTORY açıksa günün satırı (yoksa) günde bir kez stats_snapshots a yazılır; trendler ana tabloları taramadan
+#okunur. Günün son değerleri snapshot-stats komutuyla (cron) yazılır.
+import threading
+import time
+from datetime import date, datetime, timedelta
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, object_session
+from app import db
+from app.models import User, Post, Comment, Like, Follow, ContactMessage, StatsSnapshot
+
+# sayı adı: (model, koşullar...) -- adlar stats_snapshots kolonlarıyla aynı
+STATS = {
+    'users': (User, User.deleted_at.is_(None)), #silinmek üzere işaretlenenler sayılmaz
+    'posts': (Post, Post.is_published.is_(True)),
+    'drafts': (Post, Post.is_published.is_(False)),
+    'comments': (Comment,),
+    'likes': (Like,),
+    'follows': (Follow,),
+    'messages': (ContactMessage,),
+    'pending_messages': (ContactMessage, ContactMessage.status == 'pending'),
+}
+
+# güncellenince sayıları değiştiren kolonlar (ekleme/silme her zaman değiştirir)
+TRACKED_UPDATES = {Post: 'is_published', ContactMessage: 'status', User: 'deleted_at'}
+
+
+def compute_stats():
+    """Tüm sayılar tek sorguda (tablo başına bir COUNT alt sorgusu)"""
+    columns = [
+        select(func.count()).select_from(model.__table__).where(*conditions).scalar_subquery().label(name)
+        for name, (model, *conditions) in STATS.items()
+    ]
+    return dict(db.session.execute(select(*columns)).one()._mapping)
+
+
+class StatsCache:
+    """Süreç içi TTL önbellek; invalidate() sonrası hesaplanmaya başlamış eski değer saklanmaz"""
+
+    def __init__(self, ttl):
+        self.ttl = ttl #saniye; 0: her seferinde hesapla
+        self._value = None
+        self._expires = 0
+        self._generation = 0 #her invalidate() te artar
+        self._lock = threading.Lock()
+
+    def get(self, compute):
+        with self._lock:
+            if self._value is not None and time.monotonic() < self._expires:
+                return self._value
+            generation = self._generation
+        value = compute()
+        with self._lock:
+            if generation == self._generation: #hesaplama sırasında veri değiştiyse bu değer zaten eski
+                self._value, self._expires = value, time.monotonic() + self.ttl
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+            self._generation += 1
+
+
+def init_stats(app):
+    app.extensions['stats'] = StatsCache(app.config['STATS_CACHE_TTL'])
+    _register_listeners()
+
+
+def get_stats():
+    """Admin paneli sayıları ve STATS_TREND_DAYS günlük değişimleri: {'counts': {...}, 'trends': {...}}"""
+    return current_app.extensions['stats'].get(_load)
+
+
+def invalidate_stats():
+    current_app.extensions['stats'].invalidate()
+
+
+def _load():
+    counts = compute_stats()
+    trends = {}
+    if current_app.config['STATS_HISTORY']:
+        _record_daily(counts)
+        trends = stats_trends(counts)
+    return {'counts': counts, 'trends': trends}
+
+
+# --- Günlük geçmiş ---
+
+_recorded_day = None #bu süreçte günün satırının var olduğu görülen gün
+
+
+def _record_daily(counts):
+    #önbellek her değişiklikte düştüğü için her panel yüklemesinde yazılmasın: süreç başına günde bir kez, satır yoksa
+    global _recorded_day
+    today = date.today()
+    if _recorded_day == today:
+        return
+    table = StatsSnapshot.__table__
+    if db.session.execute(select(table.c.day).where(table.c.day == today)).first() is None:
+        _insert_snapshot(counts, today)
+    _recorded_day = today
+
+
+def _insert_snapshot(counts, day):
+    values = {name: counts[name] for name in STATS}
+    try:
+        with db.engine.begin() as connection: #ayrı bağlantı: panel isteğinin oturumunu commit etmeden yazılır
+            connection.execute(StatsSnapshot.__table__.insert().values(day=day, recorded_at=datetime.utcnow(), **values))
+    except IntegrityError: #aynı gün başka bir worker da aynı anda eklendi
+        pass
+
+
+def record_snapshot(counts=None, day=None):
+    """Günün satırını yaz ya da güncelle (gün içindeki son değer kalır)"""
+    counts = counts if counts is not None else compute_stats()
+    day = day or date.today()
+    table = StatsSnapshot.__table__
+    values = {name: counts[name] for name in STATS}
+    values['recorded_at'] = datetime.utcnow()
+    #ayrı bağlantı: panel isteğinin oturumunu commit etmeden yazılır
+    with db.engine.begin() as connection:
+        updated = connection.execute(table.update().where(table.c.day == day).values(values)).rowcount
+    if not updated:
+        _insert_snapshot(counts, day)
+
+
+def stats_history(days=30):
+    """Son günlerin kayıtları (eskiden yeniye)"""
+    since = date.today() - timedelta(days=days)
+    return StatsSnapshot.query.filter(StatsSnapshot.day >= since).order_by(StatsSnapshot.day.asc()).all()
+
+
+def stats_trends(counts):
+    """Sayıların STATS_TREND_DAYS gün önceki (yoksa o aralıktaki en eski) kayda göre değişimi"""
+    since = date.today() - timedelta(days=current_app.config['STATS_TREND_DAYS'])
+    baseline = (
+        StatsSnapshot.query
+        .filter(StatsSnapshot.day >= since, StatsSnapshot.day < date.today())
+        .order_by(StatsSnapshot.day.asc())
+        .first()
+    )
+    if baseline is None:
+        return {}
+    return {name: counts[name] - getattr(baseline, name) for name in STATS}
+
+
+# --- Geçersiz kılma: değişiklik commit edilince önbellek düşürülür ---
+
+def _mark(mapper, connection, instance):
+    session = object_session(instance)
+    if session is not None:
+        session.info['stats_changed'] = True
+
+
+def _make_update_listener(column):
+    def listener(mapper, connection, instance):
+        if inspect(instance).attrs[column].history.has_changes():
+            _mark(mapper, connection, instance)
+    return listener
+
+
+def _after_commit(session):
+    if session.info.pop('stats_changed', False) and has_app_context() and 'stats' in current_app.extensions:
+        invalidate_stats()
+
+
+def _after_rollback(session):
+    session.info.pop('stats_changed', None)
+
+
+def _register_listeners():
+    if event.contains(Session, 'after_commit', _after_commit): #create_app birden fazla çağrılırsa tekrar bağlama
+        return
+    for model in {model for model, *_ in STATS.values()}:
+        event.listen(model, 'after_insert', _mark)
+        event.listen(model, 'after_delete', _mark)
+    for model, column in TRACKED_UPDATES.items():
+        event.listen(model, 'after_update', _make_update_listener(column))
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
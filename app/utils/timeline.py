@@ -0,0 +1,164 @@
+#timeline.py takip edilen yazarların yazıları (home feed)
+#Fan-out-on-write: yazı yayınlanınca takipçilerin timeline_entries satırları tek bir INSERT ... SELECT ile eklenir.
+#Takipçi sayısı TIMELINE_FANOUT_LIMIT ve üzerindeki yazarlar için yazma yapılmaz; onların yazıları okuma
+#sırasında (fan-out-on-read) feed ile birleştirilir. Feed (created_at, post_id) cursor u ile sayfalanır.
+from flask import current_app
+from sqlalchemy import event, exists, inspect, literal, select
+from sqlalchemy.orm import joinedload
+from app import db
+from app.models import User, Post, Follow, TimelineEntry
+from app.utils.pagination import CursorPage, encode_cursor, older_than
+
+entries = TimelineEntry.__table__
+
+
+def _is_high_fanout(connection, author_id):
+    """Çok takipçili yazar mı? (yazılarını takipçilere kopyalamak yerine okurken getir)"""
+    followers = connection.execute(
+        select(User.__table__.c.followers_count).where(User.__table__.c.id == author_id)
+    ).scalar()
+    return (followers or 0) >= current_app.config['TIMELINE_FANOUT_LIMIT']
+
+
+def fan_out_post(connection, post):
+    """Yayınlanan yazıyı tüm takipçilerin feed ine ekle"""
+    if _is_high_fanout(connection, post.user_id):
+        return
+    follows = Follow.__table__
+    connection.execute(entries.insert().from_select(
+        ['user_id', 'post_id', 'author_id', 'created_at'],
+        select(follows.c.follower_id, literal(post.id), literal(post.user_id), literal(post.created_at))
+        .where(follows.c.followed_id == post.user_id)
+    ))
+
+
+def backfill_follow(connection, follower_id, author_id):
+    """Yeni takip edilen yazarın son yazılarını takipçinin feed ine ekle"""
+    if _is_high_fanout(connection, author_id):
+        return
+    posts = Post.__table__
+    already = exists().where(entries.c.user_id == follower_id, entries.c.post_id == posts.c.id)
+    connection.execute(entries.insert().from_select(
+        ['user_id', 'post_id', 'author_id', 'created_at'],
+        select(literal(follower_id), posts.c.id, posts.c.user_id, posts.c.created_at)
+        .where(posts.c.user_id == author_id, posts.c.is_published == True, ~already)
+        .order_by(posts.c.created_at.desc())
+        .limit(current_app.config['TIMELINE_BACKFILL'])
+    ))
+
+
+def timeline_page(user, cursor=None, per_page=6):
+    """Kullanıcının feed inden bir sayfa: hazır satırlar + çok takipçili yazarların yazıları birleştirilir"""
+    limit = per_page + 1 #bir fazlası: sonraki sayfa var mı
+
+    stored = db.session.query(TimelineEntry.post_id, TimelineEntry.created_at).filter(
+        TimelineEntry.user_id == user.id
+    )
+    if cursor:
+        stored = stored.filter(older_than(TimelineEntry.created_at, TimelineEntry.post_id, cursor))
+    stored = stored.order_by(TimelineEntry.created_at.desc(), TimelineEntry.post_id.desc()).limit(limit)
+
+    high_fanout_authors = select(Follow.followed_id).join(User, User.id == Follow.followed_id).where(
+        Follow.follower_id == user.id,
+        User.followers_count >= current_app.config['TIMELINE_FANOUT_LIMIT'],
+    )
+    pulled = db.session.query(Post.id, Post.created_at).filter(
+        Post.user_id.in_(high_fanout_authors),
+        Post.is_published == True,
+    )
+    if cursor:
+        pulled = pulled.filter(older_than(Post.created_at, Post.id, cursor))
+    pulled = pulled.order_by(Post.created_at.desc(), Post.id.desc()).limit(limit)
+
+    keys = {}
+    for post_id, created_at in list(stored) + list(pulled): #aynı yazı iki yoldan da gelebilir (eşik sonradan aşıldıysa)
+        keys[post_id] = created_at
+    ordered = sorted(keys.items(), key=lambda item: (item[1], item[0]), reverse=True)[:limit]
+    page_keys = ordered[:per_page]
+
+    posts_by_id = {
+        post.id: post for post in Post.query.options(joinedload(Post.author)).filter(
+            Post.id.in_([post_id for post_id, _ in page_keys]),
+            Post.is_published == True,
+        )
+    }
+    items = [posts_by_id[post_id] for post_id, _ in page_keys if post_id in posts_by_id]
+
+    next_cursor = None
+    if len(ordered) > per_page:
+        last_id, last_created = page_keys[-1]
+        next_cursor = encode_cursor(last_created, last_id)
+    return CursorPage(items, next_cursor=next_cursor)
+
+
+def rebuild_timelines(batch_size=500):
+    """Tüm feed leri takip ve yazı tablolarından yeniden üret (takipçi id sine göre parça parça)"""
+    limit = current_app.config['TIMELINE_FANOUT_LIMIT']
+    follows, posts, users = Follow.__table__, Post.__table__, User.__table__
+    db.session.execute(entries.delete())
+    db.session.commit()
+
+    last_id = 0
+    total = 0
+    while True:
+        follower_ids = [row[0] for row in db.session.execute(
+            select(follows.c.follower_id).where(follows.c.follower_id > last_id)
+            .group_by(follows.c.follower_id).order_by(follows.c.follower_id).limit(batch_size)
+        )]
+        if not follower_ids:
+            break
+        last_id = follower_ids[-1]
+        result = db.session.execute(entries.insert().from_select(
+            ['user_id', 'post_id', 'author_id', 'created_at'],
+            select(follows.c.follower_id, posts.c.id, posts.c.user_id, posts.c.created_at)
+            .join(posts, posts.c.user_id == follows.c.followed_id)
+            .join(users, users.c.id == follows.c.followed_id)
+            .where(follows.c.follower_id.in_(follower_ids),
+                   posts.c.is_published == True,
+                   users.c.followers_count < limit)
+        ))
+        db.session.commit()
+        total += result.rowcount or 0
+    return total
+
+
+# --- Olaylar: yazı yayınlama/silme ve takip/takipten çıkma feed leri günceller ---
+
+def _post_inserted(mapper, connection, post):
+    if post.is_published:
+        fan_out_post(connection, post)
+
+
+def _post_updated(mapper, connection, post):
+    history = inspect(post).attrs.is_published.history
+    if not history.has_changes():
+        return
+    if post.is_published: #taslak yayınlandı
+        fan_out_post(connection, post)
+    else: #yayından kaldırıldı
+        connection.execute(entries.delete().where(entries.c.post_id == post.id))
+
+
+def _post_deleted(mapper, connection, post):
+    connection.execute(entries.delete().where(entries.c.post_id == post.id))
+
+
+def _follow_inserted(mapper, connection, follow):
+    backfill_follow(connection, follow.follower_id, follow.followed_id)
+
+
+def _follow_deleted(mapper, connection, follow):
+    connection.execute(entries.delete().where(
+        entries.c.user_id == follow.follower_id,
+        entries.c.author_id == follow.followed_id,
+    ))
+
+
+def register_timeline_listeners():
+    if event.contains(Post, 'after_insert', _post_inserted):
+        return
+    event.listen(Post, 'after_insert', _post_inserted)
+    event.listen(Post, 'after_update', _post_updated)
+    event.listen(Post, 'after_delete', _post_deleted)
+    event.listen(Follow, 'after_insert', _follow_inserted)
+    event.listen(Follow, 'after_delete', _follow_deleted)
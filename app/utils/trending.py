@@ -0,0 +1,165 @@
+#trending.py popüler yazılar için zamanla sönen trend puanı
+#Her etkileşim (görüntülenme, beğeni, yorum) ağırlığıyla puana eklenir ve puan TRENDING_HALF_LIFE_HOURS saatte yarıya iner.
+#Puan log2 ölçeğinde ve sönme zamana gömülü saklanır: bir etkileşimin katkısı log2(ağırlık) + zaman / yarılanma süresi.
+#Sönme tüm yazılar için aynı oranda olduğundan sıralama değişmez; her turda tüm satırları güncellemek gerekmez,
+#sadece sayaçları değişen yazıların puanı artar (şu anki değer: 2 ** (puan - şimdi / yarılanma)).
+#Arka plan thread i TRENDING_INTERVAL saniyede bir sayaçları trending_scores taki son değerlerle karşılaştırır; ana sayfa ve
+#admin paneli sadece indeksli puan kolonundan ilk N yazıyı okur. Aralık 0 ise thread çalışmaz (flask update-trending ile cron).
+import atexit
+import math
+import os
+import threading
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import bindparam, func, or_, select
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import Post, TrendingScore
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _log2_add(a, b):
+    """log2(2**a + 2**b) taşmadan"""
+    if a is None:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def _half_lives(moment, half_life):
+    #zamanın yarılanma süresi cinsinden değeri
+    return (moment - _EPOCH).total_seconds() / half_life
+
+
+def _settings():
+    config = current_app.config
+    return {
+        'half_life': config['TRENDING_HALF_LIFE_HOURS'] * 3600,
+        'views': config['TRENDING_VIEW_WEIGHT'],
+        'likes': config['TRENDING_LIKE_WEIGHT'],
+        'comments': config['TRENDING_COMMENT_WEIGHT'],
+    }
+
+
+def current_score(score, now=None):
+    """Saklanan puanın şu anki (sönmüş) değeri"""
+    if score is None:
+        return 0.0
+    half_life = current_app.config['TRENDING_HALF_LIFE_HOURS'] * 3600
+    return 2 ** (score - _half_lives(now or datetime.utcnow(), half_life))
+
+
+def update_trending(now=None):
+    """Sayaçları değişen yayınlanmış yazıların puanlarını güncelle; güncellenen yazı sayısı"""
+    settings = _settings()
+    now = now or datetime.utcnow()
+    posts, scores = Post.__table__, TrendingScore.__table__
+    views = func.coalesce(posts.c.views, 0)
+    inserts, updates = [], []
+    with db.engine.begin() as connection:
+        rows = connection.execute(
+            select(posts.c.id, views.label('views'), posts.c.likes_count, posts.c.comments_count, posts.c.created_at,
+                   scores.c.post_id.label('scored'), scores.c.score,
+                   scores.c.views_seen, scores.c.likes_seen, scores.c.comments_seen)
+            .select_from(posts.outerjoin(scores, scores.c.post_id == posts.c.id))
+            .where(posts.c.is_published == True, or_(
+                scores.c.post_id.is_(None),
+                views != scores.c.views_seen,
+                posts.c.likes_count != scores.c.likes_seen,
+                posts.c.comments_count != scores.c.comments_seen,
+            ))
+        )
+        for row in rows:
+            if row.scored is None:
+                #ilk kez görülen yazı: geçmiş etkileşimler yazının yayın zamanına yazılır (eski yazılar sönmüş başlar)
+                activity = settings['views'] * row.views + settings['likes'] * row.likes_count \
+                    + settings['comments'] * row.comments_count
+                at = row.created_at or now
+                score = math.log2(activity) + _half_lives(at, settings['half_life']) if activity > 0 else None
+                inserts.append({'post_id': row.id, 'score': score, 'views_seen': row.views,
+                                'likes_seen': row.likes_count, 'comments_seen': row.comments_count, 'updated_at': now})
+                continue
+            #son turdan bu yana olan etkileşimler şimdiye yazılır (geri alınan beğeni puanı düşürmez)
+            activity = settings['views'] * max(row.views - row.views_seen, 0) \
+                + settings['likes'] * max(row.likes_count - row.likes_seen, 0) \
+                + settings['comments'] * max(row.comments_count - row.comments_seen, 0)
+            score = row.score
+            if activity > 0:
+                score = _log2_add(score, math.log2(activity) + _half_lives(now, settings['half_life']))
+            updates.append({'b_post_id': row.id, 'b_score': score, 'b_views': row.views, 'b_likes': row.likes_count,
+                            'b_comments': row.comments_count, 'b_updated_at': now, 'b_old_views': row.views_seen,
+                            'b_old_likes': row.likes_seen, 'b_old_comments': row.comments_seen})
+        if updates:
+            #sayaçlar okunduğumuz değerdeyse yaz: aynı anda başka bir worker işlediyse etkileşim iki kez sayılmaz
+            connection.execute(
+                scores.update()
+                .where(scores.c.post_id == bindparam('b_post_id'),
+                       scores.c.views_seen == bindparam('b_old_views'),
+                       scores.c.likes_seen == bindparam('b_old_likes'),
+                       scores.c.comments_seen == bindparam('b_old_comments'))
+                .values(score=bindparam('b_score'), views_seen=bindparam('b_views'),
+                        likes_seen=bindparam('b_likes'), comments_seen=bindparam('b_comments'),
+                        updated_at=bindparam('b_updated_at')),
+                updates,
+            )
+    if inserts:
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(scores.insert(), inserts)
+        except IntegrityError: #başka bir worker aynı yazıları aynı anda ekledi (aynı değerlerle)
+            inserts = []
+    return len(updates) + len(inserts)
+
+
+def trending_posts(limit=None, options=()):
+    """Trend puanına göre ilk yayınlanmış yazılar (önceden hesaplanmış, indeksli kolondan)"""
+    current_app.extensions['trending'].ensure_worker()
+    return (
+        Post.query.options(*options)
+        .join(TrendingScore, TrendingScore.post_id == Post.id)
+        .filter(Post.is_published == True, TrendingScore.score.isnot(None))
+        .order_by(TrendingScore.score.desc())
+        .limit(limit or current_app.config['TRENDING_SHOWN'])
+        .all()
+    )
+
+
+class TrendingJob:
+    """Worker (process) başına periyodik trend hesaplama thread i"""
+
+    def __init__(self, app, interval):
+        self.app = app
+        self.interval = interval #saniye; 0 veya altı: thread yok (cron ile flask update-trending)
+        self._lock = threading.Lock()
+        self._pid = None #fork sonrası (gunicorn worker) thread i yeniden başlatmak için
+
+    def ensure_worker(self):
+        if self.interval <= 0 or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            thread = threading.Thread(target=self._run, name='trending', daemon=True)
+            thread.start()
+
+    def run_once(self):
+        with self.app.app_context():
+            return update_trending()
+
+    def _run(self):
+        stopped = threading.Event()
+        atexit.register(stopped.set)
+        while not stopped.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                self.app.logger.exception('Trend puanları güncellenemedi')
+            stopped.wait(self.interval)
+
+
+def init_trending(app):
+    app.extensions['trending'] = TrendingJob(app, interval=app.config['TRENDING_INTERVAL'])
+    #yazı silinince puan satırını vt siler (trending_scores.post_id ON DELETE CASCADE)
+
@@ -0,0 +1,210 @@
+#uploads.py içerik adresli (content-addressed) yükleme deposu
+#Dosya adı içeriğin sha256 özetidir: <özet>.<uzantı>. Aynı resim kaç kez yüklenirse yüklensin diske bir kez yazılır
+#ve bir kez işlenir. Özetlenen ham yükleme değil, metadata sı atılarak yeniden kodlanmış halidir (images.sanitize_upload):
+#herkese açık servis edilen dosyada EXIF/GPS kalmaz. Dosyalar uploads/<ab>/<cd>/<özet>.<uzantı> altında tutulur
+#(tek klasörde binlerce dosya olmasın).
+#stored_files.refcount dosyayı kullanan yazı/kullanıcı sayısıdır; Post.image / User.avatar değişince olaylarla güncellenir.
+#refcount u 0 olan dosyalar UPLOAD_GC_GRACE saniye sonra gc-uploads komutuyla silinir.
+#İçerik değişmediği için bu dosyalar uzun süreli (immutable) önbellek başlığıyla servis edilir.
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+from collections import Counter
+from datetime import datetime, timedelta
+from flask import current_app, request
+from sqlalchemy import event, func, inspect, select, union_all
+from sqlalchemy.exc import IntegrityError
+
+_HASHED_NAME = re.compile(r'^([0-9a-f]{2})([0-9a-f]{2})[0-9a-f]{60}\.[a-z0-9]+$')
+#sadece orijinaller: varyantlar (uploads/variants/...) process-images --force ile aynı yola yeniden yazılabilir
+_HASHED_PATH = re.compile(r'^/static/uploads/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.[a-z0-9]+$')
+
+_CHUNK = 64 * 1024
+
+
+def is_hashed(name):
+    return bool(name and _HASHED_NAME.match(name))
+
+
+def storage_path(name):
+    """uploads klasörüne göre dosya yolu. İçerik adresli adlar parçalı klasörde, eski adlar olduğu gibi"""
+    match = _HASHED_NAME.match(name)
+    if not match:
+        return name #eski yüklemeler (zaman damgalı ad) uploads/ altında
+    return os.path.join(match.group(1), match.group(2), name)
+
+
+def store_upload(stream, extension):
+    """Dosya içeriğini (stream) özetini hesaplayarak kaydet; aynısı varsa tekrar yazma. (ad, yeni mi) döndürür"""
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    os.makedirs(upload_folder, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    #özet yazarken hesaplanır: içerik ikinci kez okunmaz
+    fd, tmp_path = tempfile.mkstemp(dir=upload_folder, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            while True:
+                chunk = stream.read(_CHUNK)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                tmp.write(chunk)
+                size += len(chunk)
+        name = f'{digest.hexdigest()}.{extension}'
+        path = os.path.join(upload_folder, storage_path(name))
+        created = not os.path.exists(path)
+        if created:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    _register(name, size)
+    return name, created
+
+
+def _register(name, size):
+    """stored_files satırını ekle ya da son görülme zamanını yenile (GC yeni yüklenmiş dosyayı silmesin)"""
+    from app import db
+    from app.models import StoredFile
+    table = StoredFile.__table__
+    now = datetime.utcnow()
+    #ayrı bağlantı: dosya diskte olduğu sürece satır da olmalı (istek sonradan geri alınsa bile GC bulabilsin)
+    with db.engine.begin() as connection:
+        updated = connection.execute(
+            table.update().where(table.c.name == name).values(last_seen_at=now)
+        ).rowcount
+    if updated:
+        return
+    try:
+        with db.engine.begin() as connection:
+            connection.execute(table.insert().values(name=name, size=size, refcount=0, last_seen_at=now))
+    except IntegrityError: #aynı dosya başka bir istekte aynı anda eklendi
+        pass
+
+
+# --- Referans sayımı: Post.image ve User.avatar değişince ---
+
+def _bump(connection, name, delta):
+    if not is_hashed(name):
+        return #eski yüklemeler ve varsayılan avatar sayılmaz
+    from app.models import StoredFile
+    table = StoredFile.__table__
+    connection.execute(
+        table.update().where(table.c.name == name).values(refcount=table.c.refcount + delta)
+    )
+
+
+def release_references(connection, names):
+    """Olay tetiklemeden toplu silinen satırların dosya referanslarını düşür (app/utils/purge.py)"""
+    for name, count in Counter(name for name in names if name).items():
+        _bump(connection, name, -count)
+
+
+def _make_listeners(column):
+    def inserted(mapper, connection, instance):
+        _bump(connection, getattr(instance, column), 1)
+
+    def updated(mapper, connection, instance):
+        history = inspect(instance).attrs[column].history
+        if not history.has_changes():
+            return
+        for name in history.deleted:
+            _bump(connection, name, -1)
+        for name in history.added:
+            _bump(connection, name, 1)
+
+    def deleted(mapper, connection, instance):
+        _bump(connection, getattr(instance, column), -1)
+
+    return inserted, updated, deleted
+
+
+def _reference_columns():
+    from app.models import Post, User
+    return [(Post, 'image'), (User, 'avatar')]
+
+
+def register_upload_listeners():
+    for model, column in _reference_columns():
+        if getattr(model, '_upload_listeners', False): #create_app birden fazla çağrılırsa tekrar bağlama
+            continue
+        inserted, updated, deleted = _make_listeners(column)
+        event.listen(model, 'after_insert', inserted)
+        event.listen(model, 'after_update', updated)
+        event.listen(model, 'after_delete', deleted)
+        model._upload_listeners = True
+
+
+def recount_references():
+    """refcount ları yazı/kullanıcı tablolarından tek UPDATE ile yeniden hesapla"""
+    from app import db
+    from app.models import StoredFile
+    table = StoredFile.__table__
+    references = union_all(*[
+        select(model.__table__.c[column].label('name')) for model, column in _reference_columns()
+    ]).subquery()
+    db.session.execute(table.update().values(
+        refcount=select(func.count()).select_from(references)
+        .where(references.c.name == table.c.name).scalar_subquery()
+    ))
+    db.session.commit()
+
+
+def collect_garbage(batch_size=500, dry_run=False):
+    """Kullanılmayan (refcount = 0) ve bekleme süresi geçmiş dosyaları sil; silinen dosya sayısını döndürür"""
+    from app import db
+    from app.models import StoredFile
+    table = StoredFile.__table__
+    cutoff = datetime.utcnow() - timedelta(seconds=current_app.config['UPLOAD_GC_GRACE'])
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    removed = 0
+    last_name = ''
+    while True:
+        names = db.session.execute(
+            select(table.c.name)
+            .where(table.c.refcount <= 0, table.c.last_seen_at < cutoff, table.c.name > last_name)
+            .order_by(table.c.name).limit(batch_size)
+        ).scalars().all()
+        if not names:
+            break
+        last_name = names[-1]
+        for name in names:
+            if dry_run:
+                removed += 1
+                continue
+            #koşul tekrar kontrol edilir: bu arada yeniden yüklendiyse/kullanıldıysa silinmez
+            deleted = db.session.execute(table.delete().where(
+                table.c.name == name, table.c.refcount <= 0, table.c.last_seen_at < cutoff
+            )).rowcount
+            db.session.commit()
+            if not deleted:
+                continue
+            path = storage_path(name)
+            try:
+                os.remove(os.path.join(upload_folder, path))
+            except FileNotFoundError:
+                pass
+            shutil.rmtree(os.path.join(upload_folder, 'variants', os.path.splitext(path)[0]), ignore_errors=True)
+            removed += 1
+    return removed
+
+
+# --- Uzun süreli önbellek ---
+
+def _immutable_cache(response):
+    #içerik adresli dosyanın içeriği asla değişmez: tarayıcı/CDN bir yıl boyunca tekrar sormasın
+    if request.endpoint == 'static' and response.status_code in (200, 304) and _HASHED_PATH.match(request.path):
+        response.cache_control.no_cache = None #flask static varsayılanı (SEND_FILE_MAX_AGE_DEFAULT yoksa)
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    return response
+
+
+def init_uploads(app):
+    register_upload_listeners()
+    app.after_request(_immutable_cache)
@@ -0,0 +1,128 @@
+#user_cache.py flask-login user_loader için süreç içi kısa süreli kullanıcı önbelleği
+#Giriş yapmış her istekte users tablosuna birincil anahtar sorgusu atılmaz: kullanıcının kolon değerleri
+#USER_CACHE_TTL saniye saklanır ve istek oturumuna sorgusuz eklenir (merge(load=False)).
+#users.version satır her ORM güncellemesinde artar; oturum (cookie) hangi sürümü gördüğünü tutar. Önbellekteki kayıt
+#sadece sürüm oturumdakiyle aynıysa kullanılır. Kullanıcı kendi satırını değiştirince oturumdaki sürüm de güncellenir,
+#böylece diğer worker lar eski kaydı kullanmaz. Başkası değiştirince (admin yetkisi, silme) bu worker hemen,
+#diğerleri en geç USER_CACHE_TTL saniye sonra görür.
+#Sayaç kolonları saklanmaz (sürümü artırmayan toplu UPDATE lerle değişirler), gerektiğinde vt den okunur.
+import time
+from flask import current_app, has_app_context, has_request_context, session
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+from sqlalchemy.orm.attributes import set_committed_value
+from app import db
+from app.models import User
+from app.utils.markdown_render import LRUCache
+
+SESSION_KEY = '_user_version'
+
+
+class UserCache:
+    """user id -> (sürüm, kolon değerleri, bitiş zamanı)"""
+
+    def __init__(self, maxsize, ttl):
+        self.ttl = ttl #saniye; 0: önbellek kapalı
+        self._entries = LRUCache(maxsize)
+
+    def get(self, user_id, version):
+        entry = self._entries.get(user_id)
+        if entry is None or version is None:
+            return None
+        entry_version, values, expires = entry
+        if entry_version != version or time.monotonic() >= expires:
+            return None
+        return values
+
+    def set(self, user, values):
+        if self.ttl > 0:
+            self._entries.set(user.id, (user.version, values, time.monotonic() + self.ttl))
+
+    def discard(self, user_id):
+        self._entries.discard(user_id)
+
+
+def _columns():
+    return [attr.key for attr in inspect(User).column_attrs]
+
+
+def _cached_columns():
+    #sayaç kolonları (posts_count, followers_count ...) saklanmaz: counters.py onları sürümü artırmayan toplu UPDATE
+    #lerle değiştirir. Önbellekten gelen kullanıcıda yüklenmemiş kalırlar, erişilirse tek sorguyla vt den okunur.
+    from app.utils.counters import COUNTER_RULES
+    counters = {column for rules in COUNTER_RULES.values() for target, _, column in rules if target is User}
+    return [key for key in _columns() if key not in counters]
+
+
+def _attach(values):
+    #önbellekteki değerlerden sorgusuz, oturuma bağlı bir User üret
+    user = User.__mapper__.class_manager.new_instance()
+    for key, value in values.items():
+        set_committed_value(user, key, value)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+
+def load_user(user_id):
+    """user_loader: önbellekte oturumdaki sürümle kayıt varsa sorgusuz, yoksa vt den yükle"""
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+    cache = current_app.extensions['user_cache']
+    values = cache.get(user_id, session.get(SESSION_KEY))
+    if values is not None:
+        return _attach(values) if values['deleted_at'] is None else None
+    user = db.session.get(User, user_id)
+    if user is None or user.deleted_at is not None: #silinmek üzere işaretlenmiş: oturum da kapanır
+        return None
+    cache.set(user, {key: getattr(user, key) for key in _cached_columns()})
+    if session.get(SESSION_KEY) != user.version: #oturum vt deki güncel sürümü görsün
+        session[SESSION_KEY] = user.version
+    return user
+
+
+# --- Sürüm ve geçersiz kılma ---
+
+def _columns_changed(user):
+    #sadece kolon değişikliği sayılır (ilişki koleksiyonu değişimi satırı güncellemez)
+    state = inspect(user)
+    return any(state.attrs[key].history.has_changes() for key in _columns() if key != 'version')
+
+
+def _bump_version(mapper, connection, user):
+    if _columns_changed(user):
+        user.version = (user.version or 0) + 1
+
+
+def _mark(mapper, connection, user):
+    object_session(user).info.setdefault('changed_users', set()).add(user.id)
+    if has_request_context() and session.get('_user_id') == str(user.id): #kendi satırı: oturumdaki sürüm de ilerlesin
+        session[SESSION_KEY] = user.version
+
+
+def _after_commit(session_):
+    user_ids = session_.info.pop('changed_users', None)
+    if user_ids and has_app_context() and 'user_cache' in current_app.extensions:
+        cache = current_app.extensions['user_cache']
+        for user_id in user_ids:
+            cache.discard(user_id)
+
+
+def _after_rollback(session_):
+    session_.info.pop('changed_users', None)
+
+
+def _register_listeners():
+    if event.contains(User, 'before_update', _bump_version): #create_app birden fazla çağrılırsa tekrar bağlama
+        return
+    event.listen(User, 'before_update', _bump_version)
+    event.listen(User, 'after_update', _mark)
+    event.listen(User, 'after_delete', _mark)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
+
+
+def init_user_cache(app):
+    app.extensions['user_cache'] = UserCache(app.config['USER_CACHE_SIZE'], app.config['USER_CACHE_TTL'])
+    _register_listeners()
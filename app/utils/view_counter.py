@@ -0,0 +1,119 @@
+#view_counter.py yazı görüntülenmelerini bellekte toplayıp periyodik olarak tek bir toplu UPDATE ile yazar
+#Detay sayfası artık her görüntülemede commit yapmaz. Çökme durumunda en fazla VIEW_FLUSH_INTERVAL
+#saniyelik (veya VIEW_FLUSH_MAX_PENDING adet) görüntülenme kaybolur; normal kapanışta atexit ile yazılır.
+import atexit
+import os
+import threading
+from collections import defaultdict
+from flask import current_app
+from sqlalchemy import bindparam
+
+
+class ViewCounter:
+    """Worker (process) başına görüntülenme tamponu ve arka plan yazıcı thread i"""
+
+    def __init__(self, app, interval, max_pending):
+        self.app = app
+        self.interval = interval #saniye; 0 veya altı: her görüntülemede hemen yaz (testler için)
+        self.max_pending = max_pending #bu kadar görüntülenme birikirse süreyi beklemeden yaz
+        self._counts = defaultdict(int)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pid = None #fork sonrası (gunicorn worker) thread i yeniden başlatmak için
+
+    def record(self, post_id):
+        if self.interval <= 0:
+            self._add({post_id: 1})
+            self.flush()
+            return
+        self._ensure_worker()
+        self._add({post_id: 1})
+        if self._pending >= self.max_pending:
+            self._wakeup.set()
+
+    def pending(self, post_id):
+        """Henüz vt ye yazılmamış görüntülenme sayısı"""
+        with self._lock:
+            return self._counts.get(post_id, 0)
+
+    def _add(self, counts):
+        with self._lock:
+            for post_id, n in counts.items():
+                self._counts[post_id] += n
+                self._pending += n
+
+    def _take(self):
+        with self._lock:
+            counts, self._counts = self._counts, defaultdict(int)
+            self._pending = 0
+        return counts
+
+    def flush(self):
+        """Biriken görüntülenmeleri tek bir executemany UPDATE ile yaz: views = views + n"""
+        counts = self._take()
+        if not counts:
+            return 0
+        from app import db
+        from app.models import Post
+        table = Post.__table__
+        statement = (
+            table.update()
+            .where(table.c.id == bindparam('post_id'))
+            .values(views=table.c.views + bindparam('n'),
+                    updated_at=table.c.updated_at) #görüntülenme yazının düzenlenmesi sayılmaz
+        )
+        params = [{'post_id': post_id, 'n': n} for post_id, n in counts.items()]
+        try:
+            with self.app.app_context():
+                with db.engine.begin() as connection:
+                    connection.execute(statement, params)
+        except Exception:
+            self._add(counts) #yazılamadıysa tampona geri koy, bir sonraki turda tekrar denenir
+            raise
+        return len(params)
+
+    def _ensure_worker(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None: #fork edilmiş process: ebeveynin tamponu burada yazılmamalı
+                self._counts, self._pending = defaultdict(int), 0
+            self._pid = os.getpid()
+            thread = threading.Thread(target=self._run, name='view-counter-flush', daemon=True)
+            thread.start()
+            atexit.register(self._flush_on_exit)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                self.app.logger.exception('Görüntülenme sayıları yazılamadı')
+
+    def _flush_on_exit(self):
+        try:
+            self.flush()
+        except Exception:
+            self.app.logger.exception('Kapanışta görüntülenme sayıları yazılamadı')
+
+
+def init_view_counter(app):
+    app.extensions['view_counter'] = ViewCounter(
+        app,
+        interval=app.config['VIEW_FLUSH_INTERVAL'],
+        max_pending=app.config['VIEW_FLUSH_MAX_PENDING'],
+    )
+
+
+def record_view(post_id):
+    """Görüntülenmeyi tampona ekle (vt ye yazmaz)"""
+    current_app.extensions['view_counter'].record(post_id)
+
+
+def flush_views():
+    return current_app.extensions['view_counter'].flush()
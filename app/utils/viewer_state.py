@@ -0,0 +1,77 @@
+#viewer_state.py giriş yapmış kullanıcının listelenen yazı/kullanıcılar için beğeni, kayıt ve takip durumu
+#Şablonlar her öğe için ayrı SELECT çalıştırmak yerine viewer.liked(post) gibi küme aramaları yapar.
+#Route lar listedeki id leri önceden yükler (ilişki başına tek sorgu); yüklenmemiş bir id sorulursa sadece onun
+#için sorgu çalışır. Sonuçlar istek boyunca flask.g üzerinde saklanır.
+from flask import g
+from flask_login import current_user
+from sqlalchemy import select
+from app import db
+from app.models import Like, Bookmark, Follow
+
+# durum adı: (model, sahibin kolonu, hedef kolonu)
+RELATIONS = {
+    'liked': (Like, 'user_id', 'post_id'),
+    'bookmarked': (Bookmark, 'user_id', 'post_id'),
+    'following': (Follow, 'follower_id', 'followed_id'),
+}
+
+
+def _ids(items):
+    #nesne listesi ya da id listesi kabul edilir
+    return {getattr(item, 'id', item) for item in items if item is not None}
+
+
+class ViewerState:
+    """Bir isteğin izleyici durumları: ilişki başına bakılmış id ler ve doğru olanlar"""
+
+    def __init__(self, user_id):
+        self.user_id = user_id #anonim kullanıcı için None: hiçbir sorgu çalışmaz, hepsi False
+        self._resolved = {relation: set() for relation in RELATIONS}
+        self._matches = {relation: set() for relation in RELATIONS}
+
+    def _load(self, relation, ids):
+        ids = ids - self._resolved[relation]
+        if not ids:
+            return
+        if self.user_id is not None:
+            model, owner, target = RELATIONS[relation]
+            table = model.__table__
+            self._matches[relation].update(db.session.execute(
+                select(table.c[target]).where(table.c[owner] == self.user_id, table.c[target].in_(ids))
+            ).scalars())
+        self._resolved[relation].update(ids)
+
+    def load_posts(self, posts):
+        """Yazıların beğeni ve kayıt durumlarını yükle (iki sorgu)"""
+        ids = _ids(posts)
+        self._load('liked', ids)
+        self._load('bookmarked', ids)
+        return self
+
+    def load_users(self, users):
+        """Kullanıcıların takip durumlarını yükle (tek sorgu)"""
+        self._load('following', _ids(users))
+        return self
+
+    def _check(self, relation, item):
+        item_id = getattr(item, 'id', item)
+        self._load(relation, {item_id})
+        return item_id in self._matches[relation]
+
+    def liked(self, post):
+        return self._check('liked', post)
+
+    def bookmarked(self, post):
+        return self._check('bookmarked', post)
+
+    def following(self, user):
+        if self.user_id is not None and getattr(user, 'id', user) == self.user_id:
+            return False #kendini takip edemez
+        return self._check('following', user)
+
+
+def viewer_state():
+    """İsteğin ViewerState i (ilk çağrıda oluşturulur)"""
+    if 'viewer_state' not in g:
+        g.viewer_state = ViewerState(current_user.id if current_user.is_authenticated else None)
+    return g.viewer_state
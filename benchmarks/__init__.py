@@ -0,0 +1,3 @@
+#benchmarks sıcak route lar için tekrarlanabilir yük ölçümü
+#generator.py sentetik veri üretir, drivers.py route ları test client ile çağırır, report.py gecikme/sql raporu ve
+#baseline karşılaştırması yapar. Kullanım: python -m benchmarks seed, python -m benchmarks run (README: Performans)
@@ -0,0 +1,100 @@
+#__main__.py benchmark komut satırı
+#  python -m benchmarks seed [--users N --posts N ...]    veritabanını sıfırla ve sentetik veri üret
+#  python -m benchmarks run [--requests N] [--compare]    route ları ölç, baseline ile karşılaştır (gerileme: 1, farklı ölçek: 2)
+#  python -m benchmarks run --save-baseline               sonuçları baseline olarak kaydet
+import argparse
+import os
+import sys
+from benchmarks.generator import DEFAULT_SCALE
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# veri setini tanımlayan sayılar (beğeniler benchmark sırasında değiştiği için dahil değil)
+DATASET_COUNTS = ('users', 'posts', 'drafts', 'comments', 'follows')
+
+
+def _app():
+    from app import create_app
+    return create_app('benchmarks.config.BenchmarkConfig')
+
+
+def _params(app, args):
+    #baseline yalnızca aynı veri ve istek sayısıyla karşılaştırılabilir
+    from app import db
+    from app.utils.stats import compute_stats
+    with app.app_context():
+        counts = compute_stats()
+        database = db.engine.dialect.name
+    dataset = {name: counts[name] for name in DATASET_COUNTS}
+    return {'database': database, 'dataset': dataset, 'requests': args.requests, 'warmup': args.warmup,
+            'seed': args.seed}
+
+
+def seed_command(args):
+    from benchmarks.generator import generate
+    app = _app()
+    scale = {name: getattr(args, name) for name in DEFAULT_SCALE}
+    with app.app_context():
+        counts = generate(app, scale=scale, seed=args.seed, workers=args.workers)
+    print(', '.join(f'{name}={value}' for name, value in counts.items()))
+    return 0
+
+
+def run_command(args):
+    from benchmarks.drivers import run_benchmark
+    from benchmarks.report import compare, format_table, load_baseline, params_mismatch, save_baseline, summarize
+    app = _app()
+    names = set(args.routes.split(',')) if args.routes else None
+    summary = summarize(run_benchmark(app, requests=args.requests, warmup=args.warmup, names=names, seed=args.seed))
+    print(format_table(summary))
+    params = _params(app, args)
+    if args.save_baseline:
+        save_baseline(args.baseline, summary, params)
+        print(f'Baseline kaydedildi: {args.baseline}')
+        return 0
+    if args.compare:
+        baseline = load_baseline(args.baseline)
+        mismatch = params_mismatch(baseline, params)
+        if mismatch:
+            print(f'HATA: karşılaştırılamaz, {mismatch}')
+            print('Aynı ölçekte seed edip tekrar çalıştırın ya da --save-baseline ile baseline ı yenileyin.')
+            return 2
+        regressions, warnings = compare(summary, baseline, params, tolerance=args.tolerance)
+        for warning in warnings:
+            print(f'UYARI: {warning}')
+        for regression in regressions:
+            print(f'GERİLEME: {regression}')
+        if regressions:
+            return 1
+        print('Baseline a göre gerileme yok.')
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='BlogHub yük ölçümü')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    seed = commands.add_parser('seed', help='Veritabanını sıfırla ve sentetik veri üret')
+    for name, default in DEFAULT_SCALE.items():
+        seed.add_argument(f'--{name}', type=int, default=default)
+    seed.add_argument('--seed', type=int, default=42)
+    seed.add_argument('--workers', type=int, default=None, help='Markdown render process sayısı')
+    seed.set_defaults(handler=seed_command)
+
+    run = commands.add_parser('run', help='Route ları ölç')
+    run.add_argument('--requests', type=int, default=200, help='Route başına ölçülen istek')
+    run.add_argument('--warmup', type=int, default=20, help='Route başına ölçülmeyen ısınma isteği')
+    run.add_argument('--routes', help='Virgülle ayrılmış endpoint adları (varsayılan: hepsi)')
+    run.add_argument('--seed', type=int, default=42)
+    run.add_argument('--baseline', default=BASELINE_PATH)
+    run.add_argument('--save-baseline', action='store_true')
+    run.add_argument('--compare', action='store_true')
+    run.add_argument('--tolerance', type=float, default=0.25, help='İzin verilen gecikme artışı (0.25 = %%25)')
+    run.set_defaults(handler=run_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
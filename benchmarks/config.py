@@ -0,0 +1,13 @@
+#config.py benchmark uygulamasının ayarları -- uygulama varsayılanları, ayrı bir veritabanı
+import os
+import tempfile
+from config import Config
+
+
+class BenchmarkConfig(Config):
+    # Yerel sqlite (varsayılan) veya BENCH_DATABASE_URL ile yerel postgresql -- geliştirme veritabanına dokunulmaz
+    SQLALCHEMY_DATABASE_URI = os.environ.get('BENCH_DATABASE_URL') or \
+        'sqlite:///' + os.path.join(tempfile.gettempdir(), 'bloghub-bench.db')
+    UPLOAD_FOLDER = os.path.join(tempfile.gettempdir(), 'bloghub-bench-uploads')
+    TRENDING_INTERVAL = 0 #ölçüm sırasında arka plan hesaplaması araya girmesin (seed bir kez hesaplar)
+    SQL_PROFILE_HEADERS = True #sürücüler istek başına SQL sayısını X-SQL-Count başlığından okur
@@ -0,0 +1,99 @@
+#drivers.py sıcak route ları Flask test client ile çağırır; istek başına süre ve SQL ifadesi sayısı toplanır
+#(SQL sayısı uygulamanın SQL profilinden, X-SQL-Count yanıt başlığı ile okunur -- app/utils/sql_profiler.py)
+#Her sürücü bir route u temsil eder: hangi kullanıcıyla (None: ziyaretçi) ve hangi url ile çağrılacağı.
+#Url ler seed li rastgele sayı üreteciyle seçilir, aynı veri ve seed ile aynı istek dizisi üretilir.
+import random
+import time
+from sqlalchemy import func, select
+from app import db
+from app.models import Follow, Post, User
+from benchmarks.generator import BENCH_PASSWORD
+
+
+class Driver:
+    """Bir route un benchmark tanımı"""
+
+    def __init__(self, name, path, login=None, method='GET'):
+        self.name = name #endpoint adı (rapor ve baseline anahtarı)
+        self.path = path #fonksiyon: BenchContext -> url
+        self.login = login #'reader', 'admin' veya None (giriş yapmamış ziyaretçi)
+        self.method = method
+
+
+DRIVERS = [
+    Driver('main.index', lambda ctx: '/'),
+    Driver('posts.detail', lambda ctx: f'/post/{ctx.rng.choice(ctx.post_ids)}'),
+    Driver('user.following_posts', lambda ctx: '/following', login='reader'),
+    Driver('user.followers', lambda ctx: f'/profile/{ctx.popular_author}/followers'),
+    Driver('admin.admin_dashboard', lambda ctx: '/admin/', login='admin'),
+    #aynı küçük yazı kümesinde beğen/geri al sırayla değişir, tablo büyümez
+    Driver('posts.like', lambda ctx: f'/post/{ctx.rng.choice(ctx.post_ids[:20])}/like', login='reader', method='POST'),
+    Driver('user.unread_notifications_count', lambda ctx: '/notifications/unread-count', login='reader'),
+]
+
+
+class BenchContext:
+    """Sürücülerin url seçerken kullandığı veri: yayınlanmış yazılar ve örnek kullanıcılar"""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.post_ids = [row[0] for row in db.session.execute(
+            select(Post.id).where(Post.is_published == True).order_by(Post.id)
+        )]
+        #en çok takip edilen yazar (büyük takipçi listesi) ve en çok takip eden okuyucu (dolu feed)
+        self.popular_author = db.session.execute(
+            select(User.username).order_by(User.followers_count.desc(), User.id)
+        ).scalar()
+        self.reader = db.session.execute(
+            select(User.username).join(Follow, Follow.follower_id == User.id)
+            .where(User.is_admin.is_(False)).group_by(User.id, User.username)
+            .order_by(func.count().desc(), User.id)
+        ).scalar()
+        self.admin = db.session.execute(select(User.username).where(User.is_admin.is_(True)).order_by(User.id)).scalar()
+        db.session.remove()
+
+
+def _client(app, username):
+    client = app.test_client()
+    if username:
+        response = client.post('/login', data={'username': username, 'password': BENCH_PASSWORD})
+        if response.status_code != 302:
+            raise RuntimeError(f'{username} giriş yapamadı ({response.status_code})')
+    return client
+
+
+def run_driver(app, driver, client, ctx, requests, warmup):
+    """Sürücüyü warmup + requests kez çağır: {'latencies': [...], 'statements': [...], 'errors': n, 'elapsed': s}"""
+    latencies, statements, errors = [], [], 0
+    started = time.perf_counter()
+    for i in range(warmup + requests):
+        if i == warmup:
+            started = time.perf_counter() #ısınma (önbellekler, bağlantı havuzu) sonuca girmez
+        path = driver.path(ctx)
+        before = time.perf_counter()
+        response = client.open(path, method=driver.method)
+        elapsed = time.perf_counter() - before
+        if i < warmup:
+            continue
+        latencies.append(elapsed)
+        statements.append(int(response.headers.get('X-SQL-Count', 0)))
+        if response.status_code >= 400:
+            errors += 1
+    return {'latencies': latencies, 'statements': statements, 'errors': errors,
+            'elapsed': time.perf_counter() - started}
+
+
+def run_benchmark(app, requests=200, warmup=20, names=None, seed=42):
+    """Seçilen (varsayılan: tüm) sürücüleri sırayla çalıştır: {route adı: ham ölçümler}"""
+    with app.app_context():
+        ctx = BenchContext(seed)
+    logins = {'reader': ctx.reader, 'admin': ctx.admin, None: None}
+    clients = {}
+    results = {}
+    for driver in DRIVERS:
+        if names and driver.name not in names:
+            continue
+        if driver.login not in clients:
+            clients[driver.login] = _client(app, logins[driver.login])
+        results[driver.name] = run_driver(app, driver, clients[driver.login], ctx, requests, warmup)
+    return results
@@ -0,0 +1,202 @@
+#generator.py benchmark veritabanı için sentetik veri: kullanıcılar, markdown yazılar, cevap ağaçlı yorumlar,
+#beğeniler, takipler ve bildirimler. Satırlar ORM olayları tetiklenmeden toplu INSERT ile eklenir; sayaçlar, yorum
+#ağacı, okuma süresi, html, arama indeksi, feed ler, ilgili yazılar ve trend puanları sonra bakım fonksiyonlarıyla
+#hesaplanır. Aynı seed ve ölçek aynı veriyi üretir (zamanlar üretim anına göre).
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from app import db
+from app.models import User, Post, Comment, Like, Follow, Notification
+
+BENCH_PASSWORD = 'benchmark' #tüm üretilen kullanıcıların şifresi
+
+# varsayılan ölçek (python -m benchmarks seed --users ... ile değiştirilir)
+DEFAULT_SCALE = {
+    'users': 200,
+    'posts': 1000,
+    'comments': 4000,
+    'likes': 8000,
+    'follows': 3000,
+    'notifications': 5000,
+}
+
+CATEGORIES = ['Teknoloji', 'Yazılım', 'Seyahat', 'Yemek', 'Spor', 'Kitap', 'Bilim', 'Sanat']
+
+WORDS = '''
+uygulama veri sunucu istemci sorgu tablo indeks önbellek performans ölçüm gecikme istek yanıt şablon route model
+oturum kullanıcı yazı yorum beğeni takip bildirim arama sayfa liste tarih kategori etiket resim dosya yükleme
+python flask sqlalchemy postgresql sqlite markdown html stil tasarım deneme sonuç hata çözüm yöntem örnek adım
+yolculuk şehir deniz dağ müze yemek tarif hamur fırın kahve kitap roman yazar bilim deney gözlem maç takım antrenman
+hızlı yavaş büyük küçük yeni eski basit karmaşık güzel önemli kolay zor günlük haftalık kalıcı geçici ortak özel
+'''.split()
+
+
+def _sentence(rng, low=6, high=16):
+    words = rng.choices(WORDS, k=rng.randint(low, high))
+    if rng.random() < 0.3:
+        i = rng.randrange(len(words))
+        words[i] = f'**{words[i]}**'
+    return ' '.join(words).capitalize() + '.'
+
+
+def _paragraph(rng):
+    return ' '.join(_sentence(rng) for _ in range(rng.randint(2, 6)))
+
+
+def markdown_body(rng):
+    """Başlık, paragraf, liste, kod bloğu, alıntı ve bağlantı içeren gerçekçi bir markdown gövdesi"""
+    blocks = [_paragraph(rng)]
+    for _ in range(rng.randint(2, 6)):
+        kind = rng.random()
+        if kind < 0.35:
+            blocks.append(f'## {_sentence(rng, 2, 5)[:-1]}')
+            blocks.append(_paragraph(rng))
+        elif kind < 0.55:
+            blocks.append('\n'.join(f'- {_sentence(rng, 3, 8)}' for _ in range(rng.randint(2, 5))))
+        elif kind < 0.7:
+            lines = [f'{rng.choice(WORDS)} = {rng.randint(0, 999)}' for _ in range(rng.randint(2, 6))]
+            blocks.append('```python\n' + '\n'.join(lines) + '\n```')
+        elif kind < 0.8:
+            blocks.append(f'> {_sentence(rng)}')
+        else:
+            blocks.append(f'{_sentence(rng)} [{rng.choice(WORDS)}](https://example.com/{rng.choice(WORDS)}) {_sentence(rng)}')
+    return '\n\n'.join(blocks)
+
+
+def _skewed(rng, items, k):
+    """Popülerlik dağılımı: listenin başındakiler çok daha sık seçilir (1/sıra ağırlık)"""
+    weights = [1 / (rank + 1) for rank in range(len(items))]
+    return rng.choices(items, weights=weights, k=k)
+
+
+def _insert(table, rows, batch_size):
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(table.insert(), rows[start:start + batch_size])
+    db.session.commit()
+
+
+def _ids(table, **conditions):
+    statement = select(table.c.id).order_by(table.c.id)
+    for name, value in conditions.items():
+        statement = statement.where(table.c[name] == value)
+    return [row[0] for row in db.session.execute(statement)]
+
+
+def reset_database(app):
+    """Benchmark veritabanını boşalt ve tabloları yeniden oluştur"""
+    from app.utils.search import init_search
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+    init_search(app)
+
+
+def generate(app, scale=None, seed=42, batch_size=1000, workers=None, log=print):
+    """Veritabanını sıfırla ve verilen ölçekte veri üret; eklenen satır sayıları"""
+    from app.utils.comments import backfill_comment_threads
+    from app.utils.counters import recount_counters
+    from app.utils.markdown_render import rerender_all
+    from app.utils.passwords import hash_password
+    from app.utils.reading import backfill_reading_stats
+    from app.utils.related import rebuild_related
+    from app.utils.search import rebuild_index
+    from app.utils.timeline import rebuild_timelines
+    from app.utils.trending import update_trending
+
+    scale = dict(DEFAULT_SCALE, **(scale or {}))
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    users, posts, comments = User.__table__, Post.__table__, Comment.__table__
+
+    def ago(days):
+        return now - timedelta(seconds=rng.randint(0, int(days * 86400)))
+
+    reset_database(app)
+    password_hash = hash_password(BENCH_PASSWORD) #scrypt her kullanıcı için tekrar hesaplanmasın
+
+    log(f"{scale['users']} kullanıcı")
+    _insert(users, [
+        {'username': f'user{i}', 'email': f'user{i}@example.com', 'password_hash': password_hash,
+         'bio': _sentence(rng), 'is_admin': i == 0, 'created_at': ago(365)}
+        for i in range(scale['users'])
+    ], batch_size)
+    user_ids = _ids(users)
+
+    log(f"{scale['follows']} takip")
+    follows = set()
+    while len(follows) < min(scale['follows'], len(user_ids) * (len(user_ids) - 1)):
+        follower, followed = rng.choice(user_ids), _skewed(rng, user_ids, 1)[0] #az sayıda çok takip edilen yazar
+        if follower != followed:
+            follows.add((follower, followed))
+    _insert(Follow.__table__, [
+        {'follower_id': follower, 'followed_id': followed, 'created_at': ago(180)} for follower, followed in follows
+    ], batch_size)
+
+    log(f"{scale['posts']} yazı")
+    rows = []
+    for author in _skewed(rng, user_ids, scale['posts']):
+        created = ago(180)
+        rows.append({
+            'title': _sentence(rng, 3, 9)[:-1], 'content': markdown_body(rng), 'summary': _sentence(rng)[:300],
+            'category': rng.choice(CATEGORIES), 'views': int(rng.paretovariate(1.2) * 10),
+            'is_published': rng.random() < 0.9, 'created_at': created, 'updated_at': created, 'user_id': author,
+        })
+    _insert(posts, rows, batch_size)
+    post_ids = _ids(posts, is_published=True)
+    rng.shuffle(post_ids) #popülerlik yazı id sine bağlı olmasın
+
+    log(f"{scale['comments']} yorum")
+    #seviye seviye: önce kökler, sonra bir önceki seviyedeki yorumlara cevaplar
+    levels = [0.5, 0.3, 0.15, 0.05]
+    parents = []
+    for depth, share in enumerate(levels):
+        count = int(scale['comments'] * share)
+        if depth == 0:
+            targets = [(post_id, None) for post_id in _skewed(rng, post_ids, count)]
+        elif parents:
+            targets = [rng.choice(parents) for _ in range(count)]
+        else:
+            break
+        _insert(comments, [
+            {'content': _sentence(rng), 'post_id': post_id, 'parent_id': parent_id, 'user_id': rng.choice(user_ids),
+             'depth': depth, 'created_at': ago(90)}
+            for post_id, parent_id in targets
+        ], batch_size)
+        parents = [(row.post_id, row.id) for row in db.session.execute(
+            select(comments.c.id, comments.c.post_id).where(comments.c.depth == depth)
+        )]
+
+    log(f"{scale['likes']} beğeni")
+    likes = set()
+    while len(likes) < min(scale['likes'], len(user_ids) * len(post_ids)):
+        likes.add((rng.choice(user_ids), _skewed(rng, post_ids, 1)[0]))
+    _insert(Like.__table__, [
+        {'user_id': user_id, 'post_id': post_id, 'created_at': ago(90)} for user_id, post_id in likes
+    ], batch_size)
+
+    log(f"{scale['notifications']} bildirim")
+    types = {'like': 'yazınızı beğendi', 'comment': 'yazınıza yorum yaptı', 'follow': 'sizi takip etmeye başladı'}
+    rows = []
+    for recipient in _skewed(rng, user_ids, scale['notifications']):
+        notif_type = rng.choice(list(types))
+        sender = rng.choice(user_ids)
+        rows.append({
+            'type': notif_type, 'message': f'user{sender} {types[notif_type]}', 'link': f'/post/{rng.choice(post_ids)}',
+            'is_read': rng.random() < 0.7, 'created_at': ago(30), 'user_id': recipient, 'sender_id': sender,
+        })
+    _insert(Notification.__table__, rows, batch_size)
+
+    log('sayaçlar, yorum ağacı, okuma süresi, html, arama, feed, ilgili yazılar, trend')
+    recount_counters()
+    backfill_comment_threads()
+    backfill_reading_stats(batch_size=batch_size)
+    rerender_all(workers=workers)
+    rebuild_index()
+    rebuild_timelines(batch_size=batch_size)
+    rebuild_related(batch_size=batch_size)
+    update_trending()
+    return {
+        'users': len(user_ids), 'follows': len(follows), 'posts': scale['posts'],
+        'comments': sum(int(scale['comments'] * share) for share in levels), 'likes': len(likes),
+        'notifications': scale['notifications'],
+    }
@@ -0,0 +1,95 @@
+#report.py benchmark sonuçlarının özeti (p50/p95 gecikme, istek/sn, SQL sayısı) ve kayıtlı baseline ile karşılaştırma
+#Gecikmeler makineye bağlıdır: baseline ı aynı makinede ve aynı ölçekle üretin. SQL ifadesi sayıları makineden
+#bağımsızdır, sorgu sayısındaki artış (N+1 gibi) her makinede gerileme sayılır.
+import json
+import platform
+from datetime import datetime
+
+
+def percentile(values, fraction):
+    """Doğrusal aradeğerli yüzdelik (values boş değil)"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def summarize(raw):
+    """Ham ölçümler -> {route: {'p50_ms', 'p95_ms', 'mean_ms', 'rps', 'sql_mean', 'sql_max', 'requests', 'errors'}}"""
+    summary = {}
+    for name, result in raw.items():
+        latencies, statements = result['latencies'], result['statements']
+        if not latencies:
+            continue
+        summary[name] = {
+            'requests': len(latencies),
+            'errors': result['errors'],
+            'p50_ms': round(percentile(latencies, 0.5) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+            'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2),
+            'rps': round(len(latencies) / result['elapsed'], 1) if result['elapsed'] else 0.0,
+            'sql_mean': round(sum(statements) / len(statements), 2),
+            'sql_max': max(statements),
+        }
+    return summary
+
+
+COLUMNS = [('route', 32), ('p50_ms', 9), ('p95_ms', 9), ('mean_ms', 9), ('rps', 8), ('sql_mean', 9), ('sql_max', 8),
+           ('errors', 7)]
+
+
+def format_table(summary):
+    lines = [''.join(name.ljust(width) if name == 'route' else name.rjust(width) for name, width in COLUMNS)]
+    for route, row in summary.items():
+        lines.append(''.join(
+            route.ljust(width) if name == 'route' else str(row[name]).rjust(width) for name, width in COLUMNS
+        ))
+    return '\n'.join(lines)
+
+
+def save_baseline(path, summary, params):
+    """Sonuçları ölçüm parametreleri ve makine bilgisiyle birlikte json olarak kaydet"""
+    document = {
+        'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+        'machine': {'python': platform.python_version(), 'platform': platform.platform()},
+        'params': params,
+        'routes': summary,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def params_mismatch(baseline, params):
+    """Baseline farklı veri/istek sayısıyla üretildiyse açıklaması, aynıysa None"""
+    if baseline.get('params') != params:
+        return f"ölçüm parametreleri farklı: baseline {baseline.get('params')}, şimdi {params}"
+    return None
+
+
+def compare(summary, baseline, params, tolerance=0.25, sql_tolerance=0.5):
+    """Baseline a göre gerilemeler ve uyarılar: (gerilemeler, uyarılar) -- ikisi de metin listesi"""
+    #farklı ölçekteki ölçümlerin farkı gerileme değildir: önce params_mismatch ile kontrol edilmeli
+    mismatch = params_mismatch(baseline, params)
+    if mismatch:
+        raise ValueError(mismatch)
+    regressions, warnings = [], []
+    for route, row in summary.items():
+        base = baseline['routes'].get(route)
+        if base is None:
+            warnings.append(f'{route}: baseline da yok')
+            continue
+        if row['errors']:
+            regressions.append(f"{route}: {row['errors']} hatalı yanıt")
+        if row['sql_mean'] > base['sql_mean'] + sql_tolerance:
+            regressions.append(f"{route}: SQL sayısı {base['sql_mean']} -> {row['sql_mean']}")
+        for name in ('p50_ms', 'p95_ms'):
+            if row[name] > base[name] * (1 + tolerance):
+                regressions.append(f'{route}: {name} {base[name]} -> {row[name]} (+{row[name] / base[name] - 1:.0%})')
+    return regressions, warnings
@@ -27,6 +27,25 @@ class Config:
     UPLOAD_FOLDER = 'app/static/uploads' #yüklenen resimlerin kaydedileceği klasör
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # max dosya boyutu 16MB
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'} #izin verilen dosya uzantıları
+    UPLOAD_GC_GRACE = 24 * 3600 #saniye; kullanılmayan yükleme bu süre sonra silinebilir (app/utils/uploads.py)
+    
+    # Resim varyantları (app/utils/images.py)
+    IMAGE_WORKERS = 2 #resimleri işleyen process sayısı (0: istek içinde hemen işle -- testler için)
+    IMAGE_VARIANTS = {'avatar': 256, 'card': 640, 'detail': 1200} #varyant adı: en uzun kenar (px)
+    IMAGE_QUALITY = 82 #jpeg/webp kalitesi
+    UPLOAD_QUALITY = 92 #saklanan orijinalin kalitesi (metadata sı atılarak yeniden kodlanır, varyantlar bundan üretilir)
+    IMAGE_SIZES = { #<img sizes> -- tarayıcı srcset ten bu genişliğe en uygun dosyayı seçer
+        'avatar': '96px',
+        'thumb': '96px', #küçük önizlemeler (popüler yazılar, taslaklar)
+        'card': '(max-width: 768px) 100vw, 400px',
+        'detail': '(max-width: 900px) 100vw, 900px',
+    }
+    
+    # Şifre hashleme (app/utils/passwords.py)
+    PASSWORD_HASH_METHOD = 'scrypt' #werkzeug yöntemi ('scrypt', 'scrypt:32768:8:1', 'pbkdf2:sha256' ...) -- değişince girişte yeniden hashlenir
+    PASSWORD_HASH_WORKERS = 2 #worker başına aynı anda çalışan hash (0: istek thread inde)
+    PASSWORD_HASH_QUEUE = 16 #bekleyebilecek en fazla hash; fazlası 503 ile hemen reddedilir
+    PASSWORD_HASH_TIMEOUT = 5 #saniye; sonuç bu sürede gelmezse 503
     
     # Session
     PERMANENT_SESSION_LIFETIME = timedelta(days=7) #session süresi 7 gün kullanıcı 7 gün boyunca giriş yapmış kalır 
@@ -34,7 +53,91 @@ class Config:
     SESSION_COOKIE_HTTPONLY = True #httponly js den erişilemez xss koruması
     SESSION_COOKIE_SAMESITE = 'Lax' #csrf koruması
     
+    # Markdown
+    MARKDOWN_EXTENSIONS = ['fenced_code', 'codehilite', 'tables'] #kod blokları, syntax highlighting, tablolar
+    MARKDOWN_RENDER_VERSION = 1 #render çıktısını etkileyen bir ayar değişirse artırın (saklanan html geçersiz olur)
+    MARKDOWN_CACHE_SIZE = 256 #henüz saklanmamış html ler için süreç içi LRU önbellek boyutu
+    
+    # Arama
+    SEARCH_LANGUAGE = 'turkish' #postgresql tam metin arama dil ayarı (kök bulma, stop words)
+    
+    # Görüntülenme sayacı (app/utils/view_counter.py)
+    VIEW_FLUSH_INTERVAL = 10 #saniye; biriken görüntülenmeler bu aralıkla toplu yazılır (0: hemen yaz)
+    VIEW_FLUSH_MAX_PENDING = 1000 #bu kadar görüntülenme birikirse beklemeden yaz
+    
+    # Takip feed i (app/utils/timeline.py)
+    TIMELINE_FANOUT_LIMIT = 5000 #bu kadar ve daha fazla takipçisi olan yazarların yazıları okurken birleştirilir
+    TIMELINE_BACKFILL = 50 #yeni takip edilen yazarın feed e kopyalanacak son yazı sayısı
+    
+    # Bildirim akışı (Server-Sent Events, app/utils/notify_broker.py)
+    NOTIFICATION_BROKER = 'memory' #'memory' veya 'paket.modul:Sinif' -- birden fazla process te paylaşılan bir backend kullanın
+    NOTIFICATION_STREAM_TIMEOUT = 300 #saniye; bağlantı bu süreden sonra kapanır, tarayıcı otomatik yeniden bağlanır
+    NOTIFICATION_STREAM_HEARTBEAT = 15 #saniye; proxy lerin boşta bağlantıyı kesmemesi için ping
+    NOTIFICATION_STREAM_QUEUE = 100 #bağlantı başına bekleyen en fazla mesaj
+    NOTIFICATION_POLL_INTERVAL = 30 #saniye; akış kullanılamazsa istemci bu aralıkla sorgular
+    
+    # Bildirim kuyruğu (app/utils/notifications.py)
+    NOTIFICATION_FLUSH_INTERVAL = 1 #saniye; bildirimler arka planda bu aralıkla toplu yazılır (0: istek içinde hemen yaz)
+    NOTIFICATION_BATCH_SIZE = 500 #tek INSERT teki en fazla bildirim; bu kadar birikirse beklemeden yaz
+    
+    # Admin paneli sayıları (app/utils/stats.py)
+    STATS_CACHE_TTL = 60 #saniye; sayılar bu süre saklanır (aynı worker daki değişiklikler hemen düşürür)
+    STATS_HISTORY = True #günlük sayıları stats_snapshots tablosuna yaz ve paneldeki değişimleri göster
+    STATS_TREND_DAYS = 7 #panelde kaç gün önceye göre değişim gösterilsin
+    
+    # Parça önbelleği (app/utils/fragment_cache.py) -- {% cache %} blokları ve cached() sonuçları
+    FRAGMENT_CACHE_SIZE = 512 #en fazla kayıt (LRU)
+    FRAGMENT_CACHE_TTL = 600 #saniye; süre verilmeyen kayıtlar için (ilgili model değişince zaten düşer)
+    POPULAR_POSTS_CACHE_TTL = 120 #trend puanları arka planda değişir, olay tetiklenmez -- sadece süre
+    ADMIN_WIDGET_CACHE_TTL = 60 #admin panelindeki "son ..." listeleri
+    
+    # Kullanıcı önbelleği (app/utils/user_cache.py)
+    USER_CACHE_TTL = 30 #saniye; başka worker da değişen kullanıcı (admin yetkisi, silme) en geç bu sürede görülür
+    USER_CACHE_SIZE = 10000 #worker başına en fazla kullanıcı
+    
+    # Koşullu GET (app/utils/conditional.py) -- giriş yapmamış ziyaretçilere ETag / Last-Modified, değişmediyse 304
+    CONDITIONAL_GET = True
+    CONDITIONAL_GET_WINDOW = 300 #saniye; görüntülenme sayısı/popüler yazılar 304 ile en fazla bu kadar eski kalır
+    PAGE_ETAG_VERSION = 1 #şablonlar değişince artırın (eski ETag ler geçersiz olur)
+    
+    # İlgili yazılar (app/utils/related.py) -- TF-IDF benzerliği, yazı başına önceden hesaplanmış komşular
+    RELATED_POSTS_SHOWN = 3 #detay sayfasında gösterilen
+    RELATED_POSTS_STORED = 8 #yazı başına saklanan (komşu sonradan yayından kalkarsa sıradaki gösterilir)
+    RELATED_MIN_SCORE = 0.05 #kosinüs benzerliği bunun altındaki yazılar ilgili sayılmaz
+    RELATED_TERMS_PER_POST = 40 #yazı vektöründe tutulan en ağır kelime sayısı
+    RELATED_MAX_DF = 0.5 #yazıların bu oranından fazlasında geçen kelimeler yok sayılır
+    RELATED_TITLE_WEIGHT = 3 #başlık ve kategori kelimeleri içerikteki bir kelimenin kaç katı sayılır
+    RELATED_UPDATE_INTERVAL = 5 #saniye; değişen yazılar arka planda bu aralıkla işlenir (0: commit sonrası hemen)
+    RELATED_FANOUT = 20 #değişen yazıya en benzer bu kadar yazının listesi de yeniden hesaplanır
+    
+    # Trend yazılar (app/utils/trending.py) -- ana sayfa ve admin panelindeki popüler yazılar
+    TRENDING_SHOWN = 5
+    TRENDING_HALF_LIFE_HOURS = 24 #bir etkileşimin puana katkısı bu kadar saatte yarıya iner
+    TRENDING_VIEW_WEIGHT = 1
+    TRENDING_LIKE_WEIGHT = 5
+    TRENDING_COMMENT_WEIGHT = 10
+    TRENDING_INTERVAL = 300 #saniye; puanlar arka planda bu aralıkla güncellenir (0: thread yok, cron ile flask update-trending)
+    
+    # Kullanıcı/yazı silme (app/utils/purge.py)
+    USER_DELETE_MODE = 'immediate' #'immediate': istek içinde sil, 'background': işaretle, arka planda sil (istek hemen döner)
+    PURGE_BATCH_SIZE = 500 #tek parçada (tek commit te) silinen en fazla satır
+    PURGE_INTERVAL = 60 #saniye; arka plan thread i yarıda kalmış silmeleri bu aralıkla tamamlar
+    
+    # SQL profili (app/utils/sql_profiler.py) -- istek başına ifade sayısı, vt süresi ve N+1 tespiti
+    SQL_PROFILE = True
+    SQL_PROFILE_HEADERS = None #X-SQL-* yanıt başlıkları; None: sadece debug modunda
+    SQL_PROFILE_LOG = False #her isteği json satırı olarak logla (N+1 ve yavaş istekler her zaman loglanır)
+    SQL_N_PLUS_ONE_THRESHOLD = 5 #aynı SELECT şekli bir istekte bu kadar çalışırsa N+1 sayılır
+    SQL_SLOW_REQUEST_MS = 500 #bu süreyi aşan istekler loglanır
+    
     # Sayfalama
     POSTS_PER_PAGE = 6
-    COMMENTS_PER_PAGE = 20
-    NOTIFICATIONS_PER_PAGE = 50
\ No newline at end of file
+    INDEX_PAGINATION = 'cursor' #ana sayfa/kategori listesi: 'cursor' (keyset, OFFSET yok) veya 'offset' (sayfa numaralı)
+    SEARCH_PAGINATION = 'offset' #arama sonuçları: 'offset' alaka sırasını korur, 'cursor' tarihe göre sıralar
+    INDEX_SHOW_TOTAL = False #cursor modunda toplam yazı sayısını göster (her istekte COUNT(*) çalışır)
+    FOLLOWS_PER_PAGE = 30 #takipçi/takip edilen listelerinde sayfa başına kullanıcı
+    COMMENTS_PER_PAGE = 20 #sayfa başına kök yorum (cevaplarıyla birlikte)
+    COMMENT_INLINE_DEPTH = 3 #bu derinliğe kadar cevaplar sayfayla gelir, daha derini istenince yüklenir
+    NOTIFICATIONS_PER_PAGE = 50
+    ADMIN_PER_PAGE = 50 #admin tablolarında sayfa başına satır
+    ADMIN_EXPORT_BATCH = 1000 #CSV/JSONL dışa aktarmada vt den tek seferde okunan (ve gönderilen) satır
\ No newline at end of file